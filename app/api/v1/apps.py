@@ -1,26 +1,70 @@
 """Apps API endpoints"""
+from typing import Any, Dict
 from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import JSONResponse
 from app.schemas.app import AppCreateRequest, AppResponse
+from app.schemas.job import JobAcceptedResponse
 from app.services.cometchat_client import cometchat_client
+from app.services.jobs import job_runner
+from app.services.provisioning import extract_app_credentials
 from app.utils.exceptions import CometChatAPIError
 from app.core.logging import logger
+from app.core.serialization import trusted_response
 
 router = APIRouter(prefix="/api/v1/apps", tags=["apps"])
 
+
+async def run_create_app_job(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Job handler: create the app and record which app was created
+
+    The response's API and auth keys are left out: job results are stored
+    in plain text and readable by anyone with the job id.
+    """
+    result = await cometchat_client.create_app(
+        name=payload["name"],
+        region=payload["region"],
+        case_sensitive=payload["case_sensitive"]
+    )
+    app_id, _, _ = extract_app_credentials(result)
+    return {"app_id": app_id, "name": payload["name"], "region": payload["region"]}
+
+
+job_runner.register("create_app", run_create_app_job)
+
+
 @router.post(
     "",
     response_model=AppResponse,
     status_code=status.HTTP_201_CREATED,
-    summary="Create a new app"
+    summary="Create a new app",
+    responses={status.HTTP_202_ACCEPTED: {"model": JobAcceptedResponse}}
 )
-async def create_app(request: AppCreateRequest):
+async def create_app(request: AppCreateRequest, async_job: bool = False):
     """
     Create a new CometChat app
     
     - **name**: App name
     - **region**: App region (us or eu)
     - **caseSensitive**: Enable case sensitivity
+    - **async_job**: Return 202 with a job ID immediately and create the app
+      in the background; poll `GET /api/v1/jobs/{job_id}` for the result
     """
+    if async_job:
+        job_id = await job_runner.enqueue("create_app", {
+            "name": request.name,
+            "region": request.region,
+            "case_sensitive": request.case_sensitive
+        })
+        return JSONResponse(
+            status_code=status.HTTP_202_ACCEPTED,
+            content=JobAcceptedResponse(
+                job_id=job_id,
+                status="pending",
+                status_url=f"/api/v1/jobs/{job_id}"
+            ).model_dump()
+        )
+    
     try:
         result = await cometchat_client.create_app(
             name=request.name,
@@ -28,7 +72,9 @@ async def create_app(request: AppCreateRequest):
             case_sensitive=request.case_sensitive
         )
         
-        return AppResponse(
+        return trusted_response(
+            AppResponse,
+            status_code=status.HTTP_201_CREATED,
             success=True,
             message="App created successfully",
             data=result
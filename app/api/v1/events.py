@@ -0,0 +1,192 @@
+"""Webhook event ingestion and replay endpoints"""
+import asyncio
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from fastapi import APIRouter, HTTPException, Request, status
+from fastapi.responses import JSONResponse
+from sqlalchemy import Text, insert, type_coerce
+
+from app.core.config import get_settings
+from app.core.database import SessionLocal, naive_utc
+from app.core.logging import logger
+from app.models.event import Event
+from app.models.tenant import Tenant
+from app.schemas.event import EventIngestResponse, EventReplayRequest
+from app.schemas.job import JobAcceptedResponse
+from app.services.event_decoding import EventDecodeError, InboundEvent, decode_event
+from app.services.event_processing import process_event
+from app.services.jobs import job_runner
+
+settings = get_settings()
+
+router = APIRouter(prefix="/api/v1/events", tags=["events"])
+
+RETENTION_JOB = "event_retention"
+
+# Replay and retention are rare; their modules load with the first such job
+job_runner.register("replay_events", "app.services.event_replay:run_replay_job")
+job_runner.register(RETENTION_JOB, "app.services.event_retention:run_retention_job")
+
+
+def _store_event(inbound: InboundEvent) -> Dict[str, Any]:
+    received_at = datetime.utcnow()
+    db = SessionLocal()
+    try:
+        # The delivered JSON text goes into the payload column as-is
+        event_id = db.execute(
+            insert(Event).values(
+                app_id=inbound.app_id,
+                trigger=inbound.trigger,
+                payload=type_coerce(inbound.text, Text),
+                received_at=received_at
+            ).returning(Event.id)
+        ).scalar_one()
+        db.commit()
+    finally:
+        db.close()
+    return {
+        "id": event_id,
+        "app_id": inbound.app_id,
+        "trigger": inbound.trigger,
+        "payload": inbound.payload,
+        "received_at": received_at
+    }
+
+
+def _tenant_app_id(user_id: str) -> Optional[str]:
+    if settings.TENANT_DIRECTORY_ENABLED:
+        from app.services.tenant_directory import tenant_directory
+        route = tenant_directory.by_user_id(user_id)
+        if route is not None:
+            return route.app_id
+    
+    db = SessionLocal()
+    try:
+        row = db.query(Tenant.id, Tenant.cometchat_app_id).filter(Tenant.user_id == user_id).first()
+    finally:
+        db.close()
+    if not row:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Tenant with user_id {user_id} not found"
+        )
+    return row.cometchat_app_id
+
+
+@router.post(
+    "",
+    response_model=EventIngestResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Receive a CometChat webhook event",
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": {"type": "object"}}}
+        }
+    }
+)
+async def receive_event(request: Request):
+    """
+    Store a CometChat webhook delivery, then run it through processing
+    
+    The event is persisted before processing, so a processing failure
+    still answers 202 and the event can be replayed later. The body is
+    decoded once from raw bytes (see app.services.event_decoding) rather
+    than validated into a model.
+    """
+    try:
+        inbound = decode_event(await request.body())
+    except EventDecodeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=str(e)
+        )
+    
+    event = await asyncio.to_thread(_store_event, inbound)
+    
+    try:
+        await process_event(event)
+        processed = True
+    except Exception as e:
+        logger.error(f"Processing event {event['id']} ({inbound.trigger}) failed: {str(e)}")
+        processed = False
+    
+    return EventIngestResponse(event_id=event["id"], processed=processed)
+
+
+@router.post(
+    "/replay",
+    response_model=JobAcceptedResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Replay a tenant's stored events"
+)
+async def replay_events(request: EventReplayRequest):
+    """
+    Re-run stored events of a tenant's app through processing as a background job
+    
+    Events in [start, end) are streamed from the store in chunks at
+    `rate_per_second`, including days retention has already archived. Poll `GET /api/v1/jobs/{job_id}`; its result holds
+    the checkpoint. Pass that job id as `resume_from` to continue a failed
+    or cancelled replay where it stopped.
+    """
+    app_id = await asyncio.to_thread(_tenant_app_id, request.user_id)
+    if not app_id:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Tenant {request.user_id} has no CometChat app"
+        )
+    
+    job_id = await job_runner.enqueue("replay_events", {
+        "app_id": app_id,
+        "start": naive_utc(request.start).isoformat(),
+        "end": naive_utc(request.end).isoformat(),
+        "trigger": request.trigger,
+        "rate_per_second": (
+            request.rate_per_second
+            if request.rate_per_second is not None
+            else settings.EVENT_REPLAY_RATE_PER_SECOND
+        ),
+        "chunk_size": request.chunk_size or settings.EVENT_REPLAY_CHUNK_SIZE,
+        "resume_from": request.resume_from
+    })
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content=JobAcceptedResponse(
+            job_id=job_id,
+            status="pending",
+            status_url=f"/api/v1/jobs/{job_id}"
+        ).model_dump()
+    )
+
+
+@router.post(
+    "/retention",
+    response_model=JobAcceptedResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Run event retention now"
+)
+async def run_retention(retention_days: Optional[int] = None):
+    """
+    Archive events older than `retention_days` (default EVENT_RETENTION_DAYS)
+    
+    Expired events are appended to per-app, per-day gzip segment files under
+    EVENT_ARCHIVE_DIR, indexed in `event_segments`, then deleted from the hot
+    table in batches. The job result reports archived events and freed pages.
+    """
+    days = retention_days if retention_days is not None else settings.EVENT_RETENTION_DAYS
+    if days <= 0:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Event retention is disabled (retention_days must be positive)"
+        )
+    
+    job_id = await job_runner.enqueue(RETENTION_JOB, {"retention_days": days})
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content=JobAcceptedResponse(
+            job_id=job_id,
+            status="pending",
+            status_url=f"/api/v1/jobs/{job_id}"
+        ).model_dump()
+    )
@@ -0,0 +1,29 @@
+"""Background job endpoints"""
+from fastapi import APIRouter, HTTPException, Depends, status
+from sqlalchemy.orm import Session
+from app.core.database import get_db
+from app.models.job import Job
+from app.schemas.job import JobResponse
+
+router = APIRouter(prefix="/api/v1/jobs", tags=["jobs"])
+
+
+@router.get(
+    "/{job_id}",
+    response_model=JobResponse,
+    summary="Get job status"
+)
+def get_job(
+    job_id: str,
+    db: Session = Depends(get_db)
+):
+    """Get status and result of a background job"""
+    job = db.get(Job, job_id)
+    
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Job {job_id} not found"
+        )
+    
+    return job
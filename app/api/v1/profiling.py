@@ -0,0 +1,85 @@
+"""On-demand profiling endpoints (admin only, off unless PROFILING_ENABLED)"""
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import PlainTextResponse
+
+from app.core.config import get_settings
+from app.core.logging import logger
+from app.core.security import require_admin_token
+from app.services.profiling import ProfilerBusyError, cprofile_capture, memory_tracker, sample_capture
+
+settings = get_settings()
+
+router = APIRouter(
+    prefix="/api/v1/admin/profiling",
+    tags=["admin"],
+    dependencies=[Depends(require_admin_token)]
+)
+
+
+@router.get(
+    "/cpu",
+    response_class=PlainTextResponse,
+    summary="Capture a CPU profile"
+)
+async def profile_cpu(
+    seconds: float = Query(default=5.0, gt=0),
+    mode: Literal["sample", "cprofile"] = "sample",
+    interval_ms: float = Query(default=5.0, ge=1, le=1000),
+    sort: Literal["cumulative", "tottime", "calls"] = "cumulative",
+    limit: int = Query(default=50, ge=1, le=1000)
+):
+    """
+    Profile the running process for `seconds`
+    
+    - **sample**: samples every thread each `interval_ms` and returns
+      collapsed stacks (`flamegraph.pl` / speedscope input)
+    - **cprofile**: deterministic profile of the event loop thread,
+      returned as pstats text sorted by `sort`
+    """
+    if seconds > settings.PROFILING_MAX_SECONDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"seconds must be at most {settings.PROFILING_MAX_SECONDS}"
+        )
+    
+    logger.info(f"Capturing {seconds}s {mode} CPU profile")
+    try:
+        if mode == "cprofile":
+            return await cprofile_capture(seconds, sort=sort, limit=limit)
+        return await sample_capture(seconds, interval=interval_ms / 1000)
+    except ProfilerBusyError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+
+
+@router.post("/memory/start", summary="Start tracemalloc")
+def start_memory_tracing(frames: int = Query(default=10, ge=1, le=100)):
+    """Start tracing allocations, keeping `frames` frames per traceback"""
+    memory_tracker.start(frames)
+    logger.info(f"tracemalloc started ({frames} frames)")
+    return {"tracing": True, "frames": frames}
+
+
+@router.get("/memory", summary="Take a tracemalloc snapshot")
+def memory_snapshot(
+    group_by: Literal["lineno", "filename", "traceback"] = "lineno",
+    limit: int = Query(default=30, ge=1, le=500)
+):
+    """
+    Top allocation sites, plus `diff` against the previous snapshot
+    
+    Take a snapshot, let the suspected leak happen, and take another; the
+    diff lists the sites that grew.
+    """
+    try:
+        return memory_tracker.snapshot(group_by=group_by, limit=limit)
+    except RuntimeError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+
+
+@router.delete("/memory", summary="Stop tracemalloc")
+def stop_memory_tracing():
+    """Stop tracing and drop the stored baseline"""
+    memory_tracker.stop()
+    return {"tracing": False}
@@ -0,0 +1,82 @@
+"""Drift reconciliation endpoints"""
+import asyncio
+
+from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import JSONResponse
+
+from app.core.config import get_settings
+from app.core.crypto import cipher
+from app.schemas.job import JobAcceptedResponse
+from app.schemas.reconciliation import ReconcileRequest
+from app.services.jobs import job_runner
+from app.services.role_templates import read_role_templates
+
+settings = get_settings()
+
+router = APIRouter(prefix="/api/v1/reconciliation", tags=["reconciliation"])
+
+RECONCILE_JOB = "reconcile_tenants"
+
+job_runner.register(RECONCILE_JOB, "app.services.reconciliation:run_reconcile_job")
+
+
+@router.post(
+    "",
+    response_model=JobAcceptedResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Reconcile tenant app roles and webhooks"
+)
+async def reconcile(request: ReconcileRequest):
+    """
+    Compare every active tenant app's roles and webhooks with the desired state as a background job
+    
+    Missing items are created and items whose fields differ are updated;
+    items not in the desired state are left alone. With `dry_run` (the
+    default) nothing is applied and the result only reports the drift.
+    Poll `GET /api/v1/jobs/{job_id}` for progress, the per-app report of
+    drifted or failed apps, and throughput metrics.
+    """
+    templates = await asyncio.to_thread(read_role_templates, request.roles)
+    unknown = [name for name in request.roles if name not in templates]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown role templates: {', '.join(unknown)}"
+        )
+    if not request.roles and not request.webhooks:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Desired state must declare at least one role or webhook"
+        )
+    
+    # Job rows are plain text: basic-auth passwords are stored encrypted,
+    # and dropped from dry runs, which never send them
+    webhooks = []
+    for webhook in request.webhooks:
+        spec = webhook.model_dump(mode="json")
+        password = spec.pop("password")
+        if password is not None and not request.dry_run:
+            if not cipher.enabled:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Applying webhook passwords requires CREDENTIAL_ENCRYPTION_KEYS"
+                )
+            spec["password"] = cipher.encrypt(password)
+        webhooks.append(spec)
+    
+    job_id = await job_runner.enqueue(RECONCILE_JOB, {
+        # Resolved now, so editing a template does not change a queued run
+        "roles": [templates[name] for name in dict.fromkeys(request.roles)],
+        "webhooks": webhooks,
+        "dry_run": request.dry_run,
+        "concurrency": request.concurrency or settings.RECONCILE_CONCURRENCY,
+        "user_ids": request.user_ids
+    })
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content=JobAcceptedResponse(
+            job_id=job_id,
+            status="pending",
+            status_url=f"/api/v1/jobs/{job_id}"
+        ).model_dump()
+    )
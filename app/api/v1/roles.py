@@ -1,12 +1,34 @@
 """Roles API endpoints"""
-from fastapi import APIRouter, HTTPException, status
-from app.schemas.role import RoleCreateRequest, RoleResponse
+import asyncio
+from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Path, Response, status
+from fastapi.responses import JSONResponse
+from sqlalchemy.orm import Session
+from app.core.config import get_settings
+from app.core.database import get_db
+from app.models.role_template import RoleTemplate
+from app.schemas.job import JobAcceptedResponse
+from app.schemas.role import (
+    RoleCreateRequest,
+    RoleResponse,
+    RoleTemplateResponse,
+    RoleTemplateApplyRequest
+)
 from app.services.cometchat_client import cometchat_client
+from app.services.jobs import job_runner
+from app.services.role_templates import ADMIN_ROLE, read_role_templates
 from app.utils.exceptions import CometChatAPIError
 from app.core.logging import logger
+from app.core.serialization import trusted_response
+
+settings = get_settings()
 
 router = APIRouter(prefix="/api/v1/roles", tags=["roles"])
 
+ROLLOUT_JOB = "apply_role_template"
+
+job_runner.register(ROLLOUT_JOB, "app.services.role_rollout:run_rollout_job")
+
 @router.post(
     "",
     response_model=RoleResponse,
@@ -32,7 +54,9 @@ async def create_role(request: RoleCreateRequest):
             settings=request.settings
         )
         
-        return RoleResponse(
+        return trusted_response(
+            RoleResponse,
+            status_code=status.HTTP_201_CREATED,
             success=True,
             message="Role created successfully",
             data=result
@@ -53,34 +77,21 @@ async def create_role(request: RoleCreateRequest):
 )
 async def create_admin_role():
     """
-    Create a new admin role with predefined permissions:
+    Create a new admin role from the stored `admin` template, by default:
     - role: admin
     - name: Administrator
     - description: Full access administrator
     - accessLevel: 10
     - permissions: read, write, delete
     """
+    templates = await asyncio.to_thread(read_role_templates, ["admin"])
+    admin_role = templates.get("admin", ADMIN_ROLE)
     try:
-        # Predefined admin role payload
-        admin_metadata = {
-            "permissions": ["read", "write", "delete",],
-            "accessLevel": 10
-        }
+        result = await cometchat_client.create_role(**admin_role)
         
-        admin_settings = {
-            "listUsers": "all",
-            "sendMessagesTo": "all"
-        }
-
-        result = await cometchat_client.create_role(
-            role="admin",
-            name="Administrator",
-            description="Full access administrator",
-            metadata=admin_metadata,
-            settings=admin_settings
-        )
-        
-        return RoleResponse(
+        return trusted_response(
+            RoleResponse,
+            status_code=status.HTTP_201_CREATED,
             success=True,
             message="Admin role created successfully",
             data=result
@@ -92,3 +103,117 @@ async def create_admin_role():
             status_code=e.status_code,
             detail=e.message
         )
+
+
+def _get_template(db: Session, name: str) -> RoleTemplate:
+    template = db.get(RoleTemplate, name)
+    if template is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Role template {name} not found"
+        )
+    return template
+
+@router.get(
+    "/templates",
+    response_model=List[RoleTemplateResponse],
+    summary="List role templates"
+)
+def list_role_templates(db: Session = Depends(get_db)):
+    """List the stored role templates"""
+    return [template.to_dict() for template in db.query(RoleTemplate).order_by(RoleTemplate.name)]
+
+@router.get(
+    "/templates/{name}",
+    response_model=RoleTemplateResponse,
+    summary="Get role template"
+)
+def get_role_template(name: str, db: Session = Depends(get_db)):
+    """Get a stored role template by name"""
+    return _get_template(db, name).to_dict()
+
+@router.put(
+    "/templates/{name}",
+    response_model=RoleTemplateResponse,
+    summary="Create or replace role template"
+)
+def put_role_template(
+    request: RoleCreateRequest,
+    response: Response,
+    name: str = Path(..., min_length=1, max_length=100),
+    db: Session = Depends(get_db)
+):
+    """
+    Store the role payload under `name` (201 when new, 200 when replaced)
+    
+    Apps the template was applied to are not changed; apply it again to
+    roll the new version out.
+    """
+    template = db.get(RoleTemplate, name)
+    if template is None:
+        template = RoleTemplate(name=name)
+        db.add(template)
+        response.status_code = status.HTTP_201_CREATED
+    template.role = request.role
+    template.role_name = request.name
+    template.description = request.description
+    template.role_metadata = request.metadata
+    template.settings = request.settings
+    db.commit()
+    db.refresh(template)
+    
+    logger.info(f"Stored role template: {name}")
+    return template.to_dict()
+
+@router.delete(
+    "/templates/{name}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary="Delete role template"
+)
+def delete_role_template(name: str, db: Session = Depends(get_db)):
+    """Delete a stored role template; roles already created in apps stay"""
+    db.delete(_get_template(db, name))
+    db.commit()
+    logger.info(f"Deleted role template: {name}")
+
+@router.post(
+    "/templates/{name}/apply",
+    response_model=JobAcceptedResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Apply role template to tenant apps"
+)
+async def apply_role_template(name: str, request: RoleTemplateApplyRequest):
+    """
+    Create the template's role in the CometChat app of every listed tenant as a background job
+    
+    Apps are processed concurrently (`concurrency`, default
+    ROLE_TEMPLATE_APPLY_CONCURRENCY), each call paced by the per-app
+    (COMETCHAT_APP_RATE_LIMIT_PER_MINUTE) and account-wide rate limits.
+    Where the role already exists it is updated to match the template
+    unless `update_existing` is false. Poll `GET /api/v1/jobs/{job_id}`;
+    its result holds the per-app outcome. One app failing does not stop
+    the others.
+    """
+    role = (await asyncio.to_thread(read_role_templates, [name])).get(name)
+    if role is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Role template {name} not found"
+        )
+    
+    job_id = await job_runner.enqueue(ROLLOUT_JOB, {
+        # Resolved now, so editing the template does not change a queued rollout
+        "template": name,
+        "role": role,
+        "user_ids": request.user_ids,
+        "concurrency": request.concurrency or settings.ROLE_TEMPLATE_APPLY_CONCURRENCY,
+        "update_existing": request.update_existing
+    })
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content=JobAcceptedResponse(
+            job_id=job_id,
+            status="pending",
+            status_url=f"/api/v1/jobs/{job_id}"
+        ).model_dump()
+    )
@@ -1,14 +1,54 @@
 """Tenant management endpoints"""
-from fastapi import APIRouter, HTTPException, Depends, status
+import asyncio
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, Response, status
+from fastapi.responses import JSONResponse, ORJSONResponse
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from typing import List
-from app.core.database import get_db
-from app.models.tenant import Tenant
-from app.schemas.tenant import TenantCreate, TenantUpdate, TenantResponse
+from datetime import datetime
+from typing import List, Optional, Tuple
+from app.core.config import get_settings
+from app.core.database import get_db, naive_utc
+from app.models.tenant import Tenant, TENANT_RESPONSE_COLUMNS
+from app.schemas.job import JobAcceptedResponse
+from app.schemas.tenant import (
+    TenantCreate,
+    TenantUpdate,
+    TenantResponse,
+    TenantBulkStatusUpdate,
+    TenantBulkStatusResponse,
+    TenantStatsResponse
+)
+from app.schemas.provision import ProvisionRequest, ProvisionResponse
+from app.services.jobs import job_runner
+from app.services.provisioning import (
+    IN_PROGRESS, NOT_FOUND, claim_provisioning, provision_tenant as run_provisioning
+)
+from app.services.tenant_search import search_tenants as run_search
+from app.services.tenant_stats import read_stats
 from app.core.logging import logger
+from app.core.serialization import FAST_JSON_ENABLED
+from app.core.http_cache import is_not_modified, not_modified_response, set_cache_headers
+from app.core.state import TENANTS, bump_version, get_version
+
+settings = get_settings()
 
 router = APIRouter(prefix="/api/v1/tenants", tags=["tenants"])
 
+PURGE_JOB = "purge_tenants"
+STATS_REBUILD_JOB = "rebuild_tenant_stats"
+
+job_runner.register(PURGE_JOB, "app.services.tenant_purge:run_purge_job")
+job_runner.register(STATS_REBUILD_JOB, "app.services.tenant_stats:run_rebuild_job")
+
+
+def _is_duplicate_email(error: IntegrityError) -> bool:
+    """Whether the failed constraint is a user_email unique index"""
+    # PostgreSQL reports the index name; SQLite names the table and column
+    diag = getattr(error.orig, "diag", None)
+    constraint = getattr(diag, "constraint_name", None) or str(error.orig)
+    return "user_email" in constraint
+
 
 @router.post(
     "",
@@ -16,27 +56,25 @@ router = APIRouter(prefix="/api/v1/tenants", tags=["tenants"])
     status_code=status.HTTP_201_CREATED,
     summary="Create a new tenant"
 )
-async def create_tenant(
+def create_tenant(
     tenant_data: TenantCreate,
     db: Session = Depends(get_db)
 ):
     """Create a new tenant with CometChat credentials"""
+    tenant = Tenant(**tenant_data.dict())
+    db.add(tenant)
     
-    # Check if email already exists
-    existing = db.query(Tenant).filter(
-        Tenant.user_email == tenant_data.user_email
-    ).first()
-    
-    if existing:
+    # The unique index on the normalized email detects duplicates, in any case
+    try:
+        db.commit()
+    except IntegrityError as e:
+        db.rollback()
+        if not _is_duplicate_email(e):
+            raise
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail=f"Tenant with email {tenant_data.user_email} already exists"
         )
-    
-    # Create new tenant
-    tenant = Tenant(**tenant_data.dict())
-    db.add(tenant)
-    db.commit()
     db.refresh(tenant)
     
     logger.info(f"Created tenant: {tenant.user_id} ({tenant.user_email})")
@@ -48,40 +86,224 @@ async def create_tenant(
     response_model=List[TenantResponse],
     summary="List all tenants"
 )
-async def list_tenants(
+def list_tenants(
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
     active_only: bool = False,
     db: Session = Depends(get_db)
 ):
-    """List all tenants with pagination"""
-    query = db.query(Tenant)
+    """List all tenants with pagination (supports If-None-Match)"""
+    # Any tenant write bumps the table version, so it validates every page
+    etag = f'W/"tenants-{get_version(db, TENANTS)}-{skip}-{limit}-{int(active_only)}"'
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+    
+    query = db.query(*TENANT_RESPONSE_COLUMNS)
     
     if active_only:
         query = query.filter(Tenant.is_active == True)
     
-    tenants = query.offset(skip).limit(limit).all()
+    # Plain row dicts: no ORM hydration and no secret columns read
+    tenants = [row._asdict() for row in query.offset(skip).limit(limit)]
+    
+    if FAST_JSON_ENABLED:
+        # Rows come straight from our own table, skip response_model re-validation
+        return set_cache_headers(ORJSONResponse(tenants), etag)
+    
+    set_cache_headers(response, etag)
     return tenants
 
 
+@router.patch(
+    "/bulk",
+    response_model=TenantBulkStatusResponse,
+    summary="Activate or deactivate many tenants"
+)
+def bulk_update_status(
+    body: TenantBulkStatusUpdate,
+    db: Session = Depends(get_db)
+):
+    """
+    Set `is_active` on tenants selected by `user_ids` or `filter`, in one UPDATE
+    
+    Tenants already in the requested state are left untouched and not counted.
+    Deactivated tenants are purged after TENANT_PURGE_RETENTION_DAYS.
+    """
+    conditions = [Tenant.is_active != body.is_active]
+    if body.user_ids is not None:
+        conditions.append(Tenant.user_id.in_(body.user_ids))
+    else:
+        f = body.filter
+        if f.is_active is not None:
+            conditions.append(Tenant.is_active == f.is_active)
+        if f.cometchat_region is not None:
+            conditions.append(Tenant.cometchat_region == f.cometchat_region)
+        if f.cometchat_app_id is not None:
+            conditions.append(Tenant.cometchat_app_id == f.cometchat_app_id)
+        if f.created_before is not None:
+            conditions.append(Tenant.created_at < naive_utc(f.created_before))
+        if f.created_after is not None:
+            conditions.append(Tenant.created_at >= naive_utc(f.created_after))
+    
+    now = datetime.utcnow()
+    result = db.execute(
+        update(Tenant)
+        .where(*conditions)
+        .values(is_active=body.is_active, deleted_at=None if body.is_active else now, updated_at=now)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount:
+        # Set-based updates skip the flush hook, so bump the version here
+        bump_version(db.connection(), TENANTS)
+    db.commit()
+    
+    logger.info(f"Bulk set is_active={body.is_active} on {result.rowcount} tenants")
+    return TenantBulkStatusResponse(updated=result.rowcount)
+
+
+@router.post(
+    "/purge",
+    response_model=JobAcceptedResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Purge soft-deleted tenants now"
+)
+async def purge_tenants(retention_days: Optional[int] = None):
+    """
+    Hard-delete tenants soft-deleted more than `retention_days` ago (default TENANT_PURGE_RETENTION_DAYS)
+    
+    Runs as a background job deleting TENANT_PURGE_BATCH_SIZE tenants per
+    transaction. The job result reports how many were purged.
+    """
+    days = retention_days if retention_days is not None else settings.TENANT_PURGE_RETENTION_DAYS
+    if days <= 0:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Tenant purge is disabled (retention_days must be positive)"
+        )
+    
+    job_id = await job_runner.enqueue(PURGE_JOB, {"retention_days": days})
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content=JobAcceptedResponse(
+            job_id=job_id,
+            status="pending",
+            status_url=f"/api/v1/jobs/{job_id}"
+        ).model_dump()
+    )
+
+
+@router.get(
+    "/stats",
+    response_model=TenantStatsResponse,
+    summary="Tenant counts by region, status and log level"
+)
+def tenant_stats(
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db)
+):
+    """Counts from the trigger-maintained tenant_stats table (supports If-None-Match)"""
+    etag = f'W/"tenant-stats-{get_version(db, TENANTS)}"'
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+    
+    stats = read_stats(db)
+    
+    if FAST_JSON_ENABLED:
+        return set_cache_headers(ORJSONResponse(stats), etag)
+    
+    set_cache_headers(response, etag)
+    return stats
+
+
+@router.post(
+    "/stats/rebuild",
+    response_model=JobAcceptedResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Recount tenant statistics"
+)
+async def rebuild_tenant_stats():
+    """
+    Recount tenant_stats from the tenants table as a background job
+    
+    The job result lists every count that had drifted from the recount.
+    """
+    job_id = await job_runner.enqueue(STATS_REBUILD_JOB, {})
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content=JobAcceptedResponse(
+            job_id=job_id,
+            status="pending",
+            status_url=f"/api/v1/jobs/{job_id}"
+        ).model_dump()
+    )
+
+
+# Declared before /{user_id} so "search" is not taken for a user_id
+@router.get(
+    "/search",
+    response_model=List[TenantResponse],
+    summary="Search tenants by name, email or phone"
+)
+def search_tenants(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    active_only: bool = False,
+    db: Session = Depends(get_db)
+):
+    """Tenants matching every word of `q` (words match as prefixes), best match first"""
+    tenants = run_search(db, q, limit, active_only)
+    
+    if FAST_JSON_ENABLED:
+        return ORJSONResponse(tenants)
+    return tenants
+
+
+def _tenant_validators(user_id: str, row) -> Tuple[str, datetime]:
+    """(ETag, Last-Modified) of a tenant row version"""
+    last_modified = row.updated_at or row.created_at
+    return f'W/"{user_id}-{last_modified.timestamp():.6f}"', last_modified
+
+
 @router.get(
     "/{user_id}",
     response_model=TenantResponse,
     summary="Get tenant by user_id"
 )
-async def get_tenant(
+def get_tenant(
     user_id: str,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db)
 ):
-    """Get tenant details by user_id (UUID)"""
-    tenant = db.query(Tenant).filter(Tenant.user_id == user_id).first()
+    """Get tenant details by user_id (UUID); supports If-None-Match / If-Modified-Since"""
+    not_found = HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail=f"Tenant with user_id {user_id} not found"
+    )
     
-    if not tenant:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Tenant with user_id {user_id} not found"
-        )
+    # Conditional requests are answered from an indexed lookup of two timestamp columns
+    if request.headers.get("if-none-match") or request.headers.get("if-modified-since"):
+        stamps = db.query(Tenant.created_at, Tenant.updated_at).filter(Tenant.user_id == user_id).first()
+        if not stamps:
+            raise not_found
+        etag, last_modified = _tenant_validators(user_id, stamps)
+        if is_not_modified(request, etag, last_modified):
+            return not_modified_response(etag, last_modified)
+    
+    # One read for the body and its validators, so they always describe the same row version
+    row = db.query(*TENANT_RESPONSE_COLUMNS).filter(Tenant.user_id == user_id).first()
+    if not row:
+        raise not_found
+    etag, last_modified = _tenant_validators(user_id, row)
+    tenant = row._asdict()
+    
+    if FAST_JSON_ENABLED:
+        return set_cache_headers(ORJSONResponse(tenant), etag, last_modified)
     
+    set_cache_headers(response, etag, last_modified)
     return tenant
 
 
@@ -90,7 +312,7 @@ async def get_tenant(
     response_model=TenantResponse,
     summary="Update tenant"
 )
-async def update_tenant(
+def update_tenant(
     user_id: str,
     tenant_data: TenantUpdate,
     db: Session = Depends(get_db)
@@ -120,7 +342,7 @@ async def update_tenant(
     status_code=status.HTTP_204_NO_CONTENT,
     summary="Delete tenant"
 )
-async def delete_tenant(
+def delete_tenant(
     user_id: str,
     hard_delete: bool = False,
     db: Session = Depends(get_db)
@@ -142,3 +364,42 @@ async def delete_tenant(
         logger.info(f"Soft deleted tenant: {user_id}")
     
     db.commit()
+
+
+@router.post(
+    "/{user_id}/provision",
+    response_model=ProvisionResponse,
+    summary="Provision tenant app, roles and webhooks"
+)
+async def provision_tenant(
+    user_id: str,
+    response: Response,
+    request: Optional[ProvisionRequest] = None
+):
+    """
+    Onboard a tenant in one call
+    
+    Creates the CometChat app and stores its credentials on the tenant, then
+    creates the requested role templates and webhooks concurrently. Returns
+    per-step timing; on partial failure (502) call again to resume. A call
+    made while another is provisioning the same tenant gets 409.
+    """
+    outcome, tenant = await asyncio.to_thread(claim_provisioning, user_id)
+    
+    if outcome == NOT_FOUND:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Tenant with user_id {user_id} not found"
+        )
+    if outcome == IN_PROGRESS:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Tenant {user_id} is already being provisioned"
+        )
+    
+    result = await run_provisioning(tenant, request or ProvisionRequest())
+    
+    if not result.success:
+        response.status_code = status.HTTP_502_BAD_GATEWAY
+    
+    return result
@@ -4,6 +4,7 @@ from app.schemas.webhook import WebhookCreateRequest, WebhookResponse
 from app.services.cometchat_client import cometchat_client
 from app.utils.exceptions import CometChatAPIError
 from app.core.logging import logger
+from app.core.serialization import trusted_response
 
 router = APIRouter(prefix="/api/v1/webhooks", tags=["webhooks"])
 
@@ -33,7 +34,9 @@ async def create_webhook(request: WebhookCreateRequest):
             retry_on_failure=request.retry_on_failure
         )
         
-        return WebhookResponse(
+        return trusted_response(
+            WebhookResponse,
+            status_code=status.HTTP_201_CREATED,
             success=True,
             message="Webhook created successfully",
             data=result
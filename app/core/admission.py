@@ -0,0 +1,112 @@
+"""Admission control: per-route-class in-flight limits with load shedding"""
+import asyncio
+from collections import deque
+from typing import Deque, Dict, Optional
+
+from app.core.config import get_settings
+
+
+settings = get_settings()
+
+# Routes whose latency is dominated by CometChat round-trips
+UPSTREAM_PREFIXES = ("/api/v1/webhooks", "/api/v1/roles", "/api/v1/apps")
+# Routes that only touch the local database
+DATABASE_PREFIXES = ("/api/v1/tenants", "/api/v1/jobs", "/api/v1/events", "/api/v1/reconciliation")
+
+
+class AdmissionGate:
+    """
+    Caps concurrent requests, queueing at most `queue_size` more
+
+    A request arriving with the queue full, or still queued after
+    `queue_timeout` seconds, is refused instead of waiting. A limit of 0
+    disables the gate. Queued requests are admitted in FIFO order.
+    """
+
+    def __init__(self, name: str, limit: int, queue_size: int, queue_timeout: float):
+        self.name = name
+        self.limit = limit
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self.shed = 0
+        self._active = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    @property
+    def enabled(self) -> bool:
+        return self.limit > 0
+
+    async def acquire(self) -> bool:
+        """Take a slot, waiting in the queue if needed; False means shed"""
+        if not self.enabled:
+            return True
+        if self._active < self.limit and not self._waiters:
+            self._active += 1
+            return True
+        if len(self._waiters) >= self.queue_size:
+            self.shed += 1
+            return False
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, self.queue_timeout)
+        except asyncio.TimeoutError:
+            self._abandon(waiter)
+            self.shed += 1
+            return False
+        except asyncio.CancelledError:
+            # Client went away while queued
+            self._abandon(waiter)
+            raise
+        return True
+
+    def _abandon(self, waiter: asyncio.Future) -> None:
+        if waiter.done() and not waiter.cancelled():
+            # A slot was handed over just as we gave up
+            self.release()
+        elif waiter in self._waiters:
+            self._waiters.remove(waiter)
+
+    def release(self) -> None:
+        """Hand the slot to the next queued request, or free it"""
+        if not self.enabled:
+            return
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self._active -= 1
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "limit": self.limit,
+            "in_flight": self._active,
+            "queued": len(self._waiters),
+            "shed": self.shed
+        }
+
+
+upstream_gate = AdmissionGate(
+    "upstream",
+    settings.ADMISSION_UPSTREAM_LIMIT,
+    settings.ADMISSION_UPSTREAM_QUEUE,
+    settings.ADMISSION_QUEUE_TIMEOUT_SECONDS
+)
+database_gate = AdmissionGate(
+    "database",
+    settings.ADMISSION_DB_LIMIT,
+    settings.ADMISSION_DB_QUEUE,
+    settings.ADMISSION_QUEUE_TIMEOUT_SECONDS
+)
+
+
+def gate_for(path: str) -> Optional[AdmissionGate]:
+    """Pick the budget a request path counts against; None bypasses admission"""
+    if path.startswith(UPSTREAM_PREFIXES):
+        return upstream_gate
+    if path.startswith(DATABASE_PREFIXES):
+        # Provisioning is a chain of CometChat calls behind a tenant URL
+        return upstream_gate if path.endswith("/provision") else database_gate
+    return None
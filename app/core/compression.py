@@ -0,0 +1,202 @@
+"""Response compression (gzip, plus brotli/zstd when installed)"""
+import zlib
+from typing import Callable, Dict, List, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+
+from app.core.config import get_settings
+from app.core.logging import logger
+
+try:
+    import brotli
+except ImportError:  # brotli is optional
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # zstandard is optional
+    zstandard = None
+
+
+settings = get_settings()
+
+
+class GzipCompressor:
+    def __init__(self, level: int):
+        self._obj = zlib.compressobj(level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+
+    def compress(self, data: bytes) -> bytes:
+        # Sync flush so each streamed chunk reaches the client promptly
+        return self._obj.compress(data) + self._obj.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._obj.compress(data) + self._obj.flush()
+
+
+class BrotliCompressor:
+    def __init__(self, quality: int):
+        self._obj = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.process(data) + self._obj.flush()
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._obj.process(data) + self._obj.finish()
+
+
+class ZstdCompressor:
+    def __init__(self, level: int):
+        self._obj = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.compress(data) + self._obj.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._obj.compress(data) + self._obj.flush()
+
+
+def available_codecs() -> Dict[str, Callable[[], object]]:
+    """Content-coding name -> compressor factory, for installed codecs"""
+    codecs = {"gzip": lambda: GzipCompressor(settings.COMPRESSION_GZIP_LEVEL)}
+    if brotli is not None:
+        codecs["br"] = lambda: BrotliCompressor(settings.COMPRESSION_BROTLI_QUALITY)
+    if zstandard is not None:
+        codecs["zstd"] = lambda: ZstdCompressor(settings.COMPRESSION_ZSTD_LEVEL)
+    return codecs
+
+
+def negotiate(accept_encoding: str, preference: List[str]) -> Optional[str]:
+    """Pick the first coding in server preference order the client accepts"""
+    accepted: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        q = 1.0
+        if params.strip().startswith("q="):
+            try:
+                q = float(params.strip()[2:])
+            except ValueError:
+                q = 0.0
+        if coding:
+            accepted[coding.strip().lower()] = q
+
+    for coding in preference:
+        q = accepted.get(coding, accepted.get("*", 0.0))
+        if q > 0:
+            return coding
+    return None
+
+
+class CompressionMiddleware:
+    """
+    Compress responses of compressible types once they reach `min_size` bytes
+
+    Single-message responses are compressed in one shot with an exact
+    Content-Length. Streaming responses are buffered only until the
+    threshold is crossed, then compressed chunk by chunk; a stream that
+    ends below the threshold is sent unchanged.
+    """
+
+    def __init__(
+        self,
+        app,
+        min_size: int = 1024,
+        encodings: Optional[List[str]] = None,
+        content_types: Optional[List[str]] = None
+    ):
+        self.app = app
+        self.min_size = min_size
+        self.codecs = available_codecs()
+        requested = encodings or ["gzip"]
+        self.encodings = [coding for coding in requested if coding in self.codecs]
+        skipped = [coding for coding in requested if coding not in self.codecs]
+        if skipped:
+            logger.info(f"Compression codecs not installed, skipping: {', '.join(skipped)}")
+        self.content_types = tuple(content_types or ["application/json", "text/"])
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.encodings:
+            await self.app(scope, receive, send)
+            return
+
+        # With no acceptable coding the sender still marks compressible
+        # responses Vary: Accept-Encoding, so caches keep the variants apart
+        coding = negotiate(Headers(scope=scope).get("accept-encoding", ""), self.encodings)
+        responder = _CompressingSender(self, coding, send)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressingSender:
+    """Per-response state machine wrapping the ASGI `send` callable"""
+
+    def __init__(self, middleware: CompressionMiddleware, coding: Optional[str], send):
+        self.middleware = middleware
+        self.coding = coding
+        self._send = send
+        self.start_message = None
+        self.compressor = None
+        self.passthrough = False
+        self.finished = False
+        self.buffer: List[bytes] = []
+        self.buffered = 0
+
+    def _compressible(self, headers: MutableHeaders, status: int) -> bool:
+        if status < 200 or status in (204, 304) or "content-encoding" in headers:
+            return False
+        return headers.get("content-type", "").startswith(self.middleware.content_types)
+
+    async def send(self, message) -> None:
+        if message["type"] == "http.response.start":
+            self.start_message = message
+            headers = MutableHeaders(raw=message["headers"])
+            compressible = self._compressible(headers, message["status"])
+            if compressible:
+                headers.add_vary_header("Accept-Encoding")
+            if not compressible or self.coding is None:
+                self.passthrough = True
+                await self._send(message)
+            return
+
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self._send(message)
+            return
+        if self.finished:
+            # Trailing empty chunks after a body we already completed
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.compressor is not None:
+            data = self.compressor.compress(body) if more_body else self.compressor.finish(body)
+            await self._send({"type": "http.response.body", "body": data, "more_body": more_body})
+            return
+
+        self.buffer.append(body)
+        self.buffered += len(body)
+        # Wrapping middleware re-chunks complete bodies; Content-Length tells us we have it all
+        headers = MutableHeaders(raw=self.start_message["headers"])
+        length = headers.get("content-length")
+        complete = not more_body or (length is not None and self.buffered >= int(length))
+
+        if self.buffered < self.middleware.min_size:
+            if not complete:
+                return
+            # Ended below the threshold: send unchanged
+            self.finished = True
+            await self._send(self.start_message)
+            await self._send({"type": "http.response.body", "body": b"".join(self.buffer)})
+            return
+
+        pending = b"".join(self.buffer)
+        self.buffer = []
+        self.compressor = self.middleware.codecs[self.coding]()
+        headers["Content-Encoding"] = self.coding
+        if complete:
+            self.finished = True
+            data = self.compressor.finish(pending)
+            headers["Content-Length"] = str(len(data))
+        else:
+            del headers["Content-Length"]
+            data = self.compressor.compress(pending)
+        await self._send(self.start_message)
+        await self._send({"type": "http.response.body", "body": data, "more_body": not complete})
@@ -0,0 +1,169 @@
+"""Field-level encryption for tenant credentials"""
+import sys
+from typing import Optional
+
+from sqlalchemy import Text
+from sqlalchemy.types import TypeDecorator
+
+from app.core.config import get_settings
+from app.core.logging import logger
+from app.utils.cache import TTLCache
+
+
+settings = get_settings()
+
+# Marks values written by CredentialCipher; anything else is legacy plaintext
+ENCRYPTED_PREFIX = "enc:"
+
+
+class CredentialCipher:
+    """
+    Encrypts credentials with Fernet and caches decrypted values
+
+    Keys come from CREDENTIAL_ENCRYPTION_KEYS: the first key encrypts, every
+    key can decrypt, so rotation is "prepend a new key, run rotate, drop the
+    old key". With no keys configured values are stored as plaintext.
+    """
+
+    def __init__(self, keys: list[str], cache: TTLCache):
+        self._cache = cache
+        self._fernet = None
+        if keys:
+            # cryptography is only needed once encryption is switched on
+            from cryptography.fernet import Fernet, MultiFernet
+            self._fernet = MultiFernet([Fernet(key.encode()) for key in keys])
+
+    @property
+    def enabled(self) -> bool:
+        return self._fernet is not None
+
+    def encrypt(self, value: Optional[str]) -> Optional[str]:
+        """
+        Encrypt a plaintext value with the primary key
+
+        Values are always plaintext here, even ones that happen to start with
+        ENCRYPTED_PREFIX; the prefix is only interpreted when reading.
+        """
+        if value is None or not self.enabled:
+            return value
+        token = self._fernet.encrypt(value.encode()).decode()
+        return ENCRYPTED_PREFIX + token
+
+    def decrypt(self, value: Optional[str]) -> Optional[str]:
+        """Decrypt a stored value, serving repeat lookups from the cache"""
+        if value is None or not value.startswith(ENCRYPTED_PREFIX):
+            return value
+
+        plaintext = self._cache.get(value)
+        if plaintext is not None:
+            return plaintext
+
+        if not self.enabled:
+            raise ValueError("Encrypted credential found but CREDENTIAL_ENCRYPTION_KEYS is empty")
+
+        plaintext = self._fernet.decrypt(value[len(ENCRYPTED_PREFIX):].encode()).decode()
+        self._cache.set(value, plaintext)
+        return plaintext
+
+    def clear_cache(self) -> None:
+        """Forget every cached plaintext"""
+        self._cache.clear()
+
+
+cipher = CredentialCipher(
+    settings.CREDENTIAL_ENCRYPTION_KEYS,
+    TTLCache(settings.CREDENTIAL_CACHE_SIZE, settings.CREDENTIAL_CACHE_TTL_SECONDS)
+)
+
+
+class EncryptedText(TypeDecorator):
+    """TEXT column transparently encrypted with the credential cipher"""
+
+    impl = Text
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        return cipher.encrypt(value)
+
+    def process_result_value(self, value, dialect):
+        return cipher.decrypt(value)
+
+
+def rotate_credentials(batch_size: int = 500) -> int:
+    """
+    Re-encrypt every tenant credential with the primary key
+
+    Also encrypts legacy plaintext values. Returns the number of rows rewritten.
+    """
+    from sqlalchemy import select, update
+    from app.core.database import SessionLocal
+    from app.core.state import CREDENTIALS, bump_version
+    from app.models.tenant import Tenant
+
+    if not cipher.enabled:
+        raise ValueError("CREDENTIAL_ENCRYPTION_KEYS must be set to rotate credentials")
+
+    columns = (
+        Tenant.cometchat_api_key,
+        Tenant.cometchat_account_secret,
+        Tenant.cometchat_auth_key,
+    )
+    table = Tenant.__table__
+    rotated = 0
+    last_id = 0
+
+    db = SessionLocal()
+    try:
+        while True:
+            rows = db.execute(
+                select(Tenant.id, *columns)
+                .where(Tenant.id > last_id)
+                .order_by(Tenant.id)
+                .limit(batch_size)
+            ).all()
+            if not rows:
+                break
+
+            for row in rows:
+                # Values arrive decrypted (any known key) and are re-bound with
+                # the primary key; updated_at is kept so clients see no change
+                db.execute(
+                    update(table)
+                    .where(table.c.id == row.id)
+                    .values(
+                        cometchat_api_key=row.cometchat_api_key,
+                        cometchat_account_secret=row.cometchat_account_secret,
+                        cometchat_auth_key=row.cometchat_auth_key,
+                        updated_at=table.c.updated_at,
+                    )
+                )
+            db.commit()
+            rotated += len(rows)
+            last_id = rows[-1].id
+
+        # Tell every worker to drop plaintexts cached under the old tokens
+        bump_version(db.connection(), CREDENTIALS)
+        db.commit()
+    finally:
+        db.close()
+
+    cipher.clear_cache()
+    logger.info(f"Rotated credentials for {rotated} tenants")
+    return rotated
+
+
+def generate_key() -> str:
+    """Generate a new Fernet key for CREDENTIAL_ENCRYPTION_KEYS"""
+    from cryptography.fernet import Fernet
+    return Fernet.generate_key().decode()
+
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else ""
+    if command == "generate-key":
+        print(generate_key())
+    elif command == "rotate":
+        print(f"Rotated {rotate_credentials()} tenants")
+    else:
+        print("Usage: python -m app.core.crypto [generate-key|rotate]")
+        sys.exit(1)
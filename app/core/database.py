@@ -1,20 +1,70 @@
-"""Database configuration for SQLite"""
-from sqlalchemy import create_engine
+"""Database configuration (SQLite by default, any SQLAlchemy backend via DATABASE_URL)"""
+from datetime import datetime, timezone
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from app.core.config import get_settings
+
+settings = get_settings()
+
+# Database URL from settings (defaults to the local SQLite file)
+SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Make SQLite safe for several worker processes sharing the file"""
+    cursor = dbapi_connection.cursor()
+    # Lets retention return freed pages with incremental_vacuum; only takes
+    # effect on new files (existing ones need a one-off VACUUM)
+    cursor.execute("PRAGMA auto_vacuum=INCREMENTAL")
+    # WAL lets readers proceed while one process writes
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    # Wait for the write lock instead of failing with "database is locked"
+    cursor.execute(f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS}")
+    cursor.close()
+
+
+def naive_utc(value: datetime) -> datetime:
+    """Convert an aware datetime to the naive UTC form the DateTime columns store"""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def create_db_engine(url: str) -> Engine:
+    """Create an engine with pool settings from Settings and backend-specific tweaks"""
+    parsed = make_url(url)
+    is_sqlite = parsed.get_backend_name() == "sqlite"
+    engine_kwargs = {
+        "echo": settings.DB_ECHO,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+    }
+
+    if is_sqlite:
+        engine_kwargs["connect_args"] = {"check_same_thread": False}  # Required for SQLite
+
+    if not (is_sqlite and parsed.database in (None, "", ":memory:")):
+        # In-memory SQLite uses a single shared connection, not a sized pool
+        engine_kwargs["pool_size"] = settings.DB_POOL_SIZE
+        engine_kwargs["max_overflow"] = settings.DB_MAX_OVERFLOW
+
+    db_engine = create_engine(url, **engine_kwargs)
+
+    if is_sqlite:
+        event.listen(db_engine, "connect", _set_sqlite_pragmas)
+
+    return db_engine
 
-# SQLite database URL
-SQLALCHEMY_DATABASE_URL = "sqlite:///./cometchat_tenants.db"
 
-# Create engine with SQLite-specific settings
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL,
-    connect_args={"check_same_thread": False},  # Required for SQLite
-    echo=True  # Set to False in production
-)
+# Create engine
+engine = create_db_engine(SQLALCHEMY_DATABASE_URL)
 
 # Create session factory
-SessionLocal = sessionmaker(autoincrement=True, bind=engine)
+SessionLocal = sessionmaker(bind=engine)
 
 # Base class for models
 Base = declarative_base()
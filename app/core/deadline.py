@@ -0,0 +1,164 @@
+"""Per-request deadlines propagated to downstream calls"""
+import asyncio
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from fastapi import status
+from fastapi.responses import JSONResponse
+
+from app.core.config import get_settings
+from app.core.logging import logger
+
+
+settings = get_settings()
+
+# Relative budget in seconds, or an absolute Unix timestamp
+TIMEOUT_HEADER = b"x-request-timeout"
+DEADLINE_HEADER = b"x-request-deadline"
+
+# Status nginx uses for requests the client abandoned
+CLIENT_CLOSED_REQUEST = 499
+
+# Absolute deadline on the monotonic clock; None means unbounded
+_deadline: ContextVar[Optional[float]] = ContextVar("request_deadline", default=None)
+
+
+def remaining() -> Optional[float]:
+    """Seconds left for the current request, or None without a deadline"""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def budget_from_headers(headers: dict) -> Optional[float]:
+    """Requested budget in seconds, capped by REQUEST_TIMEOUT_MAX_SECONDS"""
+    budget = None
+    try:
+        if TIMEOUT_HEADER in headers:
+            budget = float(headers[TIMEOUT_HEADER])
+        elif DEADLINE_HEADER in headers:
+            budget = float(headers[DEADLINE_HEADER]) - time.time()
+    except ValueError:
+        budget = None
+
+    if budget is None and settings.REQUEST_TIMEOUT_DEFAULT_SECONDS > 0:
+        budget = settings.REQUEST_TIMEOUT_DEFAULT_SECONDS
+    if budget is not None and settings.REQUEST_TIMEOUT_MAX_SECONDS > 0:
+        budget = min(budget, settings.REQUEST_TIMEOUT_MAX_SECONDS)
+    return budget
+
+
+class DeadlineMiddleware:
+    """
+    Enforce request deadlines and stop work for disconnected clients
+
+    The deadline is stored in a context variable so CometChatClient can
+    size its timeouts from the remaining budget. When the deadline passes
+    or the client disconnects, the request task is cancelled and 504 or
+    499 is sent if no response has started. A response that has already
+    started streaming is only cut short when the client goes away. Sync
+    endpoints already running in the threadpool finish their current call
+    in the background.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        budget = budget_from_headers(headers)
+
+        # HTTP/1.1 requests without Content-Length or Transfer-Encoding have
+        # an empty body, which is handed to the app here so the watcher can
+        # own `receive` from the start. Any other body is passed through
+        # untouched and the watcher only starts once the app has read it all.
+        http1 = scope.get("http_version", "1.1").startswith("1")
+        empty_body = http1 and b"transfer-encoding" not in headers and headers.get(b"content-length", b"0") == b"0"
+        body_done = asyncio.Event()
+        disconnected = asyncio.Event()
+        empty_pending = empty_body
+        if empty_body:
+            body_done.set()
+
+        async def wrapped_receive():
+            nonlocal empty_pending
+            if empty_pending:
+                empty_pending = False
+                return {"type": "http.request", "body": b"", "more_body": False}
+            if body_done.is_set():
+                await disconnected.wait()
+                return {"type": "http.disconnect"}
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                disconnected.set()
+            elif not message.get("more_body", False):
+                body_done.set()
+            return message
+
+        async def watch_disconnect():
+            await body_done.wait()
+            while not disconnected.is_set():
+                if (await receive())["type"] == "http.disconnect":
+                    disconnected.set()
+
+        response_started = False
+        response_complete = False
+
+        async def wrapped_send(message):
+            nonlocal response_started, response_complete
+            if message["type"] == "http.response.start":
+                response_started = True
+            elif message["type"] == "http.response.body" and not message.get("more_body", False):
+                response_complete = True
+            await send(message)
+
+        token = _deadline.set(time.monotonic() + budget if budget is not None else None)
+        try:
+            app_task = asyncio.create_task(self.app(scope, wrapped_receive, wrapped_send))
+        finally:
+            _deadline.reset(token)
+        watcher = asyncio.create_task(watch_disconnect())
+        disconnect_task = asyncio.create_task(disconnected.wait())
+
+        try:
+            done, _ = await asyncio.wait(
+                {app_task, disconnect_task},
+                timeout=max(budget, 0) if budget is not None else None,
+                return_when=asyncio.FIRST_COMPLETED
+            )
+            if app_task in done or response_complete:
+                # Servers report disconnect once the response is sent; let teardown finish
+                await app_task
+                return
+            if disconnect_task not in done and response_started:
+                # Cutting a streaming response short would leave the client a
+                # truncated body, so past the deadline it is allowed to finish
+                logger.warning(f"Deadline of {budget:.3f}s exceeded while streaming {scope['method']} {scope['path']}")
+                done, _ = await asyncio.wait({app_task, disconnect_task}, return_when=asyncio.FIRST_COMPLETED)
+                if app_task in done:
+                    await app_task
+                    return
+
+            app_task.cancel()
+            await asyncio.gather(app_task, return_exceptions=True)
+            path = scope["path"]
+            if disconnect_task in done:
+                logger.info(f"Client disconnected, cancelled {scope['method']} {path}")
+                status_code, error = CLIENT_CLOSED_REQUEST, "Client closed request"
+            else:
+                logger.warning(f"Deadline of {budget:.3f}s exceeded, cancelled {scope['method']} {path}")
+                status_code, error = status.HTTP_504_GATEWAY_TIMEOUT, "Request deadline exceeded"
+            if not response_started:
+                response = JSONResponse(status_code=status_code, content={"error": error, "path": path})
+                await response(scope, receive, send)
+        finally:
+            if not app_task.done():
+                app_task.cancel()
+            watcher.cancel()
+            disconnect_task.cancel()
@@ -0,0 +1,142 @@
+"""Pooled outbound HTTP transport with an in-process DNS cache"""
+import asyncio
+import ipaddress
+import socket
+import time
+from typing import Dict, List, Optional, Tuple
+
+import httpcore
+import httpx
+
+from app.core.logging import logger
+
+
+class DNSCache:
+    """
+    Resolved addresses per (host, port), kept for `ttl` seconds
+
+    A TTL of 0 disables caching. Concurrent lookups of the same name share
+    one resolution.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._entries: Dict[Tuple[str, int], Tuple[float, List[str]]] = {}
+        self._pending: Dict[Tuple[str, int], asyncio.Future] = {}
+
+    async def resolve(self, host: str, port: int) -> List[str]:
+        try:
+            ipaddress.ip_address(host)
+            return [host]
+        except ValueError:
+            pass
+
+        key = (host, port)
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[1]
+
+        pending = self._pending.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending[key] = future
+        try:
+            infos = await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM)
+            addresses = list(dict.fromkeys(info[4][0] for info in infos))
+            if self.ttl > 0:
+                self._entries[key] = (time.monotonic() + self.ttl, addresses)
+            future.set_result(addresses)
+            return addresses
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark retrieved so an unawaited failure is not reported as never retrieved
+            future.exception()
+            raise
+        finally:
+            del self._pending[key]
+
+    def invalidate(self, host: str, port: int) -> None:
+        self._entries.pop((host, port), None)
+
+
+class CachingNetworkBackend(httpcore.AsyncNetworkBackend):
+    """httpcore backend that connects to cached addresses instead of resolving per connection"""
+
+    def __init__(self, dns_cache: DNSCache, backend: Optional[httpcore.AsyncNetworkBackend] = None):
+        self.dns_cache = dns_cache
+        self._backend = backend or httpcore.AnyIOBackend()
+
+    async def connect_tcp(self, host, port, timeout=None, local_address=None, socket_options=None):
+        try:
+            addresses = await self.dns_cache.resolve(host, port)
+        except OSError as e:
+            # Surface as a connect error, like httpcore's own resolver does
+            raise httpcore.ConnectError(str(e)) from e
+        last_error: Optional[Exception] = None
+        for address in addresses:
+            try:
+                # TLS still uses the request host for SNI and verification
+                return await self._backend.connect_tcp(
+                    address, port, timeout=timeout, local_address=local_address, socket_options=socket_options
+                )
+            except (httpcore.ConnectError, httpcore.ConnectTimeout) as e:
+                last_error = e
+        # Every cached address failed; resolve afresh next time
+        self.dns_cache.invalidate(host, port)
+        raise last_error or httpcore.ConnectError(f"No addresses for {host}")
+
+    async def connect_unix_socket(self, path, timeout=None, socket_options=None):
+        return await self._backend.connect_unix_socket(path, timeout=timeout, socket_options=socket_options)
+
+    async def sleep(self, seconds: float) -> None:
+        await self._backend.sleep(seconds)
+
+
+class PooledTransport(httpx.AsyncHTTPTransport):
+    """AsyncHTTPTransport whose connection pool resolves through a DNSCache"""
+
+    def __init__(self, limits: httpx.Limits, dns_cache: DNSCache):
+        super().__init__(limits=limits)
+        # httpx does not expose the network backend, so rebuild its pool with ours
+        self._pool = httpcore.AsyncConnectionPool(
+            ssl_context=httpx.create_ssl_context(),
+            max_connections=limits.max_connections,
+            max_keepalive_connections=limits.max_keepalive_connections,
+            keepalive_expiry=limits.keepalive_expiry,
+            network_backend=CachingNetworkBackend(dns_cache)
+        )
+
+
+async def prewarm(client: httpx.AsyncClient, urls: List[str], connections: int, timeout: float) -> int:
+    """
+    Resolve and open `connections` pooled connections to each URL's host
+
+    Each connection is opened with a cheap unauthenticated GET; any HTTP
+    response counts, since only the connection is wanted. Returns the
+    number of connections that succeeded.
+    """
+    async def touch(url: str) -> Optional[str]:
+        try:
+            await client.get(url, timeout=timeout)
+            return None
+        except httpx.HTTPError as e:
+            return str(e) or type(e).__name__
+
+    targets = [url for url in urls for _ in range(connections)]
+    started = time.perf_counter()
+    try:
+        errors = await asyncio.wait_for(asyncio.gather(*(touch(url) for url in targets)), timeout)
+    except asyncio.TimeoutError:
+        logger.warning(f"Pre-warming {len(urls)} hosts did not finish within {timeout}s")
+        return 0
+
+    for url, error in dict(zip(targets, errors)).items():
+        if error:
+            logger.warning(f"Pre-warming {url} failed: {error}")
+    opened = errors.count(None)
+    logger.info(
+        f"Pre-warmed {opened} connections to {len(urls)} hosts in {(time.perf_counter() - started) * 1000:.0f}ms"
+    )
+    return opened
@@ -1,16 +1,20 @@
-"""Initialize database and create tables"""
+"""Initialize database and bring the schema up to date"""
 from app.core.database import engine, Base
-from app.models.tenant import Tenant
+from app.core.migrations import LATEST_VERSION, current_version, migrate
 from app.core.logging import logger
 
 
 def init_db():
-    """Create all database tables"""
+    """Run pending schema migrations; a single query when there are none"""
     try:
-        Base.metadata.create_all(bind=engine)
-        logger.info("Database tables created successfully")
+        version = current_version()
+        if version >= LATEST_VERSION:
+            logger.info(f"Database schema is current (version {version})")
+            return
+        version = migrate(version)
+        logger.info(f"Database schema migrated to version {version}")
     except Exception as e:
-        logger.error(f"Error creating database tables: {str(e)}")
+        logger.error(f"Error migrating database schema: {str(e)}")
         raise
 
 
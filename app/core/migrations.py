@@ -0,0 +1,318 @@
+"""Schema versioning: ordered migrations, each applied once per database"""
+from datetime import datetime
+from typing import Callable, List, NamedTuple
+
+from sqlalchemy import bindparam, func, insert, inspect, select, text, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import IntegrityError, OperationalError, ProgrammingError
+from sqlalchemy.orm import Session
+
+from app.core.database import Base, engine
+from app.core.logging import logger
+from app.core.state import ensure_versions
+# Every model must be imported so Base.metadata knows its table
+from app.models.tenant import Tenant, normalize_email
+from app.models.state_version import StateVersion
+from app.models.job import Job
+from app.models.event import Event
+from app.models.event_segment import EventSegment
+from app.models.schema_version import SchemaVersion
+from app.models.tenant_stat import TenantStat
+from app.models.role_template import RoleTemplate
+from app.services.provisioning import extract_app_credentials
+from app.services.role_templates import BUILTIN_ROLE_TEMPLATES
+from app.services.tenant_stats import INSERT_TRIGGER, rebuild_stats
+
+
+class Migration(NamedTuple):
+    version: int
+    name: str
+    apply: Callable[[Connection], None]
+
+
+def _baseline(connection: Connection) -> None:
+    """
+    Create every table and seed the state version counters
+
+    create_all builds tables with the current models, so later migrations
+    must tolerate finding their change already made on a fresh database.
+    It skips existing tables, which adopts databases from before versioning.
+    """
+    Base.metadata.create_all(bind=connection)
+    with Session(bind=connection) as db:
+        ensure_versions(db)
+
+
+def _sqlite_has_fts5(connection: Connection) -> bool:
+    options = connection.exec_driver_sql("PRAGMA compile_options").scalars().all()
+    return "ENABLE_FTS5" in options
+
+
+# External-content index: tenants holds the text, tenants_fts only the index.
+# prefix= keeps short prefix queries from scanning every term.
+TENANT_SEARCH_DDL = (
+    """CREATE VIRTUAL TABLE IF NOT EXISTS tenants_fts USING fts5(
+        user_first_name, user_last_name, user_email, user_phone,
+        content='tenants', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS tenants_fts_insert AFTER INSERT ON tenants BEGIN
+        INSERT INTO tenants_fts(rowid, user_first_name, user_last_name, user_email, user_phone)
+        VALUES (new.id, new.user_first_name, new.user_last_name, new.user_email, new.user_phone);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS tenants_fts_delete AFTER DELETE ON tenants BEGIN
+        INSERT INTO tenants_fts(tenants_fts, rowid, user_first_name, user_last_name, user_email, user_phone)
+        VALUES ('delete', old.id, old.user_first_name, old.user_last_name, old.user_email, old.user_phone);
+    END""",
+    # Only the indexed columns; status and timestamp updates leave the index alone
+    """CREATE TRIGGER IF NOT EXISTS tenants_fts_update
+    AFTER UPDATE OF user_first_name, user_last_name, user_email, user_phone ON tenants BEGIN
+        INSERT INTO tenants_fts(tenants_fts, rowid, user_first_name, user_last_name, user_email, user_phone)
+        VALUES ('delete', old.id, old.user_first_name, old.user_last_name, old.user_email, old.user_phone);
+        INSERT INTO tenants_fts(rowid, user_first_name, user_last_name, user_email, user_phone)
+        VALUES (new.id, new.user_first_name, new.user_last_name, new.user_email, new.user_phone);
+    END""",
+)
+
+
+def _tenant_search(connection: Connection) -> None:
+    """FTS5 index over tenant names, email and phone, kept in sync by triggers"""
+    if connection.dialect.name != "sqlite" or not _sqlite_has_fts5(connection):
+        # Search falls back to substring matching
+        logger.info("FTS5 unavailable; tenant search will use LIKE matching")
+        return
+    for statement in TENANT_SEARCH_DDL:
+        connection.execute(text(statement))
+    # Index rows that predate the triggers
+    connection.execute(text("INSERT INTO tenants_fts(tenants_fts) VALUES ('rebuild')"))
+
+
+def _has_column(connection: Connection, table_name: str, column_name: str) -> bool:
+    return any(column["name"] == column_name for column in inspect(connection).get_columns(table_name))
+
+
+# Rows normalized per UPDATE batch by the email backfill
+BACKFILL_BATCH_SIZE = 5000
+
+
+def _tenant_email_normalized(connection: Connection) -> None:
+    """Unique lower-cased email column, backfilled from user_email"""
+    tenants = Tenant.__table__
+    if not _has_column(connection, "tenants", "user_email_normalized"):
+        connection.execute(text("ALTER TABLE tenants ADD COLUMN user_email_normalized VARCHAR(255)"))
+    # Before the backfill, so its duplicate lookups are indexed; unfilled NULLs never collide
+    connection.execute(text(
+        "CREATE UNIQUE INDEX IF NOT EXISTS ix_tenants_user_email_normalized ON tenants (user_email_normalized)"
+    ))
+
+    statement = (
+        update(tenants)
+        .where(tenants.c.id == bindparam("row_id"))
+        .values(user_email_normalized=bindparam("normalized"))
+    )
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            select(tenants.c.id, tenants.c.user_id, tenants.c.user_email)
+            .where(tenants.c.id > last_id, tenants.c.user_email_normalized.is_(None))
+            .order_by(tenants.c.id)
+            .limit(BACKFILL_BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        last_id = rows[-1].id
+
+        # Normalize in Python, the same way the model does, rather than with SQL lower()
+        batch = {}
+        for row in rows:
+            batch.setdefault(normalize_email(row.user_email), []).append(row)
+        claimed = set(connection.scalars(
+            select(tenants.c.user_email_normalized).where(tenants.c.user_email_normalized.in_(list(batch)))
+        ))
+        updates = []
+        for normalized, group in batch.items():
+            # Case variants that predate the constraint: the oldest tenant keeps the claim
+            if normalized not in claimed:
+                updates.append({"row_id": group[0].id, "normalized": normalized})
+                group = group[1:]
+            for row in group:
+                logger.warning(f"Tenant {row.user_id} duplicates email {normalized} by case; left unnormalized")
+        if updates:
+            connection.execute(statement, updates)
+
+
+def _tenant_deleted_at(connection: Connection) -> None:
+    """Deactivation time for the tenant purge; existing inactive rows count from their last update"""
+    if not _has_column(connection, "tenants", "deleted_at"):
+        connection.execute(text("ALTER TABLE tenants ADD COLUMN deleted_at DATETIME"))
+    tenants = Tenant.__table__
+    connection.execute(
+        update(tenants)
+        .where(tenants.c.is_active == False, tenants.c.deleted_at.is_(None))
+        .values(deleted_at=func.coalesce(tenants.c.updated_at, tenants.c.created_at))
+    )
+    connection.execute(text("CREATE INDEX IF NOT EXISTS ix_tenants_deleted_at ON tenants (deleted_at)"))
+
+
+# (dimension, SQL for the counted value of row {row}); mirrors tenant_stats.DIMENSIONS
+_STAT_VALUES = (
+    ("total", "'all'"),
+    ("region", "{row}.cometchat_region"),
+    ("status", "CASE WHEN {row}.is_active THEN 'active' ELSE 'inactive' END"),
+    ("log_level", "{row}.cometchat_log_level"),
+)
+
+
+def _stat_increments(row: str, dimensions) -> str:
+    return "".join(
+        f"INSERT INTO tenant_stats (dimension, value, count) VALUES ('{dimension}', {value.format(row=row)}, 1) "
+        "ON CONFLICT (dimension, value) DO UPDATE SET count = count + 1;\n"
+        for dimension, value in dimensions
+    )
+
+
+def _stat_decrements(row: str, dimensions) -> str:
+    return "".join(
+        f"UPDATE tenant_stats SET count = count - 1 "
+        f"WHERE dimension = '{dimension}' AND value = {value.format(row=row)};\n"
+        for dimension, value in dimensions
+    )
+
+
+def _tenant_stats(connection: Connection) -> None:
+    """Tenant counts table, kept current by triggers on SQLite, then filled by a recount"""
+    TenantStat.__table__.create(bind=connection, checkfirst=True)
+    if connection.dialect.name == "sqlite":
+        # Status and log level updates only move counts between values; the total is unchanged
+        changed = _STAT_VALUES[1:]
+        for statement in (
+            f"CREATE TRIGGER IF NOT EXISTS {INSERT_TRIGGER} AFTER INSERT ON tenants BEGIN\n"
+            f"{_stat_increments('new', _STAT_VALUES)}END",
+            "CREATE TRIGGER IF NOT EXISTS tenant_stats_delete AFTER DELETE ON tenants BEGIN\n"
+            f"{_stat_decrements('old', _STAT_VALUES)}END",
+            "CREATE TRIGGER IF NOT EXISTS tenant_stats_update "
+            "AFTER UPDATE OF cometchat_region, is_active, cometchat_log_level ON tenants BEGIN\n"
+            f"{_stat_decrements('old', changed)}{_stat_increments('new', changed)}END",
+        ):
+            connection.execute(text(statement))
+    else:
+        logger.info("Tenant stats triggers are SQLite-only; statistics will be aggregated on read")
+    rebuild_stats(connection)
+
+
+def _role_templates(connection: Connection) -> None:
+    """Stored role templates, seeded with the built-in ones (edited seeds are kept)"""
+    table = RoleTemplate.__table__
+    table.create(bind=connection, checkfirst=True)
+    existing = set(connection.scalars(select(table.c.name)))
+    now = datetime.utcnow()
+    seeds = [
+        {
+            "name": name,
+            "role": role["role"],
+            "role_name": role["name"],
+            "description": role.get("description"),
+            "metadata": role.get("metadata"),
+            "settings": role.get("settings"),
+            "created_at": now,
+            "updated_at": now,
+        }
+        for name, role in BUILTIN_ROLE_TEMPLATES.items()
+        if name not in existing
+    ]
+    if seeds:
+        connection.execute(insert(table), seeds)
+
+
+def _tenant_updated_at_index(connection: Connection) -> None:
+    """Index for the tenant directory's incremental refresh by updated_at"""
+    connection.execute(text("CREATE INDEX IF NOT EXISTS ix_tenants_updated_at ON tenants (updated_at)"))
+
+
+def _job_heartbeat(connection: Connection) -> None:
+    """Heartbeat column for detecting dead job workers; running jobs count from their start"""
+    if not _has_column(connection, "jobs", "heartbeat_at"):
+        connection.execute(text("ALTER TABLE jobs ADD COLUMN heartbeat_at DATETIME"))
+    jobs = Job.__table__
+    connection.execute(
+        update(jobs)
+        .where(jobs.c.status == "running", jobs.c.heartbeat_at.is_(None))
+        .values(heartbeat_at=jobs.c.started_at)
+    )
+
+
+def _create_app_job_results(connection: Connection) -> None:
+    """Strip the app keys that create_app jobs used to keep in their plain-text results"""
+    jobs = Job.__table__
+    rows = connection.execute(
+        select(jobs.c.id, jobs.c.payload, jobs.c.result)
+        .where(jobs.c.kind == "create_app", jobs.c.status == "succeeded")
+    ).all()
+    for row in rows:
+        if not isinstance(row.result, dict) or "app_id" in row.result:
+            continue
+        app_id, _, _ = extract_app_credentials(row.result)
+        payload = row.payload or {}
+        connection.execute(
+            update(jobs).where(jobs.c.id == row.id).values(
+                result={"app_id": app_id, "name": payload.get("name"), "region": payload.get("region")}
+            )
+        )
+
+
+def _tenant_provisioning_claim(connection: Connection) -> None:
+    """Marker column for the provisioning claim"""
+    if not _has_column(connection, "tenants", "provisioning_claimed_at"):
+        connection.execute(text("ALTER TABLE tenants ADD COLUMN provisioning_claimed_at DATETIME"))
+
+
+# Append only; never renumber or edit an applied migration
+MIGRATIONS: List[Migration] = [
+    Migration(1, "baseline", _baseline),
+    Migration(2, "tenant_search", _tenant_search),
+    Migration(3, "tenant_email_normalized", _tenant_email_normalized),
+    Migration(4, "tenant_deleted_at", _tenant_deleted_at),
+    Migration(5, "tenant_stats", _tenant_stats),
+    Migration(6, "role_templates", _role_templates),
+    Migration(7, "tenant_updated_at_index", _tenant_updated_at_index),
+    Migration(8, "job_heartbeat", _job_heartbeat),
+    Migration(9, "create_app_job_results", _create_app_job_results),
+    Migration(10, "tenant_provisioning_claim", _tenant_provisioning_claim),
+]
+
+LATEST_VERSION = MIGRATIONS[-1].version
+
+
+def current_version() -> int:
+    """Highest applied migration, in a single query; 0 if never migrated"""
+    try:
+        with engine.connect() as connection:
+            return connection.scalar(select(func.max(SchemaVersion.version))) or 0
+    except (OperationalError, ProgrammingError):
+        # No schema_version table: a new database, or one created before versioning
+        return 0
+
+
+def migrate(from_version: int) -> int:
+    """Apply migrations newer than `from_version` in order; returns the new version"""
+    version = from_version
+    for migration in MIGRATIONS:
+        if migration.version <= version:
+            continue
+        try:
+            # A migration and its version row commit together
+            with engine.begin() as connection:
+                migration.apply(connection)
+                connection.execute(insert(SchemaVersion).values(
+                    version=migration.version,
+                    name=migration.name,
+                    applied_at=datetime.utcnow()
+                ))
+        except IntegrityError:
+            if current_version() < migration.version:
+                raise
+            logger.info(f"Schema migration {migration.version} was applied by another process")
+        else:
+            logger.info(f"Applied schema migration {migration.version} ({migration.name})")
+        version = migration.version
+    return version
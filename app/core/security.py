@@ -0,0 +1,21 @@
+"""Access checks for administrative endpoints"""
+import secrets
+from typing import Optional
+
+from fastapi import Header, HTTPException, status
+
+from app.core.config import get_settings
+
+
+settings = get_settings()
+
+
+def require_admin_token(x_admin_token: Optional[str] = Header(default=None)) -> None:
+    """Dependency: reject requests without the configured X-Admin-Token"""
+    if not settings.ADMIN_TOKEN or not x_admin_token or not secrets.compare_digest(
+        x_admin_token.encode(), settings.ADMIN_TOKEN.encode()
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin token required"
+        )
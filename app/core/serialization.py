@@ -0,0 +1,64 @@
+"""JSON serialization helpers with an opt-in orjson fast path"""
+import json
+from typing import Any, Dict, Type
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from pydantic import BaseModel
+
+from app.core.config import get_settings
+from app.core.logging import logger
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
+
+
+settings = get_settings()
+
+if settings.FAST_JSON and orjson is None:
+    logger.warning("FAST_JSON is enabled but orjson is not installed; using stdlib json")
+
+FAST_JSON_ENABLED = settings.FAST_JSON and orjson is not None
+
+# Default response class for the FastAPI application
+DefaultResponse = ORJSONResponse if FAST_JSON_ENABLED else JSONResponse
+
+
+def dumps(payload: Any) -> bytes:
+    """Encode a payload to compact JSON bytes"""
+    if FAST_JSON_ENABLED:
+        return orjson.dumps(payload)
+    return json.dumps(payload, separators=(",", ":")).encode("utf-8")
+
+
+def loads(text: str) -> Any:
+    """Decode JSON text"""
+    if FAST_JSON_ENABLED:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def body_kwargs(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    httpx request body arguments for a JSON payload
+
+    In fast mode the body is pre-encoded with orjson and sent as raw content,
+    otherwise httpx encodes it with the stdlib json module.
+    """
+    if FAST_JSON_ENABLED:
+        return {"content": orjson.dumps(payload)}
+    return {"json": payload}
+
+
+def trusted_response(model: Type[BaseModel], status_code: int = 200, **fields):
+    """
+    Build an API envelope response
+
+    In fast mode the fields are serialized directly and the response_model
+    re-validation is skipped (the data is already trusted), otherwise the
+    Pydantic model is returned and validated by FastAPI as usual.
+    """
+    if FAST_JSON_ENABLED:
+        return ORJSONResponse(fields, status_code=status_code)
+    return model(**fields)
@@ -0,0 +1,125 @@
+"""Cross-process state versioning and cache invalidation"""
+import asyncio
+from typing import Callable, Dict, List
+
+from sqlalchemy import event, insert, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.core.database import SessionLocal
+from app.core.logging import logger
+from app.models.state_version import StateVersion
+from app.models.tenant import Tenant
+
+
+settings = get_settings()
+
+# Named state every process may cache locally
+TENANTS = "tenants"
+CREDENTIALS = "credentials"
+STATE_NAMES = (TENANTS, CREDENTIALS)
+
+# Models whose writes bump a state version, filled by track_changes()
+_tracked_models: Dict[type, str] = {}
+
+
+def bump_version(connection, name: str) -> None:
+    """Increment a state version within the caller's transaction"""
+    table = StateVersion.__table__
+    result = connection.execute(
+        update(table)
+        .where(table.c.name == name)
+        .values(version=table.c.version + 1)
+    )
+    if result.rowcount == 0:
+        connection.execute(insert(table).values(name=name, version=1))
+
+
+def get_version(db: Session, name: str) -> int:
+    """Current version of `name` read straight from the database"""
+    return db.scalar(select(StateVersion.version).where(StateVersion.name == name)) or 0
+
+
+def ensure_versions(db: Session) -> None:
+    """Seed a counter row for every known state name"""
+    existing = set(db.scalars(select(StateVersion.name)))
+    for name in STATE_NAMES:
+        if name not in existing:
+            db.add(StateVersion(name=name, version=0))
+    db.commit()
+
+
+def track_changes(model: type, name: str) -> None:
+    """Bump `name` whenever a flush inserts, updates or deletes `model` rows"""
+    _tracked_models[model] = name
+
+
+@event.listens_for(Session, "after_flush")
+def _bump_tracked_versions(session: Session, flush_context) -> None:
+    """Bump versions for tracked models touched by this flush"""
+    if not _tracked_models:
+        return
+    changed = {
+        _tracked_models[type(obj)]
+        for obj in (*session.new, *session.dirty, *session.deleted)
+        if type(obj) in _tracked_models
+    }
+    for name in changed:
+        bump_version(session.connection(), name)
+
+
+class StateWatcher:
+    """
+    Polls state_versions and runs callbacks when another process bumps one
+
+    A poll is a single primary-key scan of a tiny table, so it is cheap
+    enough to run every second in every worker.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._callbacks: Dict[str, List[Callable[[], None]]] = {}
+        self._seen: Dict[str, int] = {}
+
+    def subscribe(self, name: str, callback: Callable[[], None]) -> None:
+        """Run `callback` whenever the `name` version changes"""
+        self._callbacks.setdefault(name, []).append(callback)
+
+    def current(self, name: str) -> int:
+        """Last version observed for `name` (0 if never seen)"""
+        return self._seen.get(name, 0)
+
+    def poll(self) -> None:
+        """Read all versions once and fire callbacks for changed ones"""
+        db = SessionLocal()
+        try:
+            versions = dict(db.execute(select(StateVersion.name, StateVersion.version)).all())
+        finally:
+            db.close()
+
+        for name, version in versions.items():
+            previous = self._seen.get(name)
+            self._seen[name] = version
+            if previous is None or previous == version:
+                continue
+            for callback in self._callbacks.get(name, []):
+                try:
+                    callback()
+                except Exception as e:
+                    logger.error(f"State callback for {name} failed: {str(e)}")
+
+    async def run(self) -> None:
+        """Poll forever; cancelled on shutdown"""
+        while True:
+            try:
+                # Off the event loop: waiting on the connection pool must not
+                # stall the requests that would return connections to it
+                await asyncio.to_thread(self.poll)
+            except Exception as e:
+                logger.error(f"State version poll failed: {str(e)}")
+            await asyncio.sleep(self.interval)
+
+
+track_changes(Tenant, TENANTS)
+
+state_watcher = StateWatcher(settings.STATE_POLL_INTERVAL_SECONDS)
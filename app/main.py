@@ -3,17 +3,45 @@ from fastapi import FastAPI, Request, status
 from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+import asyncio
 import time
 
-from app.api.v1 import webhooks, apps, roles, tenants
+# Routers, the models and services they are built on, and the job runner
+# load eagerly: every worker serves them from its first request. Subsystems
+# only some deployments or jobs use load on first use: the replay,
+# retention, reconciliation, role rollout, purge and stats rebuild job
+# handlers, profiling and the tenant directory.
+from app.api.v1 import webhooks, apps, roles, tenants, jobs, events, reconciliation
 from app.core.config import get_settings
 from app.core.logging import logger
+from app.core.admission import gate_for
+from app.core.deadline import DeadlineMiddleware
+from app.core.compression import CompressionMiddleware
 from app.core.init_db import init_db
+from app.core.database import SessionLocal
+from app.models.tenant import Tenant
+from app.core.serialization import DefaultResponse
+from app.core.crypto import cipher
+from app.core.state import CREDENTIALS, TENANTS, state_watcher
 from app.services.cometchat_client import cometchat_client
+from app.services.jobs import job_runner
+from app.services.tenant_stats import read_stats
 
 settings = get_settings()
 
 
+def _prewarm_targets():
+    """(app_id, region) of the most recently active tenant apps"""
+    db = SessionLocal()
+    try:
+        return db.query(Tenant.cometchat_app_id, Tenant.cometchat_region).filter(
+            Tenant.is_active == True,
+            Tenant.cometchat_app_id.isnot(None)
+        ).order_by(Tenant.updated_at.desc()).limit(settings.COMETCHAT_PREWARM_MAX_HOSTS).all()
+    finally:
+        db.close()
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifecycle events"""
@@ -27,8 +55,38 @@ async def lifespan(app: FastAPI):
         logger.error(f"Failed to initialize database: {str(e)}")
         raise
     
+    # Drop per-process caches when another worker changes shared state
+    state_watcher.subscribe(CREDENTIALS, cipher.clear_cache)
+    if settings.TENANT_DIRECTORY_ENABLED:
+        from app.services.tenant_directory import tenant_directory
+        await asyncio.to_thread(tenant_directory.load)
+        state_watcher.subscribe(TENANTS, tenant_directory.refresh)
+        # Rotation rewrites tokens without touching updated_at
+        state_watcher.subscribe(CREDENTIALS, tenant_directory.load)
+    state_watcher.poll()
+    watcher_task = asyncio.create_task(state_watcher.run())
+    
+    await job_runner.start()
+    
+    # Open CometChat connections before the first request needs them
+    await cometchat_client.prewarm(await asyncio.to_thread(_prewarm_targets))
+    
+    background_tasks = [watcher_task]
+    if settings.EVENT_RETENTION_DAYS > 0 and settings.EVENT_RETENTION_INTERVAL_SECONDS > 0:
+        background_tasks.append(
+            asyncio.create_task(job_runner.schedule(events.RETENTION_JOB, settings.EVENT_RETENTION_INTERVAL_SECONDS))
+        )
+    if settings.TENANT_PURGE_RETENTION_DAYS > 0 and settings.TENANT_PURGE_INTERVAL_SECONDS > 0:
+        background_tasks.append(
+            asyncio.create_task(job_runner.schedule(tenants.PURGE_JOB, settings.TENANT_PURGE_INTERVAL_SECONDS))
+        )
+    
     yield
     
+    await job_runner.stop()
+    for task in background_tasks:
+        task.cancel()
+    await cometchat_client.aclose()
     logger.info("Shutting down CometChat Management Service")
 
 
@@ -37,6 +95,7 @@ app = FastAPI(
     description="Microservice for managing CometChat webhooks, apps, roles, and tenants",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=DefaultResponse,
     docs_url="/docs",
     redoc_url="/redoc"
 )
@@ -52,6 +111,46 @@ app.add_middleware(
 )
 
 
+@app.middleware("http")
+async def admission_control(request: Request, call_next):
+    """Bound in-flight requests per route class and shed load beyond the queue"""
+    gate = gate_for(request.url.path)
+    if gate is None:
+        return await call_next(request)
+    
+    if not await gate.acquire():
+        logger.warning(f"Shedding {request.method} {request.url.path}: {gate.name} budget exhausted")
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            headers={"Retry-After": str(settings.ADMISSION_RETRY_AFTER_SECONDS)},
+            content={
+                "error": "Service overloaded",
+                "message": f"Too many concurrent {gate.name} requests, retry later",
+                "path": request.url.path
+            }
+        )
+    
+    try:
+        return await call_next(request)
+    finally:
+        gate.release()
+
+
+# Outside admission control so time spent queued counts against the deadline
+app.add_middleware(DeadlineMiddleware)
+
+if settings.COMPRESSION_ENABLED:
+    # log_requests' call_next returns at the response start, so logged
+    # timings do not include compressing the body
+    app.add_middleware(
+        CompressionMiddleware,
+        min_size=settings.COMPRESSION_MIN_SIZE,
+        encodings=settings.COMPRESSION_ENCODINGS,
+        content_types=settings.COMPRESSION_CONTENT_TYPES
+    )
+
+
+# Registered last so it wraps everything above and logs shed/cancelled requests too
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
     """Log all requests with timing"""
@@ -114,12 +213,9 @@ async def readiness_check():
 async def database_check():
     """Database health check"""
     try:
-        from app.core.database import SessionLocal
-        from app.models.tenant import Tenant
-        
         db = SessionLocal()
-        # Try to query database
-        count = db.query(Tenant).count()
+        # Maintained counts instead of a table scan
+        count = read_stats(db)["total"]
         db.close()
         
         return {
@@ -144,6 +240,13 @@ app.include_router(tenants.router)  # NEW: Tenant management
 app.include_router(webhooks.router)
 app.include_router(apps.router)
 app.include_router(roles.router)
+app.include_router(jobs.router)
+app.include_router(events.router)
+app.include_router(reconciliation.router)
+if settings.PROFILING_ENABLED:
+    # Only load the profilers (cProfile, pstats, tracemalloc) where they can be reached
+    from app.api.v1 import profiling
+    app.include_router(profiling.router)
 
 
 @app.get("/", tags=["root"])
@@ -158,7 +261,10 @@ async def root():
             "tenants": "/api/v1/tenants",
             "webhooks": "/api/v1/webhooks",
             "apps": "/api/v1/apps",
-            "roles": "/api/v1/roles"
+            "roles": "/api/v1/roles",
+            "jobs": "/api/v1/jobs",
+            "events": "/api/v1/events",
+            "reconciliation": "/api/v1/reconciliation"
         },
         "documentation": {
             "swagger": "/docs",
@@ -181,14 +287,20 @@ async def api_info():
             "/api/v1/tenants",
             "/api/v1/webhooks",
             "/api/v1/apps",
-            "/api/v1/roles"
+            "/api/v1/roles",
+            "/api/v1/jobs",
+            "/api/v1/events",
+            "/api/v1/reconciliation"
         ],
         "features": [
             "Multi-tenant support",
             "Dynamic CometChat credentials",
             "Webhook management",
             "App creation",
-            "Role management"
+            "Role management",
+            "Background jobs",
+            "Event store and replay",
+            "Drift reconciliation"
         ]
     }
 
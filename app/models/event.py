@@ -0,0 +1,39 @@
+"""Stored CometChat webhook event model"""
+from datetime import datetime
+from sqlalchemy import Column, String, Integer, JSON, DateTime, Index
+from app.core.database import Base
+
+
+class Event(Base):
+    """
+    Webhook event received from CometChat
+
+    Events are stored before processing so any time range can be replayed
+    through the processing pipeline later.
+    """
+    __tablename__ = "events"
+    __table_args__ = (
+        # Replay walks one app's events in (received_at, id) order
+        Index("ix_events_app_received", "app_id", "received_at", "id"),
+        # Retention scans for the oldest events across all apps
+        Index("ix_events_received_at", "received_at"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    app_id = Column(String(100), nullable=False, comment="CometChat app the event belongs to")
+    trigger = Column(String(100), nullable=False, index=True, comment="Webhook trigger, e.g. after_message")
+    payload = Column(JSON, nullable=False)
+    received_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    def to_dict(self):
+        """Event as passed to processing handlers"""
+        return {
+            "id": self.id,
+            "app_id": self.app_id,
+            "trigger": self.trigger,
+            "payload": self.payload,
+            "received_at": self.received_at
+        }
+
+    def __repr__(self):
+        return f"<Event(id={self.id}, app_id={self.app_id}, trigger={self.trigger})>"
@@ -0,0 +1,34 @@
+"""Archived event segment index model"""
+from datetime import datetime
+from sqlalchemy import Column, String, Integer, Date, DateTime, UniqueConstraint
+from app.core.database import Base
+
+
+class EventSegment(Base):
+    """
+    Index entry for one archived segment file (one app, one UTC day)
+
+    Segment files are gzip streams of JSON lines, appended one gzip member
+    per retention batch. `size_bytes` is the committed length: bytes past
+    it come from a batch that crashed before its delete committed, and are
+    truncated before the next append.
+    """
+    __tablename__ = "event_segments"
+    __table_args__ = (
+        UniqueConstraint("app_id", "day", name="uq_event_segments_app_day"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    app_id = Column(String(100), nullable=False, index=True)
+    day = Column(Date, nullable=False)
+    path = Column(String(500), nullable=False, comment="Relative to EVENT_ARCHIVE_DIR")
+    event_count = Column(Integer, default=0, nullable=False)
+    size_bytes = Column(Integer, default=0, nullable=False)
+    first_event_id = Column(Integer, nullable=True)
+    last_event_id = Column(Integer, nullable=True)
+    first_received_at = Column(DateTime, nullable=True)
+    last_received_at = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<EventSegment(app_id={self.app_id}, day={self.day}, events={self.event_count})>"
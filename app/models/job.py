@@ -0,0 +1,44 @@
+"""Background job model"""
+import uuid
+from datetime import datetime
+from sqlalchemy import Column, String, Integer, JSON, DateTime, Text
+from app.core.database import Base
+
+
+class Job(Base):
+    """
+    Persistent background job
+
+    Rows move pending -> running -> succeeded/failed. The row is the source
+    of truth, so jobs survive restarts and can be claimed by any worker.
+    """
+    __tablename__ = "jobs"
+
+    id = Column(
+        String(36),
+        primary_key=True,
+        default=lambda: str(uuid.uuid4()),
+        comment="Job identifier (UUID)"
+    )
+    kind = Column(String(50), nullable=False, index=True)
+    status = Column(
+        String(20),
+        default="pending",
+        nullable=False,
+        index=True,
+        comment="pending, running, succeeded, failed"
+    )
+    payload = Column(JSON, nullable=True)
+    result = Column(JSON, nullable=True)
+    error = Column(Text, nullable=True)
+    attempts = Column(Integer, default=0, nullable=False)
+
+    # Timestamps
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    started_at = Column(DateTime, nullable=True)
+    # Refreshed by the running worker; a running job whose heartbeat stops is recovered
+    heartbeat_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+    def __repr__(self):
+        return f"<Job(id={self.id}, kind={self.kind}, status={self.status})>"
@@ -0,0 +1,49 @@
+"""Named role template model"""
+from datetime import datetime
+from typing import Any, Dict
+from sqlalchemy import Column, String, JSON, DateTime, Text
+from app.core.database import Base
+
+
+class RoleTemplate(Base):
+    """
+    Named CometChat role payload that can be applied to tenant apps
+
+    `name` addresses the template (e.g. in provisioning and bulk rollout);
+    `role` is the role UID it creates in each app. Built-in templates are
+    seeded by the role_templates migration and can be edited like any other.
+    """
+    __tablename__ = "role_templates"
+
+    name = Column(String(100), primary_key=True)
+    role = Column(String(100), nullable=False, comment="CometChat role UID")
+    role_name = Column(String(255), nullable=False, comment="CometChat role display name")
+    description = Column(Text, nullable=True)
+    role_metadata = Column("metadata", JSON, nullable=True)
+    settings = Column(JSON, nullable=True)
+
+    # Timestamps
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    def to_role(self) -> Dict[str, Any]:
+        """Keyword arguments for CometChatClient.create_role"""
+        return {
+            "role": self.role,
+            "name": self.role_name,
+            "description": self.description,
+            "metadata": self.role_metadata,
+            "settings": self.settings
+        }
+
+    def to_dict(self):
+        """Convert model to dictionary"""
+        return {
+            "template": self.name,
+            **self.to_role(),
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None
+        }
+
+    def __repr__(self):
+        return f"<RoleTemplate(name={self.name}, role={self.role})>"
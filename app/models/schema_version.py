@@ -0,0 +1,21 @@
+"""Applied schema migrations"""
+from datetime import datetime
+from sqlalchemy import Column, String, Integer, DateTime
+from app.core.database import Base
+
+
+class SchemaVersion(Base):
+    """
+    One row per migration applied to this database
+
+    The highest version is the schema level; startup reads it with a
+    single query and runs migrations only when it lags the code.
+    """
+    __tablename__ = "schema_version"
+
+    version = Column(Integer, primary_key=True, autoincrement=False)
+    name = Column(String(100), nullable=False)
+    applied_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<SchemaVersion(version={self.version}, name={self.name})>"
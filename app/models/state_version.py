@@ -0,0 +1,20 @@
+"""State version counters shared by all worker processes"""
+from sqlalchemy import Column, String, Integer
+from app.core.database import Base
+
+
+class StateVersion(Base):
+    """
+    Monotonic version counter per named piece of shared state
+
+    Writers bump the counter in the same transaction as their change;
+    every worker polls the table and drops its local caches when a
+    counter moves.
+    """
+    __tablename__ = "state_versions"
+
+    name = Column(String(50), primary_key=True)
+    version = Column(Integer, default=0, nullable=False)
+
+    def __repr__(self):
+        return f"<StateVersion(name={self.name}, version={self.version})>"
@@ -1,8 +1,15 @@
 """Tenant model for storing app credentials (SQLite compatible)"""
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, Integer, JSON, DateTime, Boolean, Text
+from sqlalchemy import Column, String, Integer, JSON, DateTime, Boolean
+from sqlalchemy.orm import deferred, validates
 from app.core.database import Base
+from app.core.crypto import EncryptedText
+
+
+def normalize_email(email):
+    """Canonical form for uniqueness: case and surrounding whitespace ignored"""
+    return email.strip().lower() if email is not None else None
 
 
 class Tenant(Base):
@@ -34,19 +41,28 @@ class Tenant(Base):
         nullable=False,
         comment="User email address"
     )
+    # Set from user_email; its unique index makes case variants collide on insert
+    user_email_normalized = Column(
+        String(255),
+        unique=True,
+        index=True,
+        nullable=True,
+        comment="Lower-cased user_email"
+    )
     user_phone = Column(String(20), nullable=True)
     
-    # CometChat App Credentials (encrypted in production)
+    # CometChat App Credentials (encrypted at rest when CREDENTIAL_ENCRYPTION_KEYS is set)
+    # Secret columns are deferred so read paths never pull them unless asked
     cometchat_app_id = Column(
         String(100), 
         nullable=True,
         comment="CometChat Application ID"
     )
-    cometchat_api_key = Column(
-        Text, 
+    cometchat_api_key = deferred(Column(
+        EncryptedText, 
         nullable=True,
         comment="CometChat REST API Key"
-    )
+    ), group="credentials")
     cometchat_region = Column(
         String(10), 
         default="us", 
@@ -60,18 +76,18 @@ class Tenant(Base):
         nullable=True,
         comment="Account-level key"
     )
-    cometchat_account_secret = Column(
-        Text, 
+    cometchat_account_secret = deferred(Column(
+        EncryptedText, 
         nullable=True,
         comment="Account-level secret"
-    )
+    ), group="credentials")
     
     # Optional: Auth credentials (if needed)
-    cometchat_auth_key = Column(
-        Text, 
+    cometchat_auth_key = deferred(Column(
+        EncryptedText, 
         nullable=True,
         comment="Auth key for client-side"
-    )
+    ), group="credentials")
     
     # Configuration
     cometchat_log_level = Column(
@@ -93,11 +109,13 @@ class Tenant(Base):
         default=datetime.utcnow, 
         nullable=False
     )
+    # Indexed for incremental reads of recently changed tenants
     updated_at = Column(
         DateTime, 
         default=datetime.utcnow,
         onupdate=datetime.utcnow,
-        nullable=True
+        nullable=True,
+        index=True
     )
     
     # Status
@@ -107,6 +125,31 @@ class Tenant(Base):
         nullable=False, 
         index=True
     )
+    # Soft delete is deactivation; rows inactive past the retention period are purged
+    deleted_at = Column(
+        DateTime,
+        nullable=True,
+        index=True,
+        comment="When the tenant was last deactivated"
+    )
+    # Set while a provisioning call owns the tenant, so concurrent calls cannot create two apps
+    provisioning_claimed_at = Column(
+        DateTime,
+        nullable=True
+    )
+    
+    @validates("user_email")
+    def _normalize_user_email(self, key, value):
+        self.user_email_normalized = normalize_email(value)
+        return value
+    
+    @validates("is_active")
+    def _track_deactivation(self, key, value):
+        if value is False and self.is_active is not False:
+            self.deleted_at = datetime.utcnow()
+        elif value:
+            self.deleted_at = None
+        return value
     
     def __repr__(self):
         return f"<Tenant(id={self.id}, user_id={self.user_id}, email={self.user_email}, active={self.is_active})>"
@@ -134,3 +177,21 @@ class Tenant(Base):
             "updated_at": self.updated_at.isoformat() if self.updated_at else None,
             "is_active": self.is_active
         }
+
+
+# Columns returned by TenantResponse, in schema order. Selecting these instead of
+# the entity skips the secret TEXT columns and ORM identity-map hydration.
+TENANT_RESPONSE_COLUMNS = (
+    Tenant.id,
+    Tenant.user_id,
+    Tenant.user_first_name,
+    Tenant.user_last_name,
+    Tenant.user_email,
+    Tenant.user_phone,
+    Tenant.cometchat_region,
+    Tenant.cometchat_log_level,
+    Tenant.extra_metadata,
+    Tenant.created_at,
+    Tenant.updated_at,
+    Tenant.is_active,
+)
@@ -0,0 +1,21 @@
+"""Pre-aggregated tenant counts"""
+from sqlalchemy import Column, String, Integer
+from app.core.database import Base
+
+
+class TenantStat(Base):
+    """
+    Tenant count for one value of one dimension (region, status, log level)
+
+    Kept current by triggers on `tenants`, so reading every count is a scan
+    of a handful of rows however many tenants there are. The "total"
+    dimension has the single value "all".
+    """
+    __tablename__ = "tenant_stats"
+
+    dimension = Column(String(20), primary_key=True)
+    value = Column(String(100), primary_key=True)
+    count = Column(Integer, default=0, nullable=False)
+
+    def __repr__(self):
+        return f"<TenantStat(dimension={self.dimension}, value={self.value}, count={self.count})>"
@@ -0,0 +1,38 @@
+"""Stored event schemas"""
+from pydantic import BaseModel, Field, model_validator
+from typing import Optional
+from datetime import datetime
+
+
+class EventIngestResponse(BaseModel):
+    """Response for a received webhook event"""
+    event_id: int
+    processed: bool
+
+
+class EventReplayRequest(BaseModel):
+    """Request schema for replaying a tenant's stored events"""
+    user_id: str = Field(..., description="Tenant whose CometChat app events are replayed")
+    start: datetime = Field(..., description="Replay events received at or after this time (UTC)")
+    end: datetime = Field(..., description="Replay events received before this time (UTC)")
+    trigger: Optional[str] = Field(default=None, description="Only replay this webhook trigger")
+    rate_per_second: Optional[float] = Field(default=None, ge=0, description="Events per second; 0 = unthrottled")
+    chunk_size: Optional[int] = Field(default=None, ge=1, le=10000)
+    resume_from: Optional[str] = Field(default=None, description="Job id of an earlier replay to continue from")
+
+    @model_validator(mode="after")
+    def check_range(self):
+        if self.end <= self.start:
+            raise ValueError("end must be after start")
+        return self
+
+    model_config = {
+        "json_schema_extra": {
+            "example": {
+                "user_id": "550e8400-e29b-41d4-a716-446655440000",
+                "start": "2024-01-01T00:00:00",
+                "end": "2024-01-02T00:00:00",
+                "rate_per_second": 50
+            }
+        }
+    }
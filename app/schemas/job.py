@@ -0,0 +1,27 @@
+"""Background job schemas"""
+from pydantic import BaseModel
+from typing import Optional, Any
+from datetime import datetime
+
+
+class JobAcceptedResponse(BaseModel):
+    """Response for a request accepted as a background job"""
+    job_id: str
+    status: str
+    status_url: str
+
+
+class JobResponse(BaseModel):
+    """Schema for job status"""
+    id: str
+    kind: str
+    status: str
+    result: Optional[Any] = None
+    error: Optional[str] = None
+    attempts: int
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,33 @@
+"""Tenant provisioning schemas"""
+from pydantic import BaseModel, Field
+from typing import Optional, List
+from app.schemas.webhook import WebhookCreateRequest
+
+
+class ProvisionRequest(BaseModel):
+    """Request schema for one-shot tenant onboarding"""
+    app_name: Optional[str] = Field(None, description="App name (defaults to the tenant's name)")
+    region: Optional[str] = Field(None, description="App region (defaults to the tenant's region)")
+    case_sensitive: bool = Field(True, alias="caseSensitive", description="Enable case sensitivity")
+    roles: List[str] = Field(default=["admin"], description="Role templates to create")
+    webhooks: List[WebhookCreateRequest] = Field(default=[], description="Webhooks to create")
+
+    model_config = {"populate_by_name": True}
+
+
+class ProvisionStep(BaseModel):
+    """Outcome of one provisioning step"""
+    name: str
+    status: str  # succeeded, failed, skipped
+    duration_ms: float
+    error: Optional[str] = None
+
+
+class ProvisionResponse(BaseModel):
+    """Response schema for tenant provisioning"""
+    success: bool
+    message: str
+    user_id: str
+    app_id: Optional[str] = None
+    total_ms: float
+    steps: List[ProvisionStep]
@@ -0,0 +1,17 @@
+"""Drift reconciliation schemas"""
+from pydantic import BaseModel, Field
+from typing import Optional, List
+from app.schemas.webhook import WebhookCreateRequest
+
+
+class ReconcileRequest(BaseModel):
+    """Desired roles and webhooks of every tenant app"""
+    roles: List[str] = Field(default=["admin"], description="Role templates every app should have")
+    webhooks: List[WebhookCreateRequest] = Field(default=[], description="Webhooks every app should have")
+    dry_run: bool = Field(True, description="Only report drift; apply nothing")
+    concurrency: Optional[int] = Field(
+        None, ge=1, le=200, description="Apps reconciled at once (defaults to RECONCILE_CONCURRENCY)"
+    )
+    user_ids: Optional[List[str]] = Field(
+        None, min_length=1, max_length=1000, description="Limit to these tenants (default: all active tenants)"
+    )
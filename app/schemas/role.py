@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 
 class RoleCreateRequest(BaseModel):
     role: str = Field(..., description="The unique identifier for the role")
@@ -13,3 +13,35 @@ class RoleResponse(BaseModel):
     message: str
     data: Dict[str, Any]
 
+
+class RoleTemplateResponse(BaseModel):
+    template: str = Field(..., description="Template name")
+    role: str
+    name: str
+    description: Optional[str] = None
+    metadata: Optional[Dict[str, Any]] = None
+    settings: Optional[Dict[str, Any]] = None
+    created_at: Optional[str] = None
+    updated_at: Optional[str] = None
+
+class RoleTemplateApplyRequest(BaseModel):
+    user_ids: List[str] = Field(..., min_length=1, max_length=5000, description="Tenants whose apps get the role")
+    concurrency: Optional[int] = Field(
+        None, ge=1, le=200, description="Apps updated at once (defaults to ROLE_TEMPLATE_APPLY_CONCURRENCY)"
+    )
+    update_existing: bool = Field(True, description="Update the role where it already exists")
+
+class RoleTemplateApplyResult(BaseModel):
+    user_id: str
+    app_id: Optional[str] = None
+    status: str  # created, updated, exists, skipped, failed
+    duration_ms: float
+    error: Optional[str] = None
+
+class RoleTemplateApplyResponse(BaseModel):
+    template: str
+    role: str
+    requested: int
+    counts: Dict[str, int]
+    total_ms: float
+    results: List[RoleTemplateApplyResult]
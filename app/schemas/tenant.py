@@ -1,6 +1,6 @@
 """Tenant schemas for API requests/responses"""
-from pydantic import BaseModel, EmailStr, Field
-from typing import Optional, Dict, Any
+from pydantic import BaseModel, EmailStr, Field, model_validator
+from typing import Optional, Dict, Any, List
 from datetime import datetime
 
 
@@ -48,3 +48,53 @@ class TenantResponse(TenantBase):
     
     class Config:
         from_attributes = True
+
+
+class TenantBulkFilter(BaseModel):
+    """Tenants selected by a bulk update; every given condition must hold"""
+    is_active: Optional[bool] = None
+    cometchat_region: Optional[str] = None
+    cometchat_app_id: Optional[str] = None
+    created_before: Optional[datetime] = None
+    created_after: Optional[datetime] = None
+
+    @model_validator(mode="after")
+    def check_not_empty(self):
+        if not self.model_dump(exclude_none=True):
+            raise ValueError("filter needs at least one condition")
+        return self
+
+
+class TenantBulkStatusUpdate(BaseModel):
+    """Request schema for activating or deactivating many tenants at once"""
+    is_active: bool
+    user_ids: Optional[List[str]] = Field(default=None, min_length=1, max_length=1000)
+    filter: Optional[TenantBulkFilter] = None
+
+    @model_validator(mode="after")
+    def check_selector(self):
+        if (self.user_ids is None) == (self.filter is None):
+            raise ValueError("give exactly one of user_ids or filter")
+        return self
+
+    model_config = {
+        "json_schema_extra": {
+            "example": {
+                "is_active": False,
+                "filter": {"cometchat_region": "eu", "created_before": "2024-01-01T00:00:00"}
+            }
+        }
+    }
+
+
+class TenantBulkStatusResponse(BaseModel):
+    """Response for a bulk status update"""
+    updated: int
+
+
+class TenantStatsResponse(BaseModel):
+    """Tenant counts for dashboards"""
+    total: int
+    by_region: Dict[str, int]
+    by_status: Dict[str, int]
+    by_log_level: Dict[str, int]
@@ -1,29 +1,203 @@
 """CometChat client service for webhook operations"""
+import asyncio
 import httpx
-from typing import Optional, Dict, Any
+from dataclasses import dataclass
+from typing import Optional, Dict, Any, Iterable, List, Tuple
+from app.core import deadline
 from app.core.config import get_settings
+from app.core.http_client import DNSCache, PooledTransport, prewarm
 from app.core.logging import logger
+from app.core.serialization import body_kwargs
+from app.utils.cache import TTLCache
 from app.utils.exceptions import CometChatAPIError
+from app.utils.rate_limit import AsyncTokenBucket
 
 
 settings = get_settings()
 
 
+@dataclass(frozen=True)
+class AppCredentials:
+    """REST credentials of a tenant's CometChat app"""
+    app_id: str
+    api_key: str
+    region: str = "us"
+
+
+# Page size for list calls
+LIST_PAGE_SIZE = 100
+
+
+def webhook_payload(
+    webhook_id: str,
+    name: str,
+    url: str,
+    basic_auth: bool = False,
+    username: Optional[str] = None,
+    password: Optional[str] = None,
+    enabled: bool = True,
+    retry_on_failure: bool = True
+) -> Dict[str, Any]:
+    """Webhook as CometChat stores it"""
+    payload = {
+        "id": webhook_id,
+        "name": name,
+        "url": url,
+        "basicAuth": basic_auth,
+        "enabled": enabled,
+        "retryOnFailure": retry_on_failure
+    }
+    
+    if basic_auth and username and password:
+        payload["username"] = username
+        payload["password"] = password
+    return payload
+
+
+def role_payload(
+    role: str,
+    name: str,
+    description: Optional[str] = None,
+    metadata: Optional[Dict[str, Any]] = None,
+    settings: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """Role as CometChat stores it"""
+    payload = {
+        "role": role,
+        "name": name
+    }
+    
+    if description:
+        payload["description"] = description
+        
+    if metadata:
+        payload["metadata"] = metadata
+
+    if settings:
+        payload["settings"] = settings
+    return payload
+
+
 class CometChatClient:
     """Client for CometChat API operations"""
     
     def __init__(self):
         # FIXED: Correct endpoint format with appId as subdomain
-        self.base_url = f"https://{settings.COMETCHAT_APP_ID}.api-{settings.COMETCHAT_REGION}.cometchat.io/v3"
+        self.base_url = (
+            settings.COMETCHAT_API_BASE_URL
+            or f"https://{settings.COMETCHAT_APP_ID}.api-{settings.COMETCHAT_REGION}.cometchat.io/v3"
+        )
         self.timeout = httpx.Timeout(30.0, connect=10.0)
+        self.limits = httpx.Limits(
+            max_connections=settings.COMETCHAT_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.COMETCHAT_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.COMETCHAT_KEEPALIVE_EXPIRY_SECONDS
+        )
+        self.dns_cache = DNSCache(settings.COMETCHAT_DNS_TTL_SECONDS)
+        self._client: Optional[httpx.AsyncClient] = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+        # The account-wide budget is shared equally by all worker processes
+        self.rate_limiter = AsyncTokenBucket.per_minute(
+            settings.COMETCHAT_RATE_LIMIT_PER_MINUTE / max(settings.WEB_CONCURRENCY, 1)
+        )
+        # app_id -> bucket; idle apps' buckets are full again long before they expire
+        self._app_limiters = TTLCache(maxsize=10000, ttl=600)
+    
+    def _app_url(self, credentials: Optional[AppCredentials] = None) -> str:
+        """REST base URL for the service's own app or a tenant app"""
+        if credentials is None:
+            return self.base_url
+        return (
+            settings.COMETCHAT_API_BASE_URL
+            or f"https://{credentials.app_id}.api-{credentials.region}.cometchat.io/v3"
+        )
+    
+    def _http(self) -> httpx.AsyncClient:
+        """
+        Shared pooled client, so calls reuse DNS lookups and TLS connections
+        
+        Pooled connections belong to the event loop that opened them; a new
+        loop (e.g. a TestClient without lifespan) gets its own client.
+        """
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client_loop is not loop:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                transport=PooledTransport(self.limits, self.dns_cache)
+            )
+            self._client_loop = loop
+        return self._client
+    
+    async def aclose(self) -> None:
+        """Close pooled connections (lifespan shutdown)"""
+        if self._client is not None and self._client_loop is asyncio.get_running_loop():
+            await self._client.aclose()
+        self._client = None
+        self._client_loop = None
+    
+    def prewarm_urls(self, apps: Iterable[Tuple[str, str]]) -> List[str]:
+        """Distinct hosts to pre-warm: management API, own app and (app_id, region) pairs"""
+        urls = [settings.COMETCHAT_MGMT_BASE_URL, self.base_url]
+        urls += [self._app_url(AppCredentials(app_id, "", region or "us")) for app_id, region in apps]
+        return list(dict.fromkeys(str(httpx.URL(url).copy_with(path="/")) for url in urls))
+    
+    async def prewarm(self, apps: Iterable[Tuple[str, str]]) -> int:
+        """Resolve and open pooled connections to CometChat hosts before traffic arrives"""
+        if settings.COMETCHAT_PREWARM_CONNECTIONS <= 0:
+            return 0
+        return await prewarm(
+            self._http(),
+            self.prewarm_urls(apps),
+            settings.COMETCHAT_PREWARM_CONNECTIONS,
+            settings.COMETCHAT_PREWARM_TIMEOUT_SECONDS
+        )
+    
+    def _app_limiter(self, app_id: str) -> AsyncTokenBucket:
+        limiter = self._app_limiters.get(app_id)
+        if limiter is None:
+            limiter = AsyncTokenBucket.per_minute(
+                settings.COMETCHAT_APP_RATE_LIMIT_PER_MINUTE / max(settings.WEB_CONCURRENCY, 1)
+            )
+            self._app_limiters.set(app_id, limiter)
+        return limiter
+    
+    async def _acquire(self, credentials: Optional[AppCredentials]) -> None:
+        """Take a token from the target app's bucket, then from the account-wide one"""
+        if credentials is not None and settings.COMETCHAT_APP_RATE_LIMIT_PER_MINUTE > 0:
+            await self._app_limiter(credentials.app_id).acquire()
+        await self.rate_limiter.acquire()
+    
+    async def _prepare_call(self, credentials: Optional[AppCredentials] = None) -> httpx.Timeout:
+        """
+        Wait for rate-limit tokens and size the timeout to the request deadline
+        
+        Raises:
+            CometChatAPIError: 504 if the caller's deadline has already passed
+        """
+        budget = deadline.remaining()
+        if budget is None:
+            await self._acquire(credentials)
+            return self.timeout
+        
+        try:
+            await asyncio.wait_for(self._acquire(credentials), max(budget, 0))
+        except asyncio.TimeoutError:
+            budget = 0
+        else:
+            budget = deadline.remaining()
+        if budget <= 0:
+            raise CometChatAPIError(message="Request deadline exceeded", status_code=504)
+        
+        # httpx applies these per phase, so cap each one at the whole budget
+        return httpx.Timeout(min(self.timeout.read, budget), connect=min(self.timeout.connect, budget))
     
-    def _get_headers(self) -> Dict[str, str]:
+    def _get_headers(self, credentials: Optional[AppCredentials] = None) -> Dict[str, str]:
         """Generate request headers"""
         # FIXED: Use lowercase 'apikey' header only
         return {
-            "apikey": settings.COMETCHAT_API_KEY,  # Changed from 'apiKey'
+            "apikey": credentials.api_key if credentials else settings.COMETCHAT_API_KEY,  # Changed from 'apiKey'
             "Content-Type": "application/json",
-            "onBehalfOf": settings.COMETCHAT_APP_ID,  # Added for Management API
+            "onBehalfOf": credentials.app_id if credentials else settings.COMETCHAT_APP_ID,  # Added for Management API
             "X-Webhook-Version": "2"
         }
     
@@ -36,7 +210,8 @@ class CometChatClient:
         username: Optional[str] = None,
         password: Optional[str] = None,
         enabled: bool = True,
-        retry_on_failure: bool = True
+        retry_on_failure: bool = True,
+        credentials: Optional[AppCredentials] = None
     ) -> Dict[str, Any]:
         """
         Create a new webhook in CometChat
@@ -50,6 +225,7 @@ class CometChatClient:
             password: Basic auth password
             enabled: Enable webhook immediately
             retry_on_failure: Retry failed deliveries
+            credentials: Target tenant app (defaults to the service's own app)
             
         Returns:
             Dict containing webhook creation response
@@ -58,63 +234,56 @@ class CometChatClient:
             CometChatAPIError: If API request fails
         """
         # FIXED: Correct endpoint without /apps/{app_id}
-        endpoint = f"{self.base_url}/webhooks"
+        endpoint = f"{self._app_url(credentials)}/webhooks"
         
-        payload = {
-            "id": webhook_id,
-            "name": name,
-            "url": url,
-            "basicAuth": basic_auth,
-            "enabled": enabled,
-            "retryOnFailure": retry_on_failure
-        }
+        payload = webhook_payload(
+            webhook_id, name, url, basic_auth, username, password, enabled, retry_on_failure
+        )
         
-        if basic_auth and username and password:
-            payload["username"] = username
-            payload["password"] = password
+        timeout = await self._prepare_call(credentials)
         
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            try:
-                response = await client.post(
-                    endpoint,
-                    headers=self._get_headers(),
-                    json=payload
-                )
-                response.raise_for_status()
-                
-                logger.info(
-                    "Webhook created successfully",
-                    extra={
-                        "webhook_id": webhook_id,
-                        "webhook_name": name,
-                        "status_code": response.status_code
-                    }
-                )
-                return response.json()
-                
-            except httpx.HTTPStatusError as e:
-                logger.error(
-                    "HTTP error creating webhook",
-                    extra={
-                        "webhook_id": webhook_id,
-                        "status_code": e.response.status_code,
-                        "response": e.response.text
-                    }
-                )
-                raise CometChatAPIError(
-                    message=f"Failed to create webhook: {e.response.text}",
-                    status_code=e.response.status_code
-                )
+        try:
+            response = await self._http().post(
+                endpoint,
+                headers=self._get_headers(credentials),
+                timeout=timeout,
+                **body_kwargs(payload)
+            )
+            response.raise_for_status()
+            
+            logger.info(
+                "Webhook created successfully",
+                extra={
+                    "webhook_id": webhook_id,
+                    "webhook_name": name,
+                    "status_code": response.status_code
+                }
+            )
+            return response.json()
             
-            except httpx.RequestError as e:
-                logger.error(
-                    "Request error creating webhook",
-                    extra={"webhook_id": webhook_id, "error": str(e)}
-                )
-                raise CometChatAPIError(
-                    message=f"Request failed: {str(e)}",
-                    status_code=500
-                )
+        except httpx.HTTPStatusError as e:
+            logger.error(
+                "HTTP error creating webhook",
+                extra={
+                    "webhook_id": webhook_id,
+                    "status_code": e.response.status_code,
+                    "response": e.response.text
+                }
+            )
+            raise CometChatAPIError(
+                message=f"Failed to create webhook: {e.response.text}",
+                status_code=e.response.status_code
+            )
+        
+        except httpx.RequestError as e:
+            logger.error(
+                "Request error creating webhook",
+                extra={"webhook_id": webhook_id, "error": str(e)}
+            )
+            raise CometChatAPIError(
+                message=f"Request failed: {str(e)}",
+                status_code=504 if isinstance(e, httpx.TimeoutException) else 500
+            )
     
     async def create_app(
         self,
@@ -136,7 +305,7 @@ class CometChatClient:
         Raises:
             CometChatAPIError: If API request fails
         """
-        endpoint = "https://apimgmt.cometchat.io/apps"
+        endpoint = f"{settings.COMETCHAT_MGMT_BASE_URL}/apps"
         
         if not settings.COMETCHAT_AUTH_KEY or not settings.COMETCHAT_AUTH_SECRET:
             raise CometChatAPIError(
@@ -157,48 +326,50 @@ class CometChatClient:
             "caseSensitive": case_sensitive
         }
         
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            try:
-                response = await client.post(
-                    endpoint,
-                    headers=headers,
-                    json=payload
-                )
-                response.raise_for_status()
-                
-                logger.info(
-                    "App created successfully",
-                    extra={
-                        "app_name": name,
-                        "region": region,
-                        "status_code": response.status_code
-                    }
-                )
-                return response.json()
-                
-            except httpx.HTTPStatusError as e:
-                logger.error(
-                    "HTTP error creating app",
-                    extra={
-                        "app_name": name,
-                        "status_code": e.response.status_code,
-                        "response": e.response.text
-                    }
-                )
-                raise CometChatAPIError(
-                    message=f"Failed to create app: {e.response.text}",
-                    status_code=e.response.status_code
-                )
+        timeout = await self._prepare_call()
+        
+        try:
+            response = await self._http().post(
+                endpoint,
+                headers=headers,
+                timeout=timeout,
+                **body_kwargs(payload)
+            )
+            response.raise_for_status()
+            
+            logger.info(
+                "App created successfully",
+                extra={
+                    "app_name": name,
+                    "region": region,
+                    "status_code": response.status_code
+                }
+            )
+            return response.json()
             
-            except httpx.RequestError as e:
-                logger.error(
-                    "Request error creating app",
-                    extra={"app_name": name, "error": str(e)}
-                )
-                raise CometChatAPIError(
-                    message=f"Request failed: {str(e)}",
-                    status_code=500
-                )
+        except httpx.HTTPStatusError as e:
+            logger.error(
+                "HTTP error creating app",
+                extra={
+                    "app_name": name,
+                    "status_code": e.response.status_code,
+                    "response": e.response.text
+                }
+            )
+            raise CometChatAPIError(
+                message=f"Failed to create app: {e.response.text}",
+                status_code=e.response.status_code
+            )
+        
+        except httpx.RequestError as e:
+            logger.error(
+                "Request error creating app",
+                extra={"app_name": name, "error": str(e)}
+            )
+            raise CometChatAPIError(
+                message=f"Request failed: {str(e)}",
+                status_code=504 if isinstance(e, httpx.TimeoutException) else 500
+            )
 
     async def create_role(
         self,
@@ -206,7 +377,8 @@ class CometChatClient:
         name: str,
         description: Optional[str] = None,
         metadata: Optional[Dict[str, Any]] = None,
-        settings: Optional[Dict[str, Any]] = None
+        settings: Optional[Dict[str, Any]] = None,
+        credentials: Optional[AppCredentials] = None
     ) -> Dict[str, Any]:
         """
         Create a new role in CometChat
@@ -217,6 +389,7 @@ class CometChatClient:
             description: Role description
             metadata: Role metadata
             settings: Role settings
+            credentials: Target tenant app (defaults to the service's own app)
             
         Returns:
             Dict containing role creation response
@@ -224,75 +397,196 @@ class CometChatClient:
         Raises:
             CometChatAPIError: If API request fails
         """
-        endpoint = f"{self.base_url}/roles"
+        endpoint = f"{self._app_url(credentials)}/roles"
         
-        payload = {
-            "role": role,
-            "name": name
-        }
+        payload = role_payload(role, name, description, metadata, settings)
+            
+        timeout = await self._prepare_call(credentials)
         
-        if description:
-            payload["description"] = description
+        try:
+            response = await self._http().post(
+                endpoint,
+                headers=self._get_headers(credentials),
+                timeout=timeout,
+                **body_kwargs(payload)
+            )
+            response.raise_for_status()
             
-        if metadata:
-            payload["metadata"] = metadata
+            logger.info(
+                "Role created successfully",
+                extra={
+                    "role_uid": role,
+                    "role_name": name,
+                    "status_code": response.status_code
+                }
+            )
+            return response.json()
+            
+        except httpx.HTTPStatusError as e:
+            logger.error(
+                "HTTP error creating role",
+                extra={
+                    "role_uid": role,
+                    "status_code": e.response.status_code,
+                    "response": e.response.text
+                }
+            )
+            raise CometChatAPIError(
+                message=f"Failed to create role: {e.response.text}",
+                status_code=e.response.status_code
+            )
+        
+        except httpx.RequestError as e:
+            logger.error(
+                "Request error creating role",
+                extra={"role_uid": role, "error": str(e)}
+            )
+            raise CometChatAPIError(
+                message=f"Request failed: {str(e)}",
+                status_code=504 if isinstance(e, httpx.TimeoutException) else 500
+            )
 
-        if settings:
-            payload["settings"] = settings
+    async def _request(
+        self,
+        method: str,
+        endpoint: str,
+        action: str,
+        credentials: Optional[AppCredentials] = None,
+        payload: Optional[Dict[str, Any]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        log_extra: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Rate-limited call to an app's REST API, with the usual error mapping
+        
+        Raises:
+            CometChatAPIError: If API request fails
+        """
+        timeout = await self._prepare_call(credentials)
+        
+        try:
+            response = await self._http().request(
+                method,
+                endpoint,
+                headers=self._get_headers(credentials),
+                params=params,
+                timeout=timeout,
+                **(body_kwargs(payload) if payload is not None else {})
+            )
+            response.raise_for_status()
+            return response.json()
             
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            try:
-                response = await client.post(
-                    endpoint,
-                    headers=self._get_headers(),
-                    json=payload
-                )
-                response.raise_for_status()
-                
-                logger.info(
-                    "Role created successfully",
-                    extra={
-                        "role_uid": role,
-                        "role_name": name,
-                        "status_code": response.status_code
-                    }
-                )
-                return response.json()
-                
-            except httpx.HTTPStatusError as e:
-                logger.error(
-                    "HTTP error creating role",
-                    extra={
-                        "role_uid": role,
-                        "status_code": e.response.status_code,
-                        "response": e.response.text
-                    }
-                )
-                raise CometChatAPIError(
-                    message=f"Failed to create role: {e.response.text}",
-                    status_code=e.response.status_code
-                )
+        except httpx.HTTPStatusError as e:
+            logger.error(
+                f"HTTP error {action}",
+                extra={
+                    **(log_extra or {}),
+                    "status_code": e.response.status_code,
+                    "response": e.response.text
+                }
+            )
+            raise CometChatAPIError(
+                message=f"Failed {action}: {e.response.text}",
+                status_code=e.response.status_code
+            )
+        
+        except httpx.RequestError as e:
+            logger.error(
+                f"Request error {action}",
+                extra={**(log_extra or {}), "error": str(e)}
+            )
+            raise CometChatAPIError(
+                message=f"Request failed: {str(e)}",
+                status_code=504 if isinstance(e, httpx.TimeoutException) else 500
+            )
+    
+    async def _list(self, endpoint: str, action: str, credentials: Optional[AppCredentials]) -> List[Dict[str, Any]]:
+        """Every item of a paginated list endpoint"""
+        items: List[Dict[str, Any]] = []
+        page = 1
+        while True:
+            body = await self._request(
+                "GET", endpoint, action, credentials,
+                params={"perPage": LIST_PAGE_SIZE, "page": page}
+            )
+            items.extend(body.get("data") or [])
+            pagination = (body.get("meta") or {}).get("pagination") or {}
+            if page >= pagination.get("total_pages", page):
+                return items
+            page += 1
+    
+    async def list_webhooks(self, credentials: Optional[AppCredentials] = None) -> List[Dict[str, Any]]:
+        """
+        List the webhooks of an app
+        
+        Raises:
+            CometChatAPIError: If API request fails
+        """
+        return await self._list(f"{self._app_url(credentials)}/webhooks", "listing webhooks", credentials)
+    
+    async def update_webhook(
+        self,
+        webhook_id: str,
+        changes: Dict[str, Any],
+        credentials: Optional[AppCredentials] = None
+    ) -> Dict[str, Any]:
+        """
+        Update fields of an existing webhook
+        
+        Args:
+            webhook_id: Webhook to update
+            changes: Fields to set, as in the webhook payload (e.g. {"enabled": True})
+            credentials: Target tenant app (defaults to the service's own app)
             
-            except httpx.RequestError as e:
-                logger.error(
-                    "Request error creating role",
-                    extra={"role_uid": role, "error": str(e)}
-                )
-                raise CometChatAPIError(
-                    message=f"Request failed: {str(e)}",
-                    status_code=500
-                )
+        Raises:
+            CometChatAPIError: If API request fails
+        """
+        return await self._request(
+            "PUT", f"{self._app_url(credentials)}/webhooks/{webhook_id}", "updating webhook",
+            credentials, payload=changes, log_extra={"webhook_id": webhook_id}
+        )
+    
+    async def list_roles(self, credentials: Optional[AppCredentials] = None) -> List[Dict[str, Any]]:
+        """
+        List the roles of an app
+        
+        Raises:
+            CometChatAPIError: If API request fails
+        """
+        return await self._list(f"{self._app_url(credentials)}/roles", "listing roles", credentials)
+    
+    async def update_role(
+        self,
+        role: str,
+        changes: Dict[str, Any],
+        credentials: Optional[AppCredentials] = None
+    ) -> Dict[str, Any]:
+        """
+        Update fields of an existing role
+        
+        Args:
+            role: Role UID
+            changes: Fields to set, as in the role payload (e.g. {"settings": {...}})
+            credentials: Target tenant app (defaults to the service's own app)
+            
+        Raises:
+            CometChatAPIError: If API request fails
+        """
+        return await self._request(
+            "PUT", f"{self._app_url(credentials)}/roles/{role}", "updating role",
+            credentials, payload=changes, log_extra={"role_uid": role}
+        )
 
     async def health_check(self) -> bool:
         """Check if CometChat API is reachable"""
         try:
-            async with httpx.AsyncClient(timeout=httpx.Timeout(5.0)) as client:
-                # FIXED: Correct health check endpoint
-                response = await client.get(
-                    f"{self.base_url}/appSettings",
-                    headers=self._get_headers()
-                )
-                return response.status_code == 200
+            # FIXED: Correct health check endpoint
+            response = await self._http().get(
+                f"{self.base_url}/appSettings",
+                headers=self._get_headers(),
+                timeout=httpx.Timeout(5.0)
+            )
+            return response.status_code == 200
         except Exception as e:
             logger.error(f"Health check failed: {str(e)}")
             return False
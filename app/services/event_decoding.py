@@ -0,0 +1,91 @@
+"""Decode inbound CometChat webhook deliveries from the raw request body"""
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.serialization import loads
+
+
+# Attribute -> path of the fields every delivery is routed by. Message
+# triggers carry the message under data.message; other triggers leave the
+# message fields as None.
+ROUTING_FIELDS: Dict[str, Tuple[str, ...]] = {
+    "trigger": ("trigger",),
+    "app_id": ("appId",),
+    "region": ("region",),
+    "webhook_id": ("webhook",),
+    "message_id": ("data", "message", "id"),
+    "conversation_id": ("data", "message", "conversationId"),
+    "sent_at": ("data", "message", "sentAt"),
+    "updated_at": ("data", "message", "updatedAt"),
+}
+
+
+def _compile(fields: Dict[str, Tuple[str, ...]]) -> List[Tuple[Tuple[str, ...], List[Tuple[str, str]]]]:
+    """Group the field paths by parent object, so each object is walked once per event"""
+    plan: Dict[Tuple[str, ...], List[Tuple[str, str]]] = {}
+    for attribute, path in fields.items():
+        plan.setdefault(path[:-1], []).append((attribute, path[-1]))
+    return list(plan.items())
+
+
+_PLAN = _compile(ROUTING_FIELDS)
+
+
+class EventDecodeError(ValueError):
+    """The request body is not a routable CometChat event"""
+
+
+class InboundEvent:
+    """
+    One webhook delivery: its routing fields, decoded payload and JSON text
+
+    Nothing beyond the routing fields is validated or converted; handlers
+    read the message body from the plain decoded payload, and the text is
+    stored as delivered instead of being encoded again.
+    """
+    __slots__ = ("text", "payload", *ROUTING_FIELDS)
+
+    def __init__(self, text: str, payload: Dict[str, Any]):
+        self.text = text
+        self.payload = payload
+
+    @property
+    def message(self) -> Optional[Dict[str, Any]]:
+        """The message of a message trigger, e.g. after_message"""
+        data = self.payload.get("data")
+        return data.get("message") if isinstance(data, dict) else None
+
+    def __repr__(self):
+        return f"<InboundEvent(trigger={self.trigger}, app_id={self.app_id}, message_id={self.message_id})>"
+
+
+def decode_event(body: bytes) -> InboundEvent:
+    """
+    Decode a delivery and pull out its routing fields
+
+    The body is parsed once (with orjson when FAST_JSON is on). Walking it
+    in Python to decode only the routing fields costs many times more than
+    a full parse in C, so the payload is decoded whole and then left alone.
+
+    Raises:
+        EventDecodeError: Body is not a JSON object with appId and trigger
+    """
+    try:
+        text = body.decode("utf-8")
+        payload = loads(text)
+    except ValueError as e:
+        raise EventDecodeError(f"Event is not valid JSON: {e}")
+    if not isinstance(payload, dict):
+        raise EventDecodeError("Event must be a JSON object")
+
+    event = InboundEvent(text, payload)
+    for parent, fields in _PLAN:
+        node = payload
+        for key in parent:
+            node = node.get(key) if isinstance(node, dict) else None
+        for attribute, key in fields:
+            setattr(event, attribute, node.get(key) if isinstance(node, dict) else None)
+
+    if not event.app_id or not event.trigger:
+        raise EventDecodeError("Event must include appId and trigger")
+    event.app_id, event.trigger = str(event.app_id), str(event.trigger)
+    return event
@@ -0,0 +1,41 @@
+"""Processing pipeline for received CometChat webhook events"""
+from typing import Any, Awaitable, Callable, Dict, List
+
+from app.core.logging import logger
+
+
+# Handlers receive Event.to_dict() plus a "replay" flag
+EventHandler = Callable[[Dict[str, Any]], Awaitable[None]]
+
+# Trigger name -> handlers; "*" handlers see every event
+_handlers: Dict[str, List[EventHandler]] = {}
+
+
+def register_handler(trigger: str, handler: EventHandler) -> None:
+    """Run `handler` for every event with `trigger` ("*" for all events)"""
+    _handlers.setdefault(trigger, []).append(handler)
+
+
+def handlers_for(trigger: str) -> List[EventHandler]:
+    return _handlers.get(trigger, []) + _handlers.get("*", [])
+
+
+async def process_event(event: Dict[str, Any], replay: bool = False) -> int:
+    """
+    Run all handlers for one event, in registration order
+
+    Used both for live deliveries and replays, so handlers must be
+    idempotent. The first handler error propagates to the caller.
+
+    Returns:
+        Number of handlers run
+    """
+    handlers = handlers_for(event["trigger"])
+    if not handlers:
+        logger.debug(f"No handlers for {event['trigger']} event {event['id']}")
+        return 0
+
+    event = {**event, "replay": replay}
+    for handler in handlers:
+        await handler(event)
+    return len(handlers)
@@ -0,0 +1,169 @@
+"""Replay stored events through the processing pipeline"""
+import asyncio
+from bisect import bisect_right
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, or_, select
+
+from app.core.database import SessionLocal
+from app.core.logging import logger
+from app.models.event import Event
+from app.services.event_processing import process_event
+from app.services.event_retention import find_segments, read_segment
+from app.services.jobs import load_checkpoint, save_checkpoint
+from app.utils.rate_limit import AsyncTokenBucket
+
+# Failed event ids kept in the checkpoint for follow-up
+MAX_REPORTED_FAILURES = 100
+
+
+def _fetch_chunk(
+    app_id: str,
+    start: datetime,
+    end: datetime,
+    trigger: Optional[str],
+    after: Optional[Dict[str, Any]],
+    limit: int
+) -> List[Dict[str, Any]]:
+    """Next `limit` events after the (received_at, id) keyset position"""
+    query = select(Event).where(
+        Event.app_id == app_id,
+        Event.received_at >= start,
+        Event.received_at < end
+    )
+    if trigger:
+        query = query.where(Event.trigger == trigger)
+    if after:
+        after_at = datetime.fromisoformat(after["last_received_at"])
+        query = query.where(or_(
+            Event.received_at > after_at,
+            and_(Event.received_at == after_at, Event.id > after["last_event_id"])
+        ))
+    query = query.order_by(Event.received_at, Event.id).limit(limit)
+
+    db = SessionLocal()
+    try:
+        return [event.to_dict() for event in db.scalars(query)]
+    finally:
+        db.close()
+
+
+def _segment_events(
+    segment,
+    start: datetime,
+    end: datetime,
+    trigger: Optional[str],
+    cache: Dict[tuple, Tuple[List[tuple], List[Dict[str, Any]]]]
+) -> Tuple[List[tuple], List[Dict[str, Any]]]:
+    """(received_at, id) keys and matching events of one segment in that order, cached per committed length"""
+    key = (segment.day, segment.id, segment.size_bytes)
+    if key not in cache:
+        events = []
+        for record in read_segment(segment):
+            received_at = datetime.fromisoformat(record["received_at"])
+            if start <= received_at < end and (not trigger or record["trigger"] == trigger):
+                events.append({**record, "received_at": received_at})
+        # Late events are appended to a segment after newer ones
+        events.sort(key=lambda event: (event["received_at"], event["id"]))
+        cache[key] = ([(event["received_at"], event["id"]) for event in events], events)
+    return cache[key]
+
+
+def _fetch_archived_chunk(
+    app_id: str,
+    start: datetime,
+    end: datetime,
+    trigger: Optional[str],
+    after: Optional[Dict[str, Any]],
+    limit: int,
+    cache: Dict[tuple, Tuple[List[tuple], List[Dict[str, Any]]]]
+) -> List[Dict[str, Any]]:
+    """Next `limit` archived events after the (received_at, id) keyset position"""
+    after_key = None
+    first_day = start.date()
+    if after:
+        after_key = (datetime.fromisoformat(after["last_received_at"]), after["last_event_id"])
+        first_day = max(first_day, after_key[0].date())
+    # Segments of days the replay has moved past are not read again
+    for key in [key for key in cache if key[0] < first_day]:
+        del cache[key]
+
+    events: List[Dict[str, Any]] = []
+    for segment in find_segments(app_id, first_day, (end - timedelta(microseconds=1)).date()):
+        keys, matching = _segment_events(segment, start, end, trigger, cache)
+        position = bisect_right(keys, after_key) if after_key else 0
+        events.extend(matching[position:position + limit - len(events)])
+        if len(events) >= limit:
+            break
+    return events
+
+
+async def run_replay_job(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Job handler: replay one app's events in [start, end) in chunks
+
+    Events still in the events table and those retention moved into
+    segment files are merged in (received_at, id) order, so archived days
+    replay like recent ones. Only one chunk, plus the matching events of
+    the segments being read, is in memory at a time. Progress is checkpointed after
+    every chunk, so a recovered job, or a new one started with
+    `resume_from`, continues after the last replayed event. Handler errors
+    are counted and skipped rather than aborting the replay.
+    """
+    start = datetime.fromisoformat(payload["start"])
+    end = datetime.fromisoformat(payload["end"])
+    chunk_size = payload["chunk_size"]
+    bucket = AsyncTokenBucket(payload["rate_per_second"])
+
+    progress = await load_checkpoint()
+    if not progress and payload.get("resume_from"):
+        progress = await load_checkpoint(payload["resume_from"])
+    progress = dict(progress or {})
+    progress.setdefault("replayed", 0)
+    progress.setdefault("failed", 0)
+    progress.setdefault("failed_event_ids", [])
+    progress["done"] = False
+
+    archive_cache: Dict[tuple, Tuple[List[tuple], List[Dict[str, Any]]]] = {}
+    while True:
+        after = progress if "last_event_id" in progress else None
+        # The table is read first: retention only moves events from it into
+        # segments, so an event moved in between is found in the second read
+        live = await asyncio.to_thread(
+            _fetch_chunk, payload["app_id"], start, end, payload.get("trigger"), after, chunk_size
+        )
+        archived = await asyncio.to_thread(
+            _fetch_archived_chunk,
+            payload["app_id"], start, end, payload.get("trigger"), after, chunk_size, archive_cache
+        )
+        merged = {(event["received_at"], event["id"]): event for event in archived + live}
+        events = [merged[key] for key in sorted(merged)][:chunk_size]
+        if not events:
+            break
+
+        for event in events:
+            await bucket.acquire()
+            try:
+                await process_event(event, replay=True)
+                progress["replayed"] += 1
+            except Exception as e:
+                logger.error(f"Replay of event {event['id']} failed: {str(e)}")
+                progress["failed"] += 1
+                if len(progress["failed_event_ids"]) < MAX_REPORTED_FAILURES:
+                    progress["failed_event_ids"].append(event["id"])
+
+        last = events[-1]
+        progress["last_event_id"] = last["id"]
+        progress["last_received_at"] = last["received_at"].isoformat()
+        await save_checkpoint(progress)
+
+        if len(events) < chunk_size:
+            break
+
+    progress["done"] = True
+    logger.info(
+        f"Replayed {progress['replayed']} events for app {payload['app_id']} "
+        f"({progress['failed']} failed)"
+    )
+    return progress
@@ -0,0 +1,182 @@
+"""Event retention: archive old events to compressed segment files"""
+import asyncio
+import gzip
+import hashlib
+import io
+import json
+import os
+import re
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterator, List
+
+from sqlalchemy import delete, select, text
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.core.database import SessionLocal, engine
+from app.core.logging import logger
+from app.models.event import Event
+from app.models.event_segment import EventSegment
+
+
+settings = get_settings()
+
+# Pages returned to the OS per incremental_vacuum call
+VACUUM_PAGES_PER_STEP = 2000
+
+
+def _segment_path(app_id: str, day: date) -> str:
+    """
+    Segment file path relative to EVENT_ARCHIVE_DIR
+
+    The directory is a readable form of the app id plus a digest of the
+    exact id, so ids that sanitize or case-fold alike ("a/b", "a_b", "A_B")
+    never share a segment. Existing segments keep the path stored in their
+    index row.
+    """
+    readable = re.sub(r"[^A-Za-z0-9_-]", "_", app_id)[:64]
+    digest = hashlib.sha256(app_id.encode("utf-8")).hexdigest()[:16]
+    return os.path.join(f"{readable}-{digest}", f"{day.isoformat()}.jsonl.gz")
+
+
+def _append_member(path: str, committed_size: int, events: List[Event]) -> int:
+    """
+    Append events as one gzip member after the committed length; returns the new length
+
+    Readers see concatenated members as a single stream.
+    """
+    lines = "".join(
+        json.dumps({
+            "id": event.id,
+            "app_id": event.app_id,
+            "trigger": event.trigger,
+            "payload": event.payload,
+            "received_at": event.received_at.isoformat()
+        }, separators=(",", ":")) + "\n"
+        for event in events
+    )
+    full_path = os.path.join(settings.EVENT_ARCHIVE_DIR, path)
+    os.makedirs(os.path.dirname(full_path), exist_ok=True)
+    with open(full_path, "r+b" if os.path.exists(full_path) else "wb") as f:
+        # Drop the tail of a batch whose delete never committed
+        f.truncate(committed_size)
+        f.seek(committed_size)
+        f.write(gzip.compress(lines.encode("utf-8")))
+        f.flush()
+        os.fsync(f.fileno())
+        return f.tell()
+
+
+def _archive_batch(db: Session, cutoff: datetime, batch_size: int) -> int:
+    """Archive and delete up to `batch_size` of the oldest expired events"""
+    events = list(db.scalars(
+        select(Event)
+        .where(Event.received_at < cutoff)
+        .order_by(Event.received_at, Event.id)
+        .limit(batch_size)
+    ))
+    if not events:
+        return 0
+
+    groups: Dict[tuple, List[Event]] = defaultdict(list)
+    for event in events:
+        groups[(event.app_id, event.received_at.date())].append(event)
+
+    for (app_id, day), group in groups.items():
+        segment = db.scalar(
+            select(EventSegment).where(EventSegment.app_id == app_id, EventSegment.day == day)
+        )
+        if segment is None:
+            segment = EventSegment(app_id=app_id, day=day, path=_segment_path(app_id, day), size_bytes=0)
+            db.add(segment)
+        segment.size_bytes = _append_member(segment.path, segment.size_bytes or 0, group)
+        segment.event_count = (segment.event_count or 0) + len(group)
+        segment.first_event_id = segment.first_event_id or group[0].id
+        segment.last_event_id = group[-1].id
+        segment.first_received_at = segment.first_received_at or group[0].received_at
+        segment.last_received_at = group[-1].received_at
+
+    # Index update and delete commit together; the files are already durable
+    db.execute(delete(Event).where(Event.id.in_([event.id for event in events])))
+    db.commit()
+    return len(events)
+
+
+def _incremental_vacuum() -> int:
+    """Return free pages to the filesystem; SQLite files created with auto_vacuum=INCREMENTAL only"""
+    if engine.dialect.name != "sqlite":
+        return 0
+    with engine.connect() as connection:
+        if connection.execute(text("PRAGMA auto_vacuum")).scalar() != 2:
+            logger.info("auto_vacuum is not INCREMENTAL; run VACUUM once to enable space reclamation")
+            return 0
+        before = free = connection.execute(text("PRAGMA freelist_count")).scalar()
+        # Small steps keep each write lock short
+        while free:
+            connection.exec_driver_sql(f"PRAGMA incremental_vacuum({VACUUM_PAGES_PER_STEP})")
+            connection.commit()
+            remaining = connection.execute(text("PRAGMA freelist_count")).scalar()
+            if remaining >= free:
+                break
+            free = remaining
+        return before - free
+
+
+def apply_retention(retention_days: int, batch_size: int) -> Dict[str, Any]:
+    """Move events older than `retention_days` into segment files, batch by batch"""
+    cutoff = datetime.utcnow() - timedelta(days=retention_days)
+    archived = batches = 0
+    db = SessionLocal()
+    try:
+        while True:
+            count = _archive_batch(db, cutoff, batch_size)
+            if not count:
+                break
+            archived += count
+            batches += 1
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+    freed_pages = _incremental_vacuum() if archived else 0
+    logger.info(f"Event retention archived {archived} events in {batches} batches, freed {freed_pages} pages")
+    return {
+        "cutoff": cutoff.isoformat(),
+        "archived": archived,
+        "batches": batches,
+        "freed_pages": freed_pages
+    }
+
+
+async def run_retention_job(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Job handler for a retention pass"""
+    return await asyncio.to_thread(
+        apply_retention,
+        payload.get("retention_days", settings.EVENT_RETENTION_DAYS),
+        payload.get("batch_size", settings.EVENT_RETENTION_BATCH_SIZE)
+    )
+
+
+def find_segments(app_id: str, start: date, end: date) -> List[EventSegment]:
+    """Segments of `app_id` for days in [start, end]"""
+    db = SessionLocal()
+    try:
+        return list(db.scalars(
+            select(EventSegment)
+            .where(EventSegment.app_id == app_id, EventSegment.day >= start, EventSegment.day <= end)
+            .order_by(EventSegment.day)
+        ))
+    finally:
+        db.close()
+
+
+def read_segment(segment: EventSegment) -> Iterator[Dict[str, Any]]:
+    """Stream archived events of one segment, up to its committed length"""
+    with open(os.path.join(settings.EVENT_ARCHIVE_DIR, segment.path), "rb") as f:
+        committed = io.BytesIO(f.read(segment.size_bytes))
+    with gzip.GzipFile(fileobj=committed) as lines:
+        for line in lines:
+            yield json.loads(line)
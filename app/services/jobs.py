@@ -0,0 +1,308 @@
+"""Persistent background job queue with a bounded worker pool"""
+import asyncio
+import importlib
+from contextvars import ContextVar
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Collection, Dict, List, Optional, Union
+
+from sqlalchemy import func, select, update
+
+from app.core.config import get_settings
+from app.core.database import SessionLocal
+from app.core.logging import logger
+from app.models.job import Job
+from app.utils.exceptions import CometChatAPIError
+
+
+settings = get_settings()
+
+PENDING = "pending"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+JobHandler = Callable[[Dict[str, Any]], Awaitable[Any]]
+
+# Id of the job whose handler is running in the current task
+current_job_id: ContextVar[Optional[str]] = ContextVar("current_job_id", default=None)
+
+
+def _insert_job(kind: str, payload: Dict[str, Any]) -> str:
+    db = SessionLocal()
+    try:
+        job = Job(kind=kind, payload=payload, status=PENDING)
+        db.add(job)
+        db.commit()
+        return job.id
+    finally:
+        db.close()
+
+
+def _claim_job(job_id: str) -> Optional[Job]:
+    """Atomically move a pending job to running; None if another worker won"""
+    now = datetime.utcnow()
+    db = SessionLocal()
+    try:
+        claimed = db.execute(
+            update(Job)
+            .where(Job.id == job_id, Job.status == PENDING)
+            .values(status=RUNNING, started_at=now, heartbeat_at=now, attempts=Job.attempts + 1)
+        ).rowcount
+        db.commit()
+        if not claimed:
+            return None
+        job = db.get(Job, job_id)
+        db.expunge(job)
+        return job
+    finally:
+        db.close()
+
+
+def _finish_job(job_id: str, status: str, result: Any = None, error: Optional[str] = None) -> None:
+    values = {"status": status, "error": error, "finished_at": datetime.utcnow()}
+    if result is not None:
+        # Without a result, keep the last checkpoint for resuming
+        values["result"] = result
+    db = SessionLocal()
+    try:
+        db.execute(update(Job).where(Job.id == job_id).values(**values))
+        db.commit()
+    finally:
+        db.close()
+
+
+def _save_checkpoint(job_id: str, progress: Dict[str, Any]) -> None:
+    db = SessionLocal()
+    try:
+        db.execute(update(Job).where(Job.id == job_id).values(result=progress, heartbeat_at=datetime.utcnow()))
+        db.commit()
+    finally:
+        db.close()
+
+
+def _heartbeat(job_ids: Collection[str]) -> None:
+    db = SessionLocal()
+    try:
+        db.execute(
+            update(Job)
+            .where(Job.id.in_(list(job_ids)), Job.status == RUNNING)
+            .values(heartbeat_at=datetime.utcnow())
+        )
+        db.commit()
+    finally:
+        db.close()
+
+
+def _load_result(job_id: str) -> Optional[Dict[str, Any]]:
+    db = SessionLocal()
+    try:
+        return db.scalar(select(Job.result).where(Job.id == job_id))
+    finally:
+        db.close()
+
+
+async def save_checkpoint(progress: Dict[str, Any]) -> None:
+    """Record the running job's progress as its interim result"""
+    job_id = current_job_id.get()
+    if job_id is None:
+        raise RuntimeError("save_checkpoint called outside a job handler")
+    await asyncio.to_thread(_save_checkpoint, job_id, progress)
+
+
+async def load_checkpoint(job_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    Progress last saved by a job (default: the running one)
+
+    A job recovered after a crash sees its own checkpoint, so handlers
+    can resume instead of starting over.
+    """
+    job_id = job_id or current_job_id.get()
+    if job_id is None:
+        return None
+    return await asyncio.to_thread(_load_result, job_id)
+
+
+def _job_active(kind: str) -> bool:
+    db = SessionLocal()
+    try:
+        return db.scalar(
+            select(Job.id).where(Job.kind == kind, Job.status.in_((PENDING, RUNNING))).limit(1)
+        ) is not None
+    finally:
+        db.close()
+
+
+def _recoverable_job_ids(running: Collection[str] = ()) -> List[str]:
+    """
+    Pending jobs plus running jobs whose worker has presumably died
+
+    A running job is stale once its heartbeat is older than
+    JOB_STALE_AFTER_SECONDS; jobs this process is running never are.
+    Stale jobs that already used JOB_MAX_ATTEMPTS runs are failed instead
+    of retried.
+    """
+    stale = (
+        (Job.status == RUNNING)
+        & (func.coalesce(Job.heartbeat_at, Job.started_at)
+           < datetime.utcnow() - timedelta(seconds=settings.JOB_STALE_AFTER_SECONDS))
+    )
+    if running:
+        stale = stale & Job.id.not_in(list(running))
+    db = SessionLocal()
+    try:
+        db.execute(
+            update(Job)
+            .where(stale, Job.attempts >= settings.JOB_MAX_ATTEMPTS)
+            .values(
+                status=FAILED,
+                finished_at=datetime.utcnow(),
+                error=f"Worker lost {settings.JOB_MAX_ATTEMPTS} times; not retried"
+            )
+        )
+        db.execute(update(Job).where(stale).values(status=PENDING))
+        db.commit()
+        return list(db.scalars(
+            select(Job.id).where(Job.status == PENDING).order_by(Job.created_at)
+        ))
+    finally:
+        db.close()
+
+
+class JobRunner:
+    """
+    Runs persisted jobs with at most `workers` executing concurrently
+
+    Jobs enqueued in this process are dispatched immediately; a periodic
+    sweep also picks up pending rows left by restarts or other processes.
+    Claiming is a conditional UPDATE, so a job runs once even when several
+    processes see it. Running jobs are kept alive by a heartbeat; only jobs
+    whose heartbeat stops are handed out again.
+    """
+
+    def __init__(self, workers: int, poll_interval: float):
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self._handlers: Dict[str, Union[JobHandler, str]] = {}
+        self._queue: "asyncio.Queue[str]" = asyncio.Queue()
+        self._queued: set[str] = set()
+        self._running: set[str] = set()
+        self._tasks: List[asyncio.Task] = []
+
+    def register(self, kind: str, handler: Union[JobHandler, str]) -> None:
+        """
+        Register the coroutine that executes jobs of `kind`
+
+        `handler` may also be a "module:function" path, imported when the
+        first job of `kind` runs, so rarely used subsystems stay out of
+        startup.
+        """
+        self._handlers[kind] = handler
+
+    def _handler(self, kind: str) -> Optional[JobHandler]:
+        handler = self._handlers.get(kind)
+        if isinstance(handler, str):
+            module, _, name = handler.partition(":")
+            handler = self._handlers[kind] = getattr(importlib.import_module(module), name)
+        return handler
+
+    async def enqueue(self, kind: str, payload: Dict[str, Any]) -> str:
+        """Persist a job and schedule it; returns the job id"""
+        if kind not in self._handlers:
+            raise ValueError(f"No handler registered for job kind {kind}")
+        job_id = await asyncio.to_thread(_insert_job, kind, payload)
+        self._dispatch(job_id)
+        logger.info(f"Enqueued {kind} job {job_id}")
+        return job_id
+
+    def _dispatch(self, job_id: str) -> None:
+        if job_id not in self._queued:
+            self._queued.add(job_id)
+            self._queue.put_nowait(job_id)
+
+    async def start(self) -> None:
+        """Start workers and the recovery sweep"""
+        self._queue = asyncio.Queue()
+        self._queued.clear()
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._sweep()))
+        self._tasks.append(asyncio.create_task(self._heartbeat()))
+
+    async def stop(self) -> None:
+        """Cancel workers; interrupted jobs are recovered once stale"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def schedule(self, kind: str, interval: float, payload: Optional[Dict[str, Any]] = None) -> None:
+        """Enqueue a `kind` job every `interval` seconds unless one is already queued or running"""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                if not await asyncio.to_thread(_job_active, kind):
+                    await self.enqueue(kind, payload or {})
+            except Exception as e:
+                logger.error(f"Scheduling {kind} job failed: {str(e)}")
+
+    async def _sweep(self) -> None:
+        while True:
+            try:
+                for job_id in await asyncio.to_thread(_recoverable_job_ids, set(self._running)):
+                    self._dispatch(job_id)
+            except Exception as e:
+                logger.error(f"Job sweep failed: {str(e)}")
+            await asyncio.sleep(self.poll_interval)
+
+    async def _heartbeat(self) -> None:
+        while True:
+            await asyncio.sleep(settings.JOB_HEARTBEAT_INTERVAL_SECONDS)
+            if not self._running:
+                continue
+            try:
+                await asyncio.to_thread(_heartbeat, set(self._running))
+            except Exception as e:
+                logger.error(f"Job heartbeat failed: {str(e)}")
+
+    async def _worker(self) -> None:
+        while True:
+            job_id = await self._queue.get()
+            self._queued.discard(job_id)
+            try:
+                await self._run(job_id)
+            except Exception as e:
+                logger.error(f"Job {job_id} crashed the worker loop: {str(e)}")
+
+    async def _run(self, job_id: str) -> None:
+        job = await asyncio.to_thread(_claim_job, job_id)
+        if job is None:
+            return
+
+        try:
+            handler = self._handler(job.kind)
+        except Exception as e:
+            logger.error(f"Loading handler for {job.kind} failed: {str(e)}")
+            await asyncio.to_thread(_finish_job, job_id, FAILED, None, f"Handler for {job.kind} failed to load")
+            return
+        if handler is None:
+            await asyncio.to_thread(_finish_job, job_id, FAILED, None, f"Unknown job kind {job.kind}")
+            return
+
+        token = current_job_id.set(job_id)
+        self._running.add(job_id)
+        try:
+            result = await handler(job.payload or {})
+        except CometChatAPIError as e:
+            logger.error(f"Job {job_id} ({job.kind}) failed: {e.message}")
+            await asyncio.to_thread(_finish_job, job_id, FAILED, {"status_code": e.status_code}, e.message)
+        except Exception as e:
+            logger.error(f"Job {job_id} ({job.kind}) failed: {str(e)}")
+            await asyncio.to_thread(_finish_job, job_id, FAILED, None, str(e))
+        else:
+            await asyncio.to_thread(_finish_job, job_id, SUCCEEDED, result)
+            logger.info(f"Job {job_id} ({job.kind}) succeeded")
+        finally:
+            self._running.discard(job_id)
+            current_job_id.reset(token)
+
+
+job_runner = JobRunner(settings.JOB_WORKERS, settings.JOB_POLL_INTERVAL_SECONDS)
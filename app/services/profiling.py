@@ -0,0 +1,140 @@
+"""In-process CPU and memory profiling for production diagnosis"""
+import asyncio
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from typing import Dict, List, Optional
+
+
+class ProfilerBusyError(Exception):
+    """Raised when a CPU capture is already running"""
+
+
+# One CPU capture at a time: cProfile refuses to nest and samples would mix
+_cpu_lock = asyncio.Lock()
+
+
+async def cprofile_capture(seconds: float, sort: str = "cumulative", limit: int = 50) -> str:
+    """
+    Deterministically profile the event loop thread for `seconds`
+
+    Covers every coroutine and callback the loop runs meanwhile; sync
+    endpoints running in the threadpool are only visible to sampling.
+    """
+    if _cpu_lock.locked():
+        raise ProfilerBusyError("A CPU profile is already being captured")
+    async with _cpu_lock:
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            profiler.disable()
+
+    out = io.StringIO()
+    pstats.Stats(profiler, stream=out).strip_dirs().sort_stats(sort).print_stats(limit)
+    return out.getvalue()
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{os.path.basename(code.co_filename)}:{code.co_name}"
+
+
+def _sample_stacks(seconds: float, interval: float) -> Counter:
+    """Walk every thread's stack each `interval` seconds; returns collapsed stack counts"""
+    me = threading.get_ident()
+    names = {thread.ident: thread.name for thread in threading.enumerate()}
+    stacks: Counter = Counter()
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        for ident, frame in sys._current_frames().items():
+            if ident == me:
+                continue
+            labels: List[str] = []
+            while frame is not None:
+                labels.append(_frame_label(frame))
+                frame = frame.f_back
+            thread = names.get(ident) or names.setdefault(ident, f"thread-{ident}")
+            stacks[";".join([thread] + labels[::-1])] += 1
+        time.sleep(interval)
+    return stacks
+
+
+async def sample_capture(seconds: float, interval: float = 0.005) -> str:
+    """
+    Statistically sample all threads for `seconds`
+
+    Returns collapsed stacks ("thread;outer;...;inner count" per line), the
+    input format of flamegraph.pl and speedscope. Sampling runs in its own
+    thread, so it also sees the event loop and the sync threadpool.
+    """
+    if _cpu_lock.locked():
+        raise ProfilerBusyError("A CPU profile is already being captured")
+    async with _cpu_lock:
+        stacks = await asyncio.to_thread(_sample_stacks, seconds, interval)
+    return "".join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+
+
+class MemoryTracker:
+    """tracemalloc snapshots, each diffed against the previous one"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._baseline: Optional[tracemalloc.Snapshot] = None
+
+    @property
+    def tracing(self) -> bool:
+        return tracemalloc.is_tracing()
+
+    def start(self, frames: int) -> None:
+        with self._lock:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(frames)
+            self._baseline = None
+
+    def stop(self) -> None:
+        with self._lock:
+            tracemalloc.stop()
+            self._baseline = None
+
+    def snapshot(self, group_by: str = "lineno", limit: int = 30) -> Dict:
+        """Top allocation sites, plus growth since the previous snapshot"""
+        with self._lock:
+            if not tracemalloc.is_tracing():
+                raise RuntimeError("tracemalloc is not running; start it first")
+            snapshot = tracemalloc.take_snapshot().filter_traces((
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            ))
+            current, peak = tracemalloc.get_traced_memory()
+            report = {
+                "traced_bytes": current,
+                "peak_bytes": peak,
+                "top": [
+                    {"site": str(stat.traceback), "size_bytes": stat.size, "count": stat.count}
+                    for stat in snapshot.statistics(group_by)[:limit]
+                ],
+                "diff": None
+            }
+            if self._baseline is not None:
+                report["diff"] = [
+                    {
+                        "site": str(stat.traceback),
+                        "size_diff_bytes": stat.size_diff,
+                        "count_diff": stat.count_diff,
+                        "size_bytes": stat.size
+                    }
+                    for stat in snapshot.compare_to(self._baseline, group_by)[:limit]
+                ]
+            self._baseline = snapshot
+            return report
+
+
+memory_tracker = MemoryTracker()
@@ -0,0 +1,257 @@
+"""One-shot tenant onboarding: app, credentials, roles and webhooks"""
+import asyncio
+import time
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import or_, update
+from sqlalchemy.orm import undefer
+
+from app.core.config import get_settings
+from app.core.database import SessionLocal
+from app.core.logging import logger
+from app.models.tenant import Tenant
+from app.schemas.provision import ProvisionRequest, ProvisionResponse, ProvisionStep
+from app.services.cometchat_client import AppCredentials, cometchat_client
+from app.services.role_templates import read_role_templates
+from app.utils.exceptions import CometChatAPIError
+
+settings = get_settings()
+
+# Key in Tenant.extra_metadata holding the completed step names
+PROGRESS_KEY = "provisioning"
+
+# claim_provisioning outcomes
+CLAIMED = "claimed"
+NOT_FOUND = "not_found"
+IN_PROGRESS = "in_progress"
+
+
+def extract_app_credentials(result: Dict[str, Any]) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    """Pull (app_id, rest_api_key, auth_key) out of a create_app response"""
+    data = result.get("data", result) if isinstance(result, dict) else {}
+    app_id = data.get("appId") or data.get("app_id")
+    api_key = data.get("apiKey") or data.get("restApiKey")
+    auth_key = data.get("authKey")
+
+    # Some responses list keys with their scopes instead
+    for key in data.get("apiKeys") or []:
+        api_key = api_key or key.get("apiKey")
+    for key in data.get("authKeys") or []:
+        auth_key = auth_key or key.get("authKey")
+
+    return app_id, api_key, auth_key
+
+
+def _default_app_name(tenant: Tenant) -> str:
+    if tenant.user_first_name or tenant.user_last_name:
+        return tenant.full_name
+    return tenant.user_email
+
+
+def _elapsed_ms(start: float) -> float:
+    return round((time.perf_counter() - start) * 1000, 1)
+
+
+async def _run_step(name: str, call: Awaitable[Any]) -> ProvisionStep:
+    """Run one CometChat call and time it; an existing resource counts as done"""
+    start = time.perf_counter()
+    try:
+        await call
+    except CometChatAPIError as e:
+        if e.status_code == 409:
+            return ProvisionStep(name=name, status="succeeded", duration_ms=_elapsed_ms(start))
+        return ProvisionStep(name=name, status="failed", duration_ms=_elapsed_ms(start), error=e.message)
+    return ProvisionStep(name=name, status="succeeded", duration_ms=_elapsed_ms(start))
+
+
+def claim_provisioning(user_id: str) -> Tuple[str, Optional[Tenant]]:
+    """
+    Mark the tenant as being provisioned; returns (outcome, detached tenant)
+
+    A conditional UPDATE, so of two concurrent calls only one proceeds and
+    the other cannot create a second CometChat app. Claims older than
+    PROVISION_CLAIM_TIMEOUT_SECONDS are taken over, in case the worker
+    holding one died.
+    """
+    now = datetime.utcnow()
+    db = SessionLocal()
+    try:
+        claimed = db.execute(
+            update(Tenant)
+            .where(
+                Tenant.user_id == user_id,
+                or_(
+                    Tenant.provisioning_claimed_at.is_(None),
+                    Tenant.provisioning_claimed_at
+                    < now - timedelta(seconds=settings.PROVISION_CLAIM_TIMEOUT_SECONDS)
+                )
+            )
+            # The claim is bookkeeping, not a change to the tenant
+            .values(provisioning_claimed_at=now, updated_at=Tenant.updated_at)
+        ).rowcount
+        db.commit()
+        # The deferred API key is loaded now; the tenant is used detached
+        tenant = db.query(Tenant).options(undefer(Tenant.cometchat_api_key)).filter(Tenant.user_id == user_id).first()
+        if tenant is None:
+            return NOT_FOUND, None
+        if not claimed:
+            return IN_PROGRESS, None
+        db.expunge(tenant)
+        return CLAIMED, tenant
+    finally:
+        db.close()
+
+
+def _release_claim(user_id: str) -> None:
+    db = SessionLocal()
+    try:
+        db.execute(
+            update(Tenant)
+            .where(Tenant.user_id == user_id)
+            .values(provisioning_claimed_at=None, updated_at=Tenant.updated_at)
+        )
+        db.commit()
+    finally:
+        db.close()
+
+
+def _save_progress(
+    user_id: str,
+    completed: Set[str],
+    app: Optional[Tuple[str, str, Optional[str], str]] = None
+) -> None:
+    """Record completed steps, and the new app's (app_id, api_key, auth_key, region) if given"""
+    db = SessionLocal()
+    try:
+        tenant = db.query(Tenant).filter(Tenant.user_id == user_id).first()
+        if tenant is None:
+            return
+        if app:
+            app_id, api_key, auth_key, region = app
+            tenant.cometchat_app_id = app_id
+            tenant.cometchat_api_key = api_key
+            tenant.cometchat_region = region
+            if auth_key:
+                tenant.cometchat_auth_key = auth_key
+        metadata = dict(tenant.extra_metadata or {})
+        metadata[PROGRESS_KEY] = {
+            "completed": sorted(completed),
+            "updated_at": datetime.utcnow().isoformat()
+        }
+        # Reassign so the JSON column is flagged as changed
+        tenant.extra_metadata = metadata
+        db.commit()
+    finally:
+        db.close()
+
+
+async def provision_tenant(tenant: Tenant, request: ProvisionRequest) -> ProvisionResponse:
+    """
+    Provision a tenant's CometChat app, roles and webhooks
+
+    `tenant` is the detached row returned by claim_provisioning; the claim
+    is released when this returns. Only app creation is serial (everything
+    else needs its credentials); roles and webhooks are then created
+    concurrently. Completed steps are recorded on the tenant, so calling
+    again after a partial failure resumes with the steps that are still
+    missing. Database work runs in worker threads, never on the event loop.
+    """
+    try:
+        return await _provision(tenant, request)
+    finally:
+        await asyncio.to_thread(_release_claim, tenant.user_id)
+
+
+async def _provision(tenant: Tenant, request: ProvisionRequest) -> ProvisionResponse:
+    started = time.perf_counter()
+    app_id, api_key = tenant.cometchat_app_id, tenant.cometchat_api_key
+    region = tenant.cometchat_region
+    progress = (tenant.extra_metadata or {}).get(PROGRESS_KEY, {})
+    completed = set(progress.get("completed", []))
+    steps: List[ProvisionStep] = []
+
+    if app_id and api_key:
+        steps.append(ProvisionStep(name="create_app", status="skipped", duration_ms=0.0))
+    else:
+        step_start = time.perf_counter()
+        region = request.region or tenant.cometchat_region
+        try:
+            result = await cometchat_client.create_app(
+                name=request.app_name or _default_app_name(tenant),
+                region=region,
+                case_sensitive=request.case_sensitive
+            )
+            app_id, api_key, auth_key = extract_app_credentials(result)
+            if not app_id or not api_key:
+                raise CometChatAPIError("create_app response did not include appId and apiKey", status_code=502)
+        except CometChatAPIError as e:
+            logger.error(f"Provisioning {tenant.user_id}: create_app failed: {e.message}")
+            steps.append(ProvisionStep(
+                name="create_app", status="failed", duration_ms=_elapsed_ms(step_start), error=e.message
+            ))
+            return ProvisionResponse(
+                success=False,
+                message="App creation failed",
+                user_id=tenant.user_id,
+                total_ms=_elapsed_ms(started),
+                steps=steps
+            )
+
+        completed.add("create_app")
+        await asyncio.to_thread(_save_progress, tenant.user_id, completed, (app_id, api_key, auth_key, region))
+        steps.append(ProvisionStep(name="create_app", status="succeeded", duration_ms=_elapsed_ms(step_start)))
+
+    credentials = AppCredentials(app_id=app_id, api_key=api_key, region=region)
+    templates = await asyncio.to_thread(read_role_templates, request.roles)
+
+    calls: List[Tuple[str, Awaitable[Any]]] = []
+    for role_name in request.roles:
+        step_name = f"role:{role_name}"
+        template = templates.get(role_name)
+        if step_name in completed:
+            steps.append(ProvisionStep(name=step_name, status="skipped", duration_ms=0.0))
+        elif template is None:
+            steps.append(ProvisionStep(
+                name=step_name, status="failed", duration_ms=0.0, error=f"Unknown role template {role_name}"
+            ))
+        else:
+            calls.append((step_name, cometchat_client.create_role(**template, credentials=credentials)))
+
+    for webhook in request.webhooks:
+        step_name = f"webhook:{webhook.webhook_id}"
+        if step_name in completed:
+            steps.append(ProvisionStep(name=step_name, status="skipped", duration_ms=0.0))
+            continue
+        calls.append((step_name, cometchat_client.create_webhook(
+            webhook_id=webhook.webhook_id,
+            name=webhook.name,
+            url=str(webhook.url),
+            basic_auth=webhook.basic_auth,
+            username=webhook.username,
+            password=webhook.password,
+            enabled=webhook.enabled,
+            retry_on_failure=webhook.retry_on_failure,
+            credentials=credentials
+        )))
+
+    results = await asyncio.gather(*(_run_step(name, call) for name, call in calls))
+    steps.extend(results)
+    completed.update(step.name for step in results if step.status == "succeeded")
+    if results:
+        await asyncio.to_thread(_save_progress, tenant.user_id, completed)
+
+    failed = [step.name for step in steps if step.status == "failed"]
+    if failed:
+        logger.error(f"Provisioning {tenant.user_id} incomplete, failed steps: {', '.join(failed)}")
+    else:
+        logger.info(f"Provisioned tenant {tenant.user_id} (app {credentials.app_id})")
+
+    return ProvisionResponse(
+        success=not failed,
+        message="Tenant provisioned successfully" if not failed else "Provisioning incomplete; retry to resume",
+        user_id=tenant.user_id,
+        app_id=credentials.app_id,
+        total_ms=_elapsed_ms(started),
+        steps=steps
+    )
@@ -0,0 +1,244 @@
+"""Drift reconciliation: converge every tenant app's roles and webhooks on a desired state"""
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import select
+
+from app.core.config import get_settings
+from app.core.crypto import cipher
+from app.core.database import SessionLocal
+from app.core.logging import logger
+from app.models.tenant import Tenant
+from app.services.cometchat_client import AppCredentials, cometchat_client, role_payload, webhook_payload
+from app.services.jobs import save_checkpoint
+from app.utils.exceptions import CometChatAPIError
+
+
+settings = get_settings()
+
+# Drifted or failed apps listed individually in the job result
+MAX_REPORTED_APPS = 500
+
+# Keys that identify an item, or that CometChat never returns (write-only secrets)
+UNCOMPARED_FIELDS = {"id", "role", "username", "password"}
+
+
+@dataclass(frozen=True)
+class DesiredState:
+    """Create-call kwargs of the roles and webhooks every app should have, by id"""
+    roles: Dict[str, Dict[str, Any]]
+    webhooks: Dict[str, Dict[str, Any]]
+
+    @classmethod
+    def from_payload(cls, payload: Dict[str, Any]) -> "DesiredState":
+        """Index the role and webhook specs of a job payload by id, decrypting webhook passwords"""
+        return cls(
+            roles={role["role"]: role for role in payload["roles"]},
+            webhooks={
+                webhook["webhook_id"]: {**webhook, "password": cipher.decrypt(webhook.get("password"))}
+                for webhook in payload["webhooks"]
+            },
+        )
+
+
+def _changed_fields(desired: Dict[str, Any], current: Dict[str, Any]) -> Dict[str, Any]:
+    """Desired fields whose value differs from the app's current item"""
+    return {
+        field: value for field, value in desired.items()
+        if field not in UNCOMPARED_FIELDS and current.get(field) != value
+    }
+
+
+def plan_actions(
+    desired: DesiredState,
+    current_roles: List[Dict[str, Any]],
+    current_webhooks: List[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """
+    Actions that bring an app to the desired state: create what is missing,
+    update the fields that differ. Items the desired state does not mention
+    are left alone.
+    """
+    actions = []
+    for kind, wanted, current, as_stored in (
+        ("role", desired.roles, {item.get("role"): item for item in current_roles}, role_payload),
+        ("webhook", desired.webhooks, {item.get("id"): item for item in current_webhooks}, webhook_payload),
+    ):
+        for item_id, spec in wanted.items():
+            if item_id not in current:
+                actions.append({"kind": kind, "id": item_id, "action": "create"})
+                continue
+            changes = _changed_fields(as_stored(**spec), current[item_id])
+            if changes:
+                actions.append({"kind": kind, "id": item_id, "action": "update", "changes": changes})
+    return actions
+
+
+async def _apply(action: Dict[str, Any], desired: DesiredState, credentials: AppCredentials) -> None:
+    kind, item_id = action["kind"], action["id"]
+    if action["action"] == "update":
+        update = cometchat_client.update_role if kind == "role" else cometchat_client.update_webhook
+        await update(item_id, action["changes"], credentials=credentials)
+    elif kind == "role":
+        await cometchat_client.create_role(**desired.roles[item_id], credentials=credentials)
+    else:
+        await cometchat_client.create_webhook(**desired.webhooks[item_id], credentials=credentials)
+
+
+async def reconcile_app(credentials: AppCredentials, desired: DesiredState, dry_run: bool) -> Dict[str, Any]:
+    """
+    Diff one app against the desired state and, unless `dry_run`, apply the
+    actions concurrently. Returns the actions with their status and the
+    number of CometChat calls made.
+    """
+    current_roles, current_webhooks = await asyncio.gather(
+        cometchat_client.list_roles(credentials) if desired.roles else asyncio.sleep(0, []),
+        cometchat_client.list_webhooks(credentials) if desired.webhooks else asyncio.sleep(0, []),
+    )
+    actions = plan_actions(desired, current_roles, current_webhooks)
+    calls = bool(desired.roles) + bool(desired.webhooks)
+
+    if dry_run or not actions:
+        for action in actions:
+            action["status"] = "planned"
+        return {"actions": actions, "calls": calls}
+
+    results = await asyncio.gather(
+        *(_apply(action, desired, credentials) for action in actions), return_exceptions=True
+    )
+    for action, result in zip(actions, results):
+        # Created by someone else since the listing: already converged
+        if result is None or (isinstance(result, CometChatAPIError) and result.status_code == 409):
+            action["status"] = "applied"
+        else:
+            action["status"] = "failed"
+            action["error"] = result.message if isinstance(result, CometChatAPIError) else str(result)
+    return {"actions": actions, "calls": calls + len(actions)}
+
+
+def _fetch_apps(after_id: int, limit: int, user_ids: Optional[List[str]]) -> List[Tuple[int, str, AppCredentials]]:
+    """Next `limit` active tenants with app credentials, after the given tenant id"""
+    query = select(
+        Tenant.id, Tenant.user_id, Tenant.cometchat_app_id, Tenant.cometchat_api_key, Tenant.cometchat_region
+    ).where(
+        Tenant.is_active == True,
+        Tenant.cometchat_app_id.isnot(None),
+        Tenant.cometchat_api_key.isnot(None),
+        Tenant.id > after_id
+    )
+    if user_ids:
+        query = query.where(Tenant.user_id.in_(user_ids))
+    query = query.order_by(Tenant.id).limit(limit)
+
+    db = SessionLocal()
+    try:
+        return [
+            (row.id, row.user_id, AppCredentials(row.cometchat_app_id, row.cometchat_api_key, row.cometchat_region))
+            for row in db.execute(query)
+        ]
+    finally:
+        db.close()
+
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(int(len(sorted_values) * fraction), len(sorted_values) - 1)]
+
+
+async def run_reconcile_job(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Job handler: reconcile every active tenant app with a bounded worker pool
+
+    Tenants are streamed in keyset batches into a queue drained by
+    `concurrency` workers, so only a few batches are in memory and a slow
+    app never holds up the others. Calls still go through the client's
+    shared rate limit. Progress is checkpointed after every batch; a
+    recovered job starts over, which is safe since every run re-diffs.
+    """
+    desired = DesiredState.from_payload(payload)
+    dry_run = payload["dry_run"]
+    concurrency = payload["concurrency"]
+    batch_size = payload.get("batch_size", settings.RECONCILE_BATCH_SIZE)
+
+    progress: Dict[str, Any] = {
+        "dry_run": dry_run,
+        "done": False,
+        "apps": 0,
+        "in_sync": 0,
+        "drifted": 0,
+        "failed": 0,
+        "actions": {"planned": 0, "applied": 0, "failed": 0},
+        "api_calls": 0,
+        "reports": [],
+    }
+    durations: List[float] = []
+    listing_calls = bool(desired.roles) + bool(desired.webhooks)
+    queue: asyncio.Queue = asyncio.Queue(maxsize=concurrency * 2)
+    started = time.perf_counter()
+
+    async def produce() -> None:
+        after_id = 0
+        try:
+            while True:
+                apps = await asyncio.to_thread(_fetch_apps, after_id, batch_size, payload.get("user_ids"))
+                for app in apps:
+                    await queue.put(app)
+                if len(apps) < batch_size:
+                    break
+                after_id = apps[-1][0]
+                await save_checkpoint({**progress, "elapsed_seconds": round(time.perf_counter() - started, 3)})
+        finally:
+            for _ in range(concurrency):
+                await queue.put(None)
+
+    async def work() -> None:
+        while (app := await queue.get()) is not None:
+            _, user_id, credentials = app
+            app_started = time.perf_counter()
+            report: Dict[str, Any] = {"user_id": user_id, "app_id": credentials.app_id}
+            try:
+                outcome = await reconcile_app(credentials, desired, dry_run)
+            except Exception as e:
+                report["error"] = e.message if isinstance(e, CometChatAPIError) else str(e)
+                progress["failed"] += 1
+                progress["api_calls"] += listing_calls
+            else:
+                report["actions"] = outcome["actions"]
+                progress["api_calls"] += outcome["calls"]
+                statuses = [action["status"] for action in outcome["actions"]]
+                for status in statuses:
+                    progress["actions"][status] += 1
+                if "failed" in statuses:
+                    progress["failed"] += 1
+                elif statuses:
+                    progress["drifted"] += 1
+                else:
+                    progress["in_sync"] += 1
+            durations.append(time.perf_counter() - app_started)
+            progress["apps"] += 1
+            if ("error" in report or report["actions"]) and len(progress["reports"]) < MAX_REPORTED_APPS:
+                progress["reports"].append(report)
+
+    await asyncio.gather(produce(), *(work() for _ in range(concurrency)))
+
+    elapsed = time.perf_counter() - started
+    durations.sort()
+    progress.update({
+        "done": True,
+        "elapsed_seconds": round(elapsed, 3),
+        "apps_per_second": round(progress["apps"] / elapsed, 1) if elapsed else 0.0,
+        "app_latency_ms": {
+            "p50": round(_percentile(durations, 0.5) * 1000, 1),
+            "p95": round(_percentile(durations, 0.95) * 1000, 1),
+            "max": round((durations[-1] if durations else 0.0) * 1000, 1),
+        },
+        "reports_truncated": progress["drifted"] + progress["failed"] > len(progress["reports"]),
+    })
+    logger.info(
+        f"Reconciled {progress['apps']} apps in {elapsed:.1f}s{' (dry run)' if dry_run else ''}: "
+        f"{progress['in_sync']} in sync, {progress['drifted']} drifted, {progress['failed']} failed"
+    )
+    return progress
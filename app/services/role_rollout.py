@@ -0,0 +1,157 @@
+"""Apply one role template to many tenant apps"""
+import asyncio
+import time
+from typing import Any, Dict, List, Union
+
+from sqlalchemy import select
+
+from app.core.config import get_settings
+from app.core.database import SessionLocal
+from app.core.logging import logger
+from app.models.tenant import Tenant
+from app.schemas.role import RoleTemplateApplyResponse, RoleTemplateApplyResult
+from app.services.cometchat_client import AppCredentials, cometchat_client, role_payload
+from app.utils.exceptions import CometChatAPIError
+
+
+settings = get_settings()
+
+
+def _elapsed_ms(start: float) -> float:
+    return round((time.perf_counter() - start) * 1000, 1)
+
+
+async def _apply_to_app(
+    role: Dict[str, Any],
+    user_id: str,
+    credentials: AppCredentials,
+    update_existing: bool,
+    slots: asyncio.Semaphore
+) -> RoleTemplateApplyResult:
+    """Create the role in one app; if it already exists, bring it in line with the template"""
+    async with slots:
+        start = time.perf_counter()
+        status = "created"
+        try:
+            try:
+                await cometchat_client.create_role(**role, credentials=credentials)
+            except CometChatAPIError as e:
+                if e.status_code != 409:
+                    raise
+                status = "exists"
+                if update_existing:
+                    changes = {field: value for field, value in role_payload(**role).items() if field != "role"}
+                    await cometchat_client.update_role(role["role"], changes, credentials=credentials)
+                    status = "updated"
+        except CometChatAPIError as e:
+            return RoleTemplateApplyResult(
+                user_id=user_id, app_id=credentials.app_id, status="failed",
+                duration_ms=_elapsed_ms(start), error=e.message
+            )
+        return RoleTemplateApplyResult(
+            user_id=user_id, app_id=credentials.app_id, status=status, duration_ms=_elapsed_ms(start)
+        )
+
+
+def _load_targets(user_ids: List[str]) -> Dict[str, Union[AppCredentials, str]]:
+    """Credentials of each tenant's app read from the database, or why it is skipped"""
+    targets: Dict[str, Union[AppCredentials, str]] = {}
+    db = SessionLocal()
+    try:
+        rows = db.execute(
+            select(
+                Tenant.user_id, Tenant.is_active, Tenant.cometchat_app_id,
+                Tenant.cometchat_api_key, Tenant.cometchat_region
+            ).where(Tenant.user_id.in_(user_ids))
+        )
+        for row in rows:
+            if not row.is_active:
+                targets[row.user_id] = "Tenant is inactive"
+            elif not (row.cometchat_app_id and row.cometchat_api_key):
+                targets[row.user_id] = "Tenant has no CometChat app"
+            else:
+                targets[row.user_id] = AppCredentials(
+                    row.cometchat_app_id, row.cometchat_api_key, row.cometchat_region
+                )
+    finally:
+        db.close()
+    return targets
+
+
+async def _resolve_targets(user_ids: List[str]) -> Dict[str, Union[AppCredentials, str]]:
+    """Credentials of each tenant's app, or why it is skipped; the directory first, then the database"""
+    targets: Dict[str, Union[AppCredentials, str]] = {}
+    if settings.TENANT_DIRECTORY_ENABLED:
+        from app.services.tenant_directory import tenant_directory
+        for user_id in user_ids:
+            route = tenant_directory.by_user_id(user_id)
+            if route is not None:
+                targets[user_id] = route.credentials or "Tenant has no CometChat app"
+
+    missing = [user_id for user_id in user_ids if user_id not in targets]
+    if missing:
+        targets.update(await asyncio.to_thread(_load_targets, missing))
+    return targets
+
+
+async def apply_role_template(
+    name: str,
+    role: Dict[str, Any],
+    user_ids: List[str],
+    concurrency: int,
+    update_existing: bool = True
+) -> RoleTemplateApplyResponse:
+    """
+    Apply a template's role to the apps of the given tenants concurrently
+
+    At most `concurrency` apps are in flight; each call also waits on its
+    app's own rate limit and the account-wide one. Tenants that are
+    unknown, inactive or have no app are skipped, and one app failing does
+    not stop the others.
+    """
+    started = time.perf_counter()
+    unique_ids = list(dict.fromkeys(user_ids))
+    targets = await _resolve_targets(unique_ids)
+
+    slots = asyncio.Semaphore(concurrency)
+
+    async def apply(user_id: str) -> RoleTemplateApplyResult:
+        target = targets.get(user_id, "Tenant not found")
+        if isinstance(target, str):
+            return RoleTemplateApplyResult(user_id=user_id, status="skipped", duration_ms=0.0, error=target)
+        return await _apply_to_app(role, user_id, target, update_existing, slots)
+
+    results = await asyncio.gather(*(apply(user_id) for user_id in unique_ids))
+
+    counts: Dict[str, int] = {}
+    for result in results:
+        counts[result.status] = counts.get(result.status, 0) + 1
+    logger.info(
+        f"Applied role template {name} to {len(results)} tenants: "
+        + ", ".join(f"{count} {status}" for status, count in sorted(counts.items()))
+    )
+    return RoleTemplateApplyResponse(
+        template=name,
+        role=role["role"],
+        requested=len(results),
+        counts=counts,
+        total_ms=_elapsed_ms(started),
+        results=results
+    )
+
+
+async def run_rollout_job(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Job handler: apply a template's role and store the per-app summary as the result
+
+    A recovered job starts over; apps that already have the role report
+    exists or updated, so that is safe.
+    """
+    response = await apply_role_template(
+        payload["template"],
+        payload["role"],
+        payload["user_ids"],
+        payload["concurrency"],
+        payload["update_existing"]
+    )
+    return response.model_dump(mode="json")
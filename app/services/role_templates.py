@@ -0,0 +1,48 @@
+"""CometChat role templates: built-in seeds and stored templates"""
+from typing import Any, Dict, Iterable
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal
+from app.models.role_template import RoleTemplate
+
+# Predefined admin role payload
+ADMIN_ROLE: Dict[str, Any] = {
+    "role": "admin",
+    "name": "Administrator",
+    "description": "Full access administrator",
+    "metadata": {
+        "permissions": ["read", "write", "delete"],
+        "accessLevel": 10
+    },
+    "settings": {
+        "listUsers": "all",
+        "sendMessagesTo": "all"
+    }
+}
+
+# Seeded into role_templates by the role_templates migration
+BUILTIN_ROLE_TEMPLATES: Dict[str, Dict[str, Any]] = {
+    "admin": ADMIN_ROLE,
+}
+
+
+def load_role_templates(db: Session, names: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+    """Stored templates by name, as create_role kwargs; unknown names are absent"""
+    names = set(names)
+    if not names:
+        return {}
+    return {
+        template.name: template.to_role()
+        for template in db.scalars(select(RoleTemplate).where(RoleTemplate.name.in_(names)))
+    }
+
+
+def read_role_templates(names: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+    """load_role_templates in a session of its own, for async callers to run with asyncio.to_thread"""
+    db = SessionLocal()
+    try:
+        return load_role_templates(db, names)
+    finally:
+        db.close()
@@ -0,0 +1,155 @@
+"""Preloaded in-memory directory of active tenants' CometChat routing fields"""
+import sys
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from sqlalchemy import Text, func, select, type_coerce
+
+from app.core.config import get_settings
+from app.core.crypto import cipher
+from app.core.database import SessionLocal, engine
+from app.core.logging import logger
+from app.models.tenant import Tenant
+from app.services.cometchat_client import AppCredentials
+from app.services.tenant_stats import read_stats
+
+
+settings = get_settings()
+
+# Re-read rows updated this long before the watermark: a transaction stamps
+# updated_at at flush but may commit after a refresh has moved past it
+REFRESH_OVERLAP = timedelta(seconds=5)
+
+_COLUMNS = (
+    Tenant.user_id,
+    Tenant.is_active,
+    Tenant.cometchat_app_id,
+    Tenant.cometchat_region,
+    # The stored (possibly encrypted) value; decrypted only when used
+    type_coerce(Tenant.cometchat_api_key, Text).label("api_key_token"),
+    Tenant.updated_at,
+)
+
+
+class TenantRoute:
+    """Routing fields of one active tenant; slots keep a million of these small"""
+    __slots__ = ("user_id", "app_id", "region", "api_key_token")
+
+    def __init__(self, user_id: str, app_id: Optional[str], region: str, api_key_token: Optional[str]):
+        self.user_id = user_id
+        self.app_id = app_id
+        # A handful of distinct regions: share one string per value
+        self.region = sys.intern(region) if region else "us"
+        self.api_key_token = api_key_token
+
+    @property
+    def credentials(self) -> Optional[AppCredentials]:
+        """REST credentials of the tenant's app, or None if it has none"""
+        if not self.app_id or not self.api_key_token:
+            return None
+        return AppCredentials(self.app_id, cipher.decrypt(self.api_key_token), self.region)
+
+    def __repr__(self):
+        return f"<TenantRoute(user_id={self.user_id}, app_id={self.app_id})>"
+
+
+class TenantDirectory:
+    """
+    Active tenants indexed by user_id and cometchat_app_id
+
+    `load` reads every active tenant once; `refresh` then applies only rows
+    whose updated_at moved past the last watermark, so keeping a million
+    entries current costs an indexed range read of the changed rows.
+    Deactivation is an update, so it is seen too; a hard delete of an
+    active tenant is not, and is caught by comparing the entry count with
+    the active tenant count, which forces a full load.
+
+    Lookups are plain dict reads from the event loop. Loads and refreshes
+    run in a worker thread and swap or update dict entries, which the GIL
+    keeps atomic.
+    """
+
+    def __init__(self):
+        self._by_user_id: Dict[str, TenantRoute] = {}
+        self._by_app_id: Dict[str, TenantRoute] = {}
+        self._watermark: Optional[datetime] = None
+        self._lock = threading.Lock()
+        self.loaded = False
+
+    def __len__(self) -> int:
+        return len(self._by_user_id)
+
+    def by_user_id(self, user_id: str) -> Optional[TenantRoute]:
+        return self._by_user_id.get(user_id)
+
+    def by_app_id(self, app_id: str) -> Optional[TenantRoute]:
+        return self._by_app_id.get(app_id)
+
+    def load(self) -> int:
+        """Replace the directory with every active tenant; returns the entry count"""
+        query = select(
+            Tenant.user_id, Tenant.cometchat_app_id, Tenant.cometchat_region,
+            type_coerce(Tenant.cometchat_api_key, Text)
+        ).where(Tenant.is_active == True)
+        with self._lock:
+            by_user_id: Dict[str, TenantRoute] = {}
+            by_app_id: Dict[str, TenantRoute] = {}
+            # Core rows unpacked as tuples: the ORM's per-row cost dominates at a million rows
+            with engine.connect() as connection:
+                watermark = connection.scalar(select(func.max(Tenant.updated_at)))
+                for user_id, app_id, region, api_key_token in connection.execute(
+                    query.execution_options(yield_per=10000)
+                ):
+                    route = TenantRoute(user_id, app_id, region, api_key_token)
+                    by_user_id[user_id] = route
+                    if app_id:
+                        by_app_id[app_id] = route
+
+            self._by_user_id, self._by_app_id = by_user_id, by_app_id
+            self._watermark = watermark
+            self.loaded = True
+        logger.info(f"Tenant directory loaded {len(by_user_id)} active tenants")
+        return len(by_user_id)
+
+    def refresh(self) -> int:
+        """Apply tenants updated since the last load or refresh; returns the rows applied"""
+        if not self.loaded:
+            return self.load()
+
+        with self._lock:
+            db = SessionLocal()
+            try:
+                query = select(*_COLUMNS)
+                if self._watermark is not None:
+                    query = query.where(Tenant.updated_at >= self._watermark - REFRESH_OVERLAP)
+                rows = db.execute(query).all()
+                active = read_stats(db)["by_status"].get("active", 0)
+            finally:
+                db.close()
+
+            for row in rows:
+                self._apply(row)
+                if row.updated_at and (self._watermark is None or row.updated_at > self._watermark):
+                    self._watermark = row.updated_at
+            drifted = len(self._by_user_id) != active
+
+        if drifted:
+            logger.info("Tenant directory missed a deletion; reloading")
+            self.load()
+        return len(rows)
+
+    def _apply(self, row) -> None:
+        previous = self._by_user_id.get(row.user_id)
+        if previous is not None and previous.app_id and self._by_app_id.get(previous.app_id) is previous:
+            del self._by_app_id[previous.app_id]
+        if not row.is_active:
+            self._by_user_id.pop(row.user_id, None)
+            return
+        route = TenantRoute(row.user_id, row.cometchat_app_id, row.cometchat_region, row.api_key_token)
+        self._by_user_id[route.user_id] = route
+        if route.app_id:
+            self._by_app_id[route.app_id] = route
+
+
+tenant_directory = TenantDirectory()
@@ -0,0 +1,62 @@
+"""Hard-delete tenants that have been soft-deleted past the retention period"""
+import asyncio
+from datetime import datetime, timedelta
+from typing import Any, Dict, Tuple
+
+from sqlalchemy import delete, select
+
+from app.core.config import get_settings
+from app.core.database import SessionLocal
+from app.core.logging import logger
+from app.core.state import TENANTS, bump_version
+from app.models.tenant import Tenant
+
+
+settings = get_settings()
+
+
+def _purge_batch(cutoff: datetime, batch_size: int) -> Tuple[int, int]:
+    """
+    Delete up to `batch_size` of the longest-deleted tenants in one short transaction
+
+    Returns (selected, deleted); they differ only when tenants were
+    reactivated meanwhile.
+    """
+    expired = (Tenant.is_active == False, Tenant.deleted_at < cutoff)
+    db = SessionLocal()
+    try:
+        ids = list(db.scalars(
+            select(Tenant.id).where(*expired).order_by(Tenant.deleted_at).limit(batch_size)
+        ))
+        if not ids:
+            return 0, 0
+        # Re-check expiry: a tenant reactivated since the SELECT must survive
+        deleted = db.execute(delete(Tenant).where(Tenant.id.in_(ids), *expired)).rowcount
+        # Bulk deletes bypass the flush hook that bumps the version
+        bump_version(db.connection(), TENANTS)
+        db.commit()
+        return len(ids), deleted
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+async def run_purge_job(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Job handler: purge batch by batch, pausing between batches so other writers get the lock"""
+    retention_days = payload.get("retention_days", settings.TENANT_PURGE_RETENTION_DAYS)
+    batch_size = payload.get("batch_size", settings.TENANT_PURGE_BATCH_SIZE)
+    cutoff = datetime.utcnow() - timedelta(days=retention_days)
+
+    purged = batches = 0
+    while True:
+        selected, deleted = await asyncio.to_thread(_purge_batch, cutoff, batch_size)
+        if not selected:
+            break
+        purged += deleted
+        batches += 1
+        await asyncio.sleep(settings.TENANT_PURGE_BATCH_PAUSE_SECONDS)
+
+    logger.info(f"Tenant purge deleted {purged} tenants in {batches} batches")
+    return {"cutoff": cutoff.isoformat(), "purged": purged, "batches": batches}
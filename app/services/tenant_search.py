@@ -0,0 +1,87 @@
+"""Tenant search over names, email and phone"""
+import re
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import and_, column, or_, select, table, text
+from sqlalchemy.orm import Session
+
+from app.models.tenant import Tenant, TENANT_RESPONSE_COLUMNS
+
+
+# Created by the tenant_search migration where FTS5 is available
+FTS_TABLE = "tenants_fts"
+_fts = table(FTS_TABLE, column("rowid"), column("rank"))
+
+SEARCH_COLUMNS = (Tenant.user_first_name, Tenant.user_last_name, Tenant.user_email, Tenant.user_phone)
+
+# Shorter tokens match whole words only; as prefixes they would rank most of the table
+MIN_PREFIX_LENGTH = 2
+
+# Best-ranked matches kept from the index before tenant rows are read
+RANK_CANDIDATES = 2000
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+_fts_enabled: Optional[bool] = None
+
+
+def search_tokens(q: str) -> List[str]:
+    """Words of the query; FTS5 operators and punctuation are dropped"""
+    return _TOKEN.findall(q.lower())
+
+
+def fts_match(tokens: List[str]) -> str:
+    """MATCH expression: every token, as a prefix when long enough"""
+    return " ".join(
+        f'"{token}"*' if len(token) >= MIN_PREFIX_LENGTH else f'"{token}"'
+        for token in tokens
+    )
+
+
+def fts_enabled(db: Session) -> bool:
+    """Whether the FTS index exists; checked once per process"""
+    global _fts_enabled
+    if _fts_enabled is None:
+        bind = db.get_bind()
+        _fts_enabled = bind.dialect.name == "sqlite" and db.scalar(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+            {"name": FTS_TABLE}
+        ) is not None
+    return _fts_enabled
+
+
+def search_tenants(db: Session, q: str, limit: int, active_only: bool = False) -> List[Dict[str, Any]]:
+    """
+    Tenants matching every word of `q`, best match first
+
+    Uses the FTS5 index (bm25 ranking, prefix matching) when present,
+    keeping the RANK_CANDIDATES best matching tenants; otherwise substring-matches
+    each word against the searched columns and orders by most recently
+    updated.
+    """
+    tokens = search_tokens(q)
+    if not tokens:
+        return []
+
+    query = select(*TENANT_RESPONSE_COLUMNS)
+    if fts_enabled(db):
+        # Filtered and ordered before the limit, so the best active matches
+        # survive it rather than the first ones in rowid order
+        candidates = (
+            select(_fts.c.rowid, _fts.c.rank)
+            .join(Tenant, Tenant.id == _fts.c.rowid)
+            .where(text(f"{FTS_TABLE} MATCH :match").bindparams(match=fts_match(tokens)))
+        )
+        if active_only:
+            candidates = candidates.where(Tenant.is_active == True)
+        candidates = candidates.order_by(_fts.c.rank).limit(RANK_CANDIDATES).subquery()
+        query = query.join(candidates, candidates.c.rowid == Tenant.id).order_by(candidates.c.rank)
+    else:
+        query = query.where(and_(*(
+            or_(*(col.ilike(f"%{token}%") for col in SEARCH_COLUMNS))
+            for token in tokens
+        ))).order_by(Tenant.updated_at.desc())
+        if active_only:
+            query = query.where(Tenant.is_active == True)
+
+    return [row._asdict() for row in db.execute(query.limit(limit))]
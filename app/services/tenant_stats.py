@@ -0,0 +1,113 @@
+"""Tenant counts by region, status and log level, for dashboards"""
+import asyncio
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import case, delete, func, insert, literal, select, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from app.core.database import engine
+from app.core.logging import logger
+from app.models.tenant import Tenant
+from app.models.tenant_stat import TenantStat
+
+
+TOTAL = "total"
+
+# Dimension -> tenant expression it counts; the SQLite triggers mirror these
+DIMENSIONS = {
+    TOTAL: literal("all"),
+    "region": Tenant.cometchat_region,
+    "status": case((Tenant.is_active == True, "active"), else_="inactive"),
+    "log_level": Tenant.cometchat_log_level,
+}
+
+# Created by the tenant_stats migration on SQLite
+INSERT_TRIGGER = "tenant_stats_insert"
+
+_stats_maintained: Optional[bool] = None
+
+
+def stats_maintained(db: Session) -> bool:
+    """Whether triggers keep tenant_stats current; checked once per process"""
+    global _stats_maintained
+    if _stats_maintained is None:
+        bind = db.get_bind()
+        _stats_maintained = bind.dialect.name == "sqlite" and db.scalar(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = :name"),
+            {"name": INSERT_TRIGGER}
+        ) is not None
+    return _stats_maintained
+
+
+def _aggregate(connection) -> Dict[Tuple[str, str], int]:
+    """Count tenants per dimension value straight from the tenants table"""
+    counts = {}
+    for dimension, expression in DIMENSIONS.items():
+        rows = connection.execute(
+            select(expression, func.count()).select_from(Tenant.__table__).group_by(expression)
+        )
+        counts.update({(dimension, value): count for value, count in rows if count})
+    return counts
+
+
+def _shape(counts: Dict[Tuple[str, str], int]) -> Dict[str, Any]:
+    stats = {"total": counts.get((TOTAL, "all"), 0)}
+    for dimension in DIMENSIONS:
+        if dimension != TOTAL:
+            stats[f"by_{dimension}"] = {
+                value: count for (dim, value), count in sorted(counts.items()) if dim == dimension and count
+            }
+    return stats
+
+
+def read_stats(db: Session) -> Dict[str, Any]:
+    """Current counts; a read of tenant_stats, or a full aggregate where no triggers maintain it"""
+    if stats_maintained(db):
+        rows = db.execute(select(TenantStat.dimension, TenantStat.value, TenantStat.count))
+        counts = {(dimension, value): count for dimension, value, count in rows}
+    else:
+        counts = _aggregate(db.connection())
+    return _shape(counts)
+
+
+def rebuild_stats(connection: Connection) -> List[Dict[str, Any]]:
+    """
+    Recount tenant_stats from scratch; returns the rows that had drifted
+
+    Clearing the table first takes the write lock, so no tenant write can
+    land between the recount and the new rows.
+    """
+    table = TenantStat.__table__
+    stored = {
+        (dimension, value): count
+        for dimension, value, count in connection.execute(
+            delete(table).returning(table.c.dimension, table.c.value, table.c.count)
+        )
+    }
+    actual = _aggregate(connection)
+    if actual:
+        connection.execute(insert(table), [
+            {"dimension": dimension, "value": value, "count": count}
+            for (dimension, value), count in actual.items()
+        ])
+    return [
+        {"dimension": key[0], "value": key[1], "stored": stored.get(key, 0), "actual": actual.get(key, 0)}
+        for key in sorted(stored.keys() | actual.keys())
+        if stored.get(key, 0) != actual.get(key, 0)
+    ]
+
+
+def _rebuild() -> List[Dict[str, Any]]:
+    with engine.begin() as connection:
+        return rebuild_stats(connection)
+
+
+async def run_rebuild_job(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Job handler: recount the statistics and report any drift found"""
+    drift = await asyncio.to_thread(_rebuild)
+    if drift:
+        logger.warning(f"Tenant statistics had drifted in {len(drift)} rows; rebuilt")
+    else:
+        logger.info("Tenant statistics were consistent; rebuilt")
+    return {"consistent": not drift, "drift": drift}
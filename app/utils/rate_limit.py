@@ -0,0 +1,43 @@
+"""Async rate limiting primitives"""
+import asyncio
+import time
+
+
+class AsyncTokenBucket:
+    """
+    Token bucket for pacing outbound calls from a single process
+
+    A rate of 0 disables limiting. Waiters are served in FIFO order.
+    """
+
+    def __init__(self, rate_per_second: float, capacity: float | None = None):
+        self.rate = rate_per_second
+        self.capacity = capacity if capacity is not None else max(rate_per_second, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    @classmethod
+    def per_minute(cls, calls_per_minute: float) -> "AsyncTokenBucket":
+        """Bucket allowing `calls_per_minute` with a one-second burst"""
+        return cls(calls_per_minute / 60.0)
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate > 0
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, tokens: float = 1.0) -> None:
+        """Wait until `tokens` are available and take them"""
+        if not self.enabled:
+            return
+        async with self._lock:
+            self._refill()
+            while self._tokens < tokens:
+                await asyncio.sleep((tokens - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= tokens
@@ -0,0 +1,103 @@
+"""CPU cost vs bytes saved for response compression of tenant list payloads
+
+Usage:
+    python benchmarks/bench_compression.py [--rows 1,10,50,100,1000,5000] [--mbps 100]
+
+Builds GET /api/v1/tenants-shaped JSON bodies of increasing size and times
+each available codec (gzip at several levels, brotli/zstd when installed)
+through the same compressor classes CompressionMiddleware uses. A codec
+"pays off" when the transfer time it saves on a link of --mbps exceeds the
+CPU time it costs; the smallest such body size is a sensible
+COMPRESSION_MIN_SIZE.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import uuid
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("COMETCHAT_APP_ID", "bench_app")
+os.environ.setdefault("COMETCHAT_API_KEY", "bench_key")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+from app.core.compression import BrotliCompressor, GzipCompressor, ZstdCompressor, brotli, zstandard
+
+
+def tenant_list_body(rows: int) -> bytes:
+    now = datetime.utcnow().isoformat()
+    return json.dumps([
+        {
+            "id": i,
+            "user_id": str(uuid.uuid4()),
+            "user_first_name": f"First{i}",
+            "user_last_name": f"Last{i}",
+            "user_email": f"user{i}@example.com",
+            "user_phone": "+15550000000",
+            "cometchat_region": "us",
+            "cometchat_log_level": "INFO",
+            "extra_metadata": {"plan": "pro", "seats": i},
+            "created_at": now,
+            "updated_at": now,
+            "is_active": True
+        }
+        for i in range(rows)
+    ], separators=(",", ":")).encode()
+
+
+def codecs():
+    found = [(f"gzip-{level}", lambda level=level: GzipCompressor(level)) for level in (1, 6, 9)]
+    if brotli is not None:
+        found += [(f"br-{q}", lambda q=q: BrotliCompressor(q)) for q in (1, 4, 6)]
+    if zstandard is not None:
+        found += [(f"zstd-{level}", lambda level=level: ZstdCompressor(level)) for level in (1, 3)]
+    return found
+
+
+def time_codec(factory, body: bytes, budget: float = 0.2):
+    """Median one-shot compression time (seconds) and output size"""
+    samples = []
+    deadline = time.perf_counter() + budget
+    while len(samples) < 5 or (time.perf_counter() < deadline and len(samples) < 1000):
+        start = time.perf_counter()
+        out = factory().finish(body)
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return samples[len(samples) // 2], len(out)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", default="1,5,10,50,100,1000,5000")
+    parser.add_argument("--mbps", type=float, default=100.0, help="client link speed for break-even")
+    args = parser.parse_args()
+
+    bytes_per_second = args.mbps * 1_000_000 / 8
+    available = codecs()
+    if brotli is None or zstandard is None:
+        print("note: brotli/zstandard not installed, only gzip is measured")
+    print(f"{'rows':>6} {'body':>9} {'codec':>8} {'out':>9} {'ratio':>6} {'cpu_us':>9} {'saved_us':>9}  pays")
+
+    break_even = {}
+    for rows in (int(r) for r in args.rows.split(",")):
+        body = tenant_list_body(rows)
+        for name, factory in available:
+            cpu, size = time_codec(factory, body)
+            saved = (len(body) - size) / bytes_per_second
+            pays = saved > cpu
+            if pays and name not in break_even:
+                break_even[name] = len(body)
+            print(
+                f"{rows:>6} {len(body):>9} {name:>8} {size:>9} {len(body) / size:>6.1f} "
+                f"{cpu * 1e6:>9.1f} {saved * 1e6:>9.1f}  {'yes' if pays else 'no'}"
+            )
+
+    print(f"\nbreak-even body size at {args.mbps:g} Mbit/s:")
+    for name, _ in available:
+        print(f"  {name:>8}: {break_even.get(name, 'never in range')}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""Inbound CometChat event decoding: events/sec per core by decoding strategy
+
+Usage:
+    python benchmarks/bench_event_decoding.py [--seconds 1.0] [--tags 0 10 100]
+
+Builds after_message deliveries whose message body carries --tags
+metadata tags, then times each way of turning the raw body into
+routing fields plus a payload ready for the events table:
+
+  dict + Body    json.loads and Dict[str, Any] validation, as FastAPI's
+                 Body(...) did, then json.dumps for the JSON column
+  pydantic       full nested model validation (model_validate_json) of
+                 the delivery, then json.dumps for the JSON column
+  decode_event   app.services.event_decoding with stdlib json / orjson;
+                 the delivered text is stored as-is
+
+Single-threaded, so each figure is events/sec on one core.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Any, Dict, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("COMETCHAT_APP_ID", "bench_app")
+os.environ.setdefault("COMETCHAT_API_KEY", "bench_key")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+from pydantic import BaseModel, TypeAdapter
+
+from app.core import serialization
+from app.services.event_decoding import decode_event
+
+
+class Entity(BaseModel):
+    entity: Dict[str, Any]
+    entityType: str
+
+
+class MessageBody(BaseModel):
+    text: Optional[str] = None
+    resource: Optional[str] = None
+    metadata: Dict[str, Any] = {}
+    entities: Dict[str, Entity]
+
+
+class Message(BaseModel):
+    id: str
+    conversationId: str
+    sender: str
+    receiverType: str
+    receiver: str
+    category: str
+    type: str
+    data: MessageBody
+    sentAt: int
+    updatedAt: Optional[int] = None
+
+
+class MessageData(BaseModel):
+    message: Message
+
+
+class Delivery(BaseModel):
+    trigger: str
+    appId: str
+    region: str
+    webhook: Optional[str] = None
+    data: MessageData
+
+
+def delivery(tags: int) -> bytes:
+    user = {"uid": "cometchat-uid-1", "name": "Andrew Joseph", "status": "online", "role": "default",
+            "avatar": "https://data-us.cometchat.io/assets/images/avatars/andrewjoseph.png", "lastActiveAt": 1700000000}
+    group = {"guid": "cometchat-guid-1", "name": "Hiking Group", "type": "public", "owner": "cometchat-uid-1",
+             "membersCount": 5, "createdAt": 1690000000, "conversationId": "group_cometchat-guid-1"}
+    return json.dumps({
+        "trigger": "after_message",
+        "appId": "2530487a1b2c3d4e",
+        "region": "us",
+        "webhook": "hook-1",
+        "data": {"message": {
+            "id": "51234", "conversationId": "group_cometchat-guid-1", "sender": "cometchat-uid-1",
+            "receiverType": "group", "receiver": "cometchat-guid-1", "category": "message", "type": "text",
+            "data": {
+                "text": "Are we still on for the ridge trail on Saturday? Weather looks good.",
+                "resource": "WEB-4_0_0-abc",
+                "metadata": {
+                    "@injected": {"extensions": {"sentiment-analysis": {"sentiment": "neutral"}}},
+                    "tags": [{"key": f"tag-{i}", "value": f"value {i}", "score": i / 7} for i in range(tags)]
+                },
+                "entities": {"sender": {"entity": user, "entityType": "user"},
+                             "receiver": {"entity": group, "entityType": "group"}}
+            },
+            "sentAt": 1700000123, "updatedAt": 1700000123
+        }}
+    }).encode()
+
+
+dict_body = TypeAdapter(Dict[str, Any])
+
+
+def dict_and_body(raw: bytes):
+    payload = dict_body.validate_python(json.loads(raw))
+    return payload["appId"], payload["trigger"], json.dumps(payload)
+
+
+def pydantic_model(raw: bytes):
+    model = Delivery.model_validate_json(raw)
+    return model.appId, model.trigger, json.dumps(model.model_dump(exclude_unset=True))
+
+
+def lazy(raw: bytes):
+    event = decode_event(raw)
+    return event.app_id, event.trigger, event.text
+
+
+def events_per_second(decode, raw: bytes, seconds: float) -> float:
+    decode(raw)
+    count, started = 0, time.perf_counter()
+    while time.perf_counter() - started < seconds:
+        for _ in range(100):
+            decode(raw)
+        count += 100
+    return count / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=1.0)
+    parser.add_argument("--tags", type=int, nargs="+", default=[0, 10, 100])
+    args = parser.parse_args()
+
+    print(f"{'bytes':>7} {'strategy':<22} {'events/s':>10} {'us/event':>9}")
+    for tags in args.tags:
+        raw = delivery(tags)
+        for strategy, decode, fast_json in (
+            ("dict + Body", dict_and_body, False),
+            ("pydantic", pydantic_model, False),
+            ("decode_event (json)", lazy, False),
+            ("decode_event (orjson)", lazy, True),
+        ):
+            if fast_json and serialization.orjson is None:
+                continue
+            serialization.FAST_JSON_ENABLED = fast_json
+            rate = events_per_second(decode, raw, args.seconds)
+            print(f"{len(raw):>7} {strategy:<22} {rate:>10.0f} {1e6 / rate:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""Container startup time: process launch to first successful request
+
+Starts the service the way the container does (gunicorn with
+gunicorn.conf.py) and times how long it takes until GET /health first
+answers 200. "cold" runs start against an empty database, so the schema
+migrations run; "warm" runs reuse it, so startup only reads the schema
+version. Also reports the bare `import app.main` time and, with
+--breakdown, the slowest imports.
+
+Usage:
+    python benchmarks/bench_startup.py [--runs 5] [--workers 1] [--breakdown 15]
+"""
+import argparse
+import os
+import re
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def service_env(workdir: str, port: int, workers: int) -> dict:
+    return dict(
+        os.environ,
+        PYTHONPATH=ROOT,
+        WEB_CONCURRENCY=str(workers),
+        BIND=f"127.0.0.1:{port}",
+        LOG_LEVEL="WARNING",
+        DATABASE_URL=f"sqlite:///{os.path.join(workdir, 'startup.db')}",
+        EVENT_ARCHIVE_DIR=os.path.join(workdir, "event_archive"),
+        COMETCHAT_APP_ID=os.environ.get("COMETCHAT_APP_ID", "bench_app"),
+        COMETCHAT_API_KEY=os.environ.get("COMETCHAT_API_KEY", "bench_key"),
+    )
+
+
+def time_to_first_request(workdir: str, port: int, workers: int, timeout: float = 60.0) -> float:
+    """Seconds from spawning gunicorn until /health returns 200"""
+    url = f"http://127.0.0.1:{port}/health"
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", os.path.join(ROOT, "gunicorn.conf.py"), "app.main:app"],
+        cwd=workdir, env=service_env(workdir, port, workers),
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        with httpx.Client(timeout=1.0) as client:
+            while time.perf_counter() - started < timeout:
+                if server.poll() is not None:
+                    raise RuntimeError(f"server exited with {server.returncode}")
+                try:
+                    if client.get(url).status_code == 200:
+                        return time.perf_counter() - started
+                except httpx.TransportError:
+                    pass
+                time.sleep(0.005)
+        raise RuntimeError("server did not answer in time")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def import_seconds(workdir: str) -> float:
+    """Wall time of `import app.main` in a fresh interpreter"""
+    output = subprocess.run(
+        [sys.executable, "-c", "import time; t = time.perf_counter(); import app.main; print(time.perf_counter() - t)"],
+        cwd=workdir, env=service_env(workdir, 0, 1), capture_output=True, text=True, check=True
+    ).stdout
+    return float(output.strip().splitlines()[-1])
+
+
+def slowest_imports(workdir: str, count: int):
+    """(cumulative_us, self_us, module) of the slowest imports, from -X importtime"""
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=workdir, env=service_env(workdir, 0, 1), capture_output=True, text=True, check=True
+    ).stderr
+    rows = []
+    for line in stderr.splitlines():
+        match = re.match(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)", line)
+        if match:
+            depth = (len(match.group(3)) - 1) // 2
+            # Top two levels name whole subsystems; deeper ones are their internals
+            if depth <= 1:
+                rows.append((int(match.group(2)), int(match.group(1)), match.group(4)))
+    return sorted(rows, reverse=True)[:count]
+
+
+def summarize(label: str, samples):
+    print(
+        f"  {label:<8} median={statistics.median(samples) * 1000:7.0f}ms "
+        f"min={min(samples) * 1000:7.0f}ms max={max(samples) * 1000:7.0f}ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--breakdown", type=int, default=0, help="show the N slowest top-level imports")
+    args = parser.parse_args()
+
+    cold, warm, imports = [], [], []
+    for _ in range(args.runs):
+        workdir = tempfile.mkdtemp()
+        try:
+            imports.append(import_seconds(workdir))
+            cold.append(time_to_first_request(workdir, args.port, args.workers))
+            warm.append(time_to_first_request(workdir, args.port, args.workers))
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    print(f"time to first request, gunicorn workers={args.workers}, runs={args.runs}")
+    summarize("cold", cold)
+    summarize("warm", warm)
+    summarize("import", imports)
+
+    if args.breakdown:
+        workdir = tempfile.mkdtemp()
+        try:
+            print(f"\nslowest imports (cumulative / self):")
+            for cumulative, own, module in slowest_imports(workdir, args.breakdown):
+                print(f"  {cumulative / 1000:8.1f}ms {own / 1000:8.1f}ms  {module}")
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
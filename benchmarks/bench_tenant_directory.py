@@ -0,0 +1,133 @@
+"""Preloaded tenant directory at scale: load time, memory and lookup latency
+
+Usage:
+    python benchmarks/bench_tenant_directory.py [--tenants 1000000] [--lookups 200000] [--updates 1000]
+
+Seeds a scratch SQLite database with active tenants that each own an app,
+then times TenantDirectory.load and measures what the entries cost with
+tracemalloc. Lookups by user_id and app_id are compared with the primary
+key / unique index reads they replace, and an incremental refresh is timed
+after touching --updates rows.
+"""
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+SCRATCH = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(SCRATCH, 'bench.db')}"
+os.environ.setdefault("COMETCHAT_APP_ID", "bench_app")
+os.environ.setdefault("COMETCHAT_API_KEY", "bench_key")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+from sqlalchemy import select
+
+from app.core.database import SessionLocal
+from app.core.init_db import init_db
+from app.models.tenant import Tenant
+from app.services.tenant_directory import TenantDirectory
+
+REGIONS = ["us", "eu", "in"]
+
+
+def seed(tenants: int, batch: int = 50_000):
+    """Insert tenants with plain sqlite3 so seeding is bounded by the indexes, not the ORM"""
+    rng = random.Random(7)
+    # Spread over the past hours so the refresh below only sees the rows it touches
+    start_at = datetime.utcnow() - timedelta(milliseconds=10 * tenants)
+    connection = sqlite3.connect(os.path.join(SCRATCH, "bench.db"))
+    started = time.perf_counter()
+    for offset in range(0, tenants, batch):
+        connection.executemany(
+            "INSERT INTO tenants (user_id, user_email, cometchat_app_id, cometchat_api_key, "
+            "cometchat_region, cometchat_log_level, created_at, updated_at, is_active) "
+            "VALUES (?, ?, ?, ?, ?, 'INFO', ?, ?, 1)",
+            [
+                (f"{i:08d}-0000-0000-0000-000000000000", f"tenant{i}@example.com",
+                 f"app_{i:08d}", f"{rng.getrandbits(160):040x}", rng.choice(REGIONS),
+                 stamp, stamp)
+                for i in range(offset, min(offset + batch, tenants))
+                for stamp in [(start_at + timedelta(milliseconds=10 * i)).isoformat(sep=" ")]
+            ]
+        )
+        connection.commit()
+    connection.close()
+    print(f"seeded {tenants} tenants in {time.perf_counter() - started:.1f}s")
+
+
+def per_lookup_ns(lookup, keys) -> float:
+    start = time.perf_counter()
+    for key in keys:
+        lookup(key)
+    return (time.perf_counter() - start) / len(keys) * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tenants", type=int, default=1_000_000)
+    parser.add_argument("--lookups", type=int, default=200_000)
+    parser.add_argument("--db-lookups", type=int, default=200)
+    parser.add_argument("--updates", type=int, default=1_000)
+    args = parser.parse_args()
+
+    init_db()
+    seed(args.tenants)
+    rng = random.Random(11)
+
+    directory = TenantDirectory()
+    started = time.perf_counter()
+    directory.load()
+    print(f"load: {len(directory)} tenants in {time.perf_counter() - started:.2f}s")
+
+    # A second load under tracemalloc (which slows it) to size the entries
+    directory = TenantDirectory()
+    tracemalloc.start()
+    directory.load()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"memory: {current / 2**20:.0f} MiB held ({current / len(directory):.0f} B/tenant), "
+          f"peak {peak / 2**20:.0f} MiB")
+
+    indexes = [rng.randrange(args.tenants) for _ in range(args.lookups)]
+    user_ids = [f"{i:08d}-0000-0000-0000-000000000000" for i in indexes]
+    app_ids = [f"app_{i:08d}" for i in indexes]
+    print(f"{'lookup':<22} {'ns/lookup':>12}")
+    print(f"{'directory user_id':<22} {per_lookup_ns(directory.by_user_id, user_ids):>12.0f}")
+    print(f"{'directory app_id':<22} {per_lookup_ns(directory.by_app_id, app_ids):>12.0f}")
+    print(f"{'+ decrypt credentials':<22} "
+          f"{per_lookup_ns(lambda user_id: directory.by_user_id(user_id).credentials, user_ids):>12.0f}")
+
+    with SessionLocal() as db:
+        columns = select(Tenant.user_id, Tenant.cometchat_app_id, Tenant.cometchat_api_key, Tenant.cometchat_region)
+        db_user_id = per_lookup_ns(
+            lambda user_id: db.execute(columns.where(Tenant.user_id == user_id)).first(), user_ids[:args.db_lookups]
+        )
+        db_app_id = per_lookup_ns(
+            lambda app_id: db.execute(columns.where(Tenant.cometchat_app_id == app_id)).first(), app_ids[:args.db_lookups]
+        )
+        print(f"{'database user_id':<22} {db_user_id:>12.0f}")
+        print(f"{'database app_id':<22} {db_app_id:>12.0f}")
+
+    touched = rng.sample(range(args.tenants), args.updates)
+    now = datetime.utcnow().isoformat(sep=" ")
+    connection = sqlite3.connect(os.path.join(SCRATCH, "bench.db"))
+    connection.executemany(
+        "UPDATE tenants SET cometchat_region = 'eu', updated_at = ? WHERE user_id = ?",
+        [(now, f"{i:08d}-0000-0000-0000-000000000000") for i in touched]
+    )
+    connection.commit()
+    connection.close()
+    started = time.perf_counter()
+    applied = directory.refresh()
+    print(f"refresh: {applied} changed rows applied in {(time.perf_counter() - started) * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
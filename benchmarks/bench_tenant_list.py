@@ -0,0 +1,107 @@
+"""Benchmark GET /api/v1/tenants?limit=1000 with and without FAST_JSON
+
+Usage:
+    python benchmarks/bench_tenant_list.py [--rows 1000] [--iterations 200]
+
+Each mode runs in its own subprocess because FAST_JSON is read at import time.
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def run_worker(rows: int, iterations: int):
+    """Seed a scratch database and time the list endpoint in this process"""
+    from fastapi.testclient import TestClient
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+
+    from app.core.database import Base, get_db
+    from app.main import app
+    from app.models.tenant import Tenant
+
+    db_path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    engine = create_engine(f"sqlite:///{db_path}", connect_args={"check_same_thread": False})
+    Session = sessionmaker(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    db = Session()
+    db.add_all(
+        Tenant(
+            user_first_name=f"First{i}",
+            user_last_name=f"Last{i}",
+            user_email=f"user{i}@example.com",
+            user_phone="+15550000000",
+            cometchat_app_id=f"app{i}",
+            cometchat_api_key="k" * 40,
+            extra_metadata={"plan": "pro", "seats": i},
+        )
+        for i in range(rows)
+    )
+    db.commit()
+    db.close()
+
+    def override_get_db():
+        session = Session()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    client = TestClient(app)
+    url = f"/api/v1/tenants?limit={rows}"
+
+    for _ in range(10):
+        client.get(url)
+
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        response = client.get(url)
+        samples.append(time.perf_counter() - start)
+        assert response.status_code == 200
+
+    samples.sort()
+    p50 = samples[len(samples) // 2] * 1000
+    p95 = samples[int(len(samples) * 0.95)] * 1000
+    print(f"{p50:.3f} {p95:.3f} {len(response.content)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args.rows, args.iterations)
+        return
+
+    print(f"GET /api/v1/tenants?limit={args.rows} ({args.iterations} iterations)")
+    for label, fast in (("default", "false"), ("fast_json", "true")):
+        env = dict(
+            os.environ,
+            FAST_JSON=fast,
+            LOG_LEVEL="WARNING",
+            COMETCHAT_APP_ID=os.environ.get("COMETCHAT_APP_ID", "bench_app"),
+            COMETCHAT_API_KEY=os.environ.get("COMETCHAT_API_KEY", "bench_key"),
+        )
+        output = subprocess.run(
+            [sys.executable, __file__, "--worker", "--rows", str(args.rows),
+             "--iterations", str(args.iterations)],
+            env=env, cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip().splitlines()[-1]
+        p50, p95, size = output.split()
+        print(f"  {label:<10} p50={p50}ms p95={p95}ms body={size}B")
+
+
+if __name__ == "__main__":
+    main()
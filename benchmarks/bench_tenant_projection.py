@@ -0,0 +1,101 @@
+"""Memory/latency benchmark: full Tenant entities vs column-projected rows
+
+Usage:
+    python benchmarks/bench_tenant_projection.py [--rows 100000]
+
+Compares the pre-projection read path (entities with credentials loaded,
+validated through TenantResponse.from_attributes) with the projected path
+used by list_tenants (TENANT_RESPONSE_COLUMNS rows turned into dicts).
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("COMETCHAT_APP_ID", "bench_app")
+os.environ.setdefault("COMETCHAT_API_KEY", "bench_key")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker, undefer_group
+
+from app.core.database import Base
+from app.models.tenant import Tenant, TENANT_RESPONSE_COLUMNS
+from app.schemas.tenant import TenantResponse
+
+
+def seed(Session, rows: int):
+    """Insert synthetic tenants with realistic secret sizes"""
+    secret = "s" * 64
+    batch = []
+    with Session() as db:
+        for i in range(rows):
+            batch.append({
+                "user_id": f"{i:036d}",
+                "user_first_name": f"First{i}",
+                "user_last_name": f"Last{i}",
+                "user_email": f"user{i}@example.com",
+                "user_phone": "+15550000000",
+                "cometchat_app_id": f"app{i}",
+                "cometchat_api_key": secret,
+                "cometchat_account_key": f"acct{i}",
+                "cometchat_account_secret": secret,
+                "cometchat_auth_key": secret,
+                "cometchat_region": "us",
+                "cometchat_log_level": "INFO",
+                "extra_metadata": {"plan": "pro"},
+                "is_active": True,
+            })
+            if len(batch) == 10000:
+                db.execute(insert(Tenant), batch)
+                batch.clear()
+        if batch:
+            db.execute(insert(Tenant), batch)
+        db.commit()
+
+
+def measure(label: str, fn):
+    """Time one run untraced, then record peak allocations in a traced run"""
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    del result
+
+    tracemalloc.start()
+    result = fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"  {label:<12} {elapsed * 1000:9.1f}ms  peak={peak / 1024 / 1024:7.1f}MiB  rows={len(result)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100000)
+    args = parser.parse_args()
+
+    db_path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    engine = create_engine(f"sqlite:///{db_path}")
+    Session = sessionmaker(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    seed(Session, args.rows)
+
+    def full_entities():
+        with Session() as db:
+            tenants = db.query(Tenant).options(undefer_group("credentials")).all()
+            return [TenantResponse.model_validate(t) for t in tenants]
+
+    def projected_rows():
+        with Session() as db:
+            rows = [row._asdict() for row in db.query(*TENANT_RESPONSE_COLUMNS)]
+            return [TenantResponse.model_validate(r) for r in rows]
+
+    print(f"Loading {args.rows} tenants")
+    measure("entities", full_entities)
+    measure("projected", projected_rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Tenant search latency at scale: FTS5 index vs LIKE fallback
+
+Usage:
+    python benchmarks/bench_tenant_search.py [--tenants 1000000] [--iterations 50]
+
+Seeds a scratch SQLite database through the real migrations, so rows are
+indexed by the same triggers production uses. Then it times
+search_tenants for name, email, phone and multi-word queries, first with
+the FTS5 index and then with the substring fallback.
+"""
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+SCRATCH = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(SCRATCH, 'bench.db')}"
+os.environ.setdefault("COMETCHAT_APP_ID", "bench_app")
+os.environ.setdefault("COMETCHAT_API_KEY", "bench_key")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+from app.core.database import SessionLocal
+from app.core.init_db import init_db
+from app.services import tenant_search
+
+FIRST = ["Ada", "Grace", "Margaret", "Hedy", "Alan", "Edsger", "Barbara", "Donald", "Frances", "Ken",
+         "Radia", "Tim", "Sophie", "John", "Katherine", "Dennis", "Lynn", "Leslie", "Shafi", "Yukihiro"]
+LAST = ["Lovelace", "Hopper", "Hamilton", "Lamarr", "Turing", "Dijkstra", "Liskov", "Knuth", "Allen",
+        "Thompson", "Perlman", "Berners", "Wilson", "McCarthy", "Johnson", "Ritchie", "Conway", "Lamport"]
+DOMAINS = ["example.com", "mail.example", "corp.example", "apollo.example", "films.example"]
+
+QUERIES = ["marg", "hopper", "grace hop", "apollo", "555-0142", "lovelace example", "ada", "zz"]
+
+
+def seed(tenants: int, batch: int = 50_000):
+    """Insert tenants with plain sqlite3 so seeding is bounded by the index, not the ORM"""
+    rng = random.Random(7)
+    now = datetime.utcnow().isoformat(sep=" ")
+    connection = sqlite3.connect(os.path.join(SCRATCH, "bench.db"))
+    started = time.perf_counter()
+    for offset in range(0, tenants, batch):
+        rows = []
+        for i in range(offset, min(offset + batch, tenants)):
+            first, last = rng.choice(FIRST), rng.choice(LAST)
+            rows.append((
+                f"{i:08d}-0000-0000-0000-000000000000", first, last,
+                f"{first.lower()}.{last.lower()}{i}@{rng.choice(DOMAINS)}",
+                f"+1 {rng.randint(200, 999)}-555-{rng.randint(0, 9999):04d}", now, now
+            ))
+        connection.executemany(
+            "INSERT INTO tenants (user_id, user_first_name, user_last_name, user_email, user_phone, "
+            "cometchat_region, cometchat_log_level, created_at, updated_at, is_active) "
+            "VALUES (?, ?, ?, ?, ?, 'us', 'INFO', ?, ?, 1)",
+            rows
+        )
+        connection.commit()
+    connection.execute("INSERT INTO tenants_fts(tenants_fts) VALUES ('optimize')")
+    connection.commit()
+    connection.close()
+    print(f"seeded {tenants} tenants in {time.perf_counter() - started:.1f}s")
+
+
+def time_query(q: str, iterations: int, limit: int):
+    samples = []
+    with SessionLocal() as db:
+        for _ in range(iterations):
+            start = time.perf_counter()
+            rows = tenant_search.search_tenants(db, q, limit)
+            samples.append(time.perf_counter() - start)
+    samples.sort()
+    return samples[len(samples) // 2] * 1000, samples[int(len(samples) * 0.95)] * 1000, len(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tenants", type=int, default=1_000_000)
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--fallback-iterations", type=int, default=3)
+    args = parser.parse_args()
+
+    init_db()
+    seed(args.tenants)
+
+    for mode, iterations in (("fts5", args.iterations), ("like", args.fallback_iterations)):
+        tenant_search._fts_enabled = None if mode == "fts5" else False
+        print(f"\n{mode} (limit={args.limit})")
+        print(f"  {'query':<18} {'p50_ms':>9} {'p95_ms':>9} {'rows':>5}")
+        for q in QUERIES:
+            p50, p95, rows = time_query(q, iterations, args.limit)
+            print(f"  {q:<18} {p50:>9.2f} {p95:>9.2f} {rows:>5}")
+
+
+if __name__ == "__main__":
+    main()
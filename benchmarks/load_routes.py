@@ -0,0 +1,169 @@
+"""Per-route latency/throughput harness against the fake CometChat server
+
+Starts test/fake_cometchat.py and the service (uvicorn) as subprocesses with
+the service pointed at the fake, then drives each route at a fixed
+concurrency and prints p50/p95/p99 latency, throughput and error counts.
+
+Usage:
+    python benchmarks/load_routes.py [--concurrency 32] [--duration 10] \
+        [--latency-ms 40] [--error-rate 0.0] [--throttle-rate 0.0] [--route webhooks]
+
+Pass --service-url to drive an already running deployment instead (the fake
+is then not started and the deployment must be configured separately).
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from typing import Callable, Dict, Tuple
+
+import httpx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# name -> (method, path, body factory)
+ROUTES: Dict[str, Tuple[str, str, Callable[[], dict]]] = {
+    "webhooks": ("POST", "/api/v1/webhooks", lambda: {
+        "webhook_id": f"wh_{uuid.uuid4().hex[:12]}",
+        "name": "Load test webhook",
+        "url": "https://example.com/hook",
+    }),
+    "roles": ("POST", "/api/v1/roles", lambda: {
+        "role": f"role_{uuid.uuid4().hex[:12]}",
+        "name": "Load test role",
+    }),
+    "apps": ("POST", "/api/v1/apps", lambda: {"name": f"app-{uuid.uuid4().hex[:8]}", "region": "us"}),
+    "tenants_list": ("GET", "/api/v1/tenants?limit=100", lambda: None),
+    "health_ready": ("GET", "/health/ready", lambda: None),
+}
+
+
+def percentile(samples, fraction: float) -> float:
+    if not samples:
+        return 0.0
+    return samples[min(len(samples) - 1, int(len(samples) * fraction))]
+
+
+async def wait_ready(url: str, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                await client.get(url)
+                return
+            except httpx.TransportError:
+                await asyncio.sleep(0.2)
+    raise RuntimeError(f"{url} did not become ready")
+
+
+async def drive_route(base_url: str, name: str, concurrency: int, duration: float):
+    method, path, body = ROUTES[name]
+    latencies = []
+    statuses: Dict[int, int] = {}
+    stop_at = time.monotonic() + duration
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60.0) as client:
+        async def user():
+            while time.monotonic() < stop_at:
+                start = time.perf_counter()
+                try:
+                    response = await client.request(method, path, json=body())
+                    code = response.status_code
+                except httpx.TransportError:
+                    code = 0
+                latencies.append(time.perf_counter() - start)
+                statuses[code] = statuses.get(code, 0) + 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(user() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    ok = sum(n for code, n in statuses.items() if 200 <= code < 300)
+    print(
+        f"  {name:<14} rps={ok / elapsed:8.1f}  "
+        f"p50={percentile(latencies, 0.50) * 1000:7.1f}ms  "
+        f"p95={percentile(latencies, 0.95) * 1000:7.1f}ms  "
+        f"p99={percentile(latencies, 0.99) * 1000:7.1f}ms  "
+        f"statuses={dict(sorted(statuses.items()))}"
+    )
+
+
+def start_stack(args) -> Tuple[str, list]:
+    """Start the fake CometChat server and the service; returns (service url, processes)"""
+    fake_url = f"http://127.0.0.1:{args.fake_port}"
+    service_url = f"http://127.0.0.1:{args.service_port}"
+    workdir = tempfile.mkdtemp()
+
+    fake = subprocess.Popen(
+        [sys.executable, os.path.join(ROOT, "test", "fake_cometchat.py"),
+         "--port", str(args.fake_port),
+         "--latency-ms", str(args.latency_ms),
+         "--jitter-ms", str(args.jitter_ms),
+         "--error-rate", str(args.error_rate),
+         "--throttle-rate", str(args.throttle_rate)],
+        cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    env = dict(
+        os.environ,
+        PYTHONPATH=ROOT,
+        LOG_LEVEL="WARNING",
+        COMETCHAT_APP_ID="load_app",
+        COMETCHAT_API_KEY="load_key",
+        COMETCHAT_AUTH_KEY="load_auth_key",
+        COMETCHAT_AUTH_SECRET="load_auth_secret",
+        COMETCHAT_API_BASE_URL=f"{fake_url}/v3",
+        COMETCHAT_MGMT_BASE_URL=fake_url,
+        DATABASE_URL=f"sqlite:///{os.path.join(workdir, 'load.db')}",
+    )
+    service = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app",
+         "--port", str(args.service_port), "--log-level", "warning"],
+        cwd=workdir, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    asyncio.run(wait_ready(f"{fake_url}/__config"))
+    asyncio.run(wait_ready(f"{service_url}/health"))
+    return service_url, [service, fake]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--route", action="append", choices=sorted(ROUTES), help="repeatable; default all")
+    parser.add_argument("--latency-ms", type=float, default=40.0)
+    parser.add_argument("--jitter-ms", type=float, default=10.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--fake-port", type=int, default=9000)
+    parser.add_argument("--service-port", type=int, default=8001)
+    parser.add_argument("--service-url", help="drive an existing deployment")
+    args = parser.parse_args()
+
+    processes = []
+    if args.service_url:
+        service_url = args.service_url
+    else:
+        service_url, processes = start_stack(args)
+
+    try:
+        print(
+            f"concurrency={args.concurrency} duration={args.duration}s "
+            f"upstream latency={args.latency_ms}ms±{args.jitter_ms} "
+            f"errors={args.error_rate} throttle={args.throttle_rate}"
+        )
+        for name in args.route or list(ROUTES):
+            asyncio.run(drive_route(service_url, name, args.concurrency, args.duration))
+    finally:
+        for process in processes:
+            process.terminate()
+            process.wait()
+
+
+if __name__ == "__main__":
+    main()
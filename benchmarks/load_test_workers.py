@@ -0,0 +1,116 @@
+"""Multi-worker scaling load test
+
+Starts gunicorn with 1..N workers against a scratch SQLite database, drives
+GET /api/v1/tenants at fixed concurrency and reports throughput plus scaling
+efficiency relative to a single worker.
+
+Usage:
+    python benchmarks/load_test_workers.py [--max-workers 4] [--duration 10]
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+async def wait_ready(base_url: str, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get(f"{base_url}/health")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError("server did not become ready")
+
+
+async def seed(base_url: str, tenants: int):
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        for i in range(tenants):
+            await client.post("/api/v1/tenants", json={"user_email": f"load{i}@example.com"})
+
+
+async def drive(base_url: str, path: str, concurrency: int, duration: float) -> tuple[int, int]:
+    """Hammer `path` with `concurrency` clients; returns (ok, errors)"""
+    ok = errors = 0
+    stop_at = time.monotonic() + duration
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30.0) as client:
+        async def user():
+            nonlocal ok, errors
+            while time.monotonic() < stop_at:
+                try:
+                    response = await client.get(path)
+                    if response.status_code == 200:
+                        ok += 1
+                    else:
+                        errors += 1
+                except httpx.TransportError as e:
+                    errors += 1
+
+        await asyncio.gather(*(user() for _ in range(concurrency)))
+    return ok, errors
+
+
+def run_level(workers: int, args) -> float:
+    workdir = tempfile.mkdtemp()
+    port = args.port
+    env = dict(
+        os.environ,
+        PYTHONPATH=ROOT,
+        WEB_CONCURRENCY=str(workers),
+        BIND=f"127.0.0.1:{port}",
+        LOG_LEVEL="WARNING",
+        COMETCHAT_APP_ID=os.environ.get("COMETCHAT_APP_ID", "load_app"),
+        COMETCHAT_API_KEY=os.environ.get("COMETCHAT_API_KEY", "load_key"),
+    )
+    # Run from a scratch directory so the relative SQLite path lands there
+    server = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", os.path.join(ROOT, "gunicorn.conf.py"), "app.main:app"],
+        cwd=workdir, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        asyncio.run(wait_ready(base_url))
+        asyncio.run(seed(base_url, args.tenants))
+        ok, errors = asyncio.run(drive(base_url, args.path, args.concurrency, args.duration))
+    finally:
+        server.terminate()
+        server.wait()
+    rps = ok / args.duration
+    print(f"  workers={workers:<3} rps={rps:9.1f} ok={ok} errors={errors}")
+    return rps
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--max-workers", type=int, default=multiprocessing.cpu_count())
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--tenants", type=int, default=200)
+    parser.add_argument("--path", default="/api/v1/tenants?limit=50")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    print(f"GET {args.path} concurrency={args.concurrency} duration={args.duration}s")
+    baseline = None
+    for workers in range(1, args.max_workers + 1):
+        rps = run_level(workers, args)
+        baseline = baseline or rps
+        if baseline:
+            print(f"    scaling efficiency {rps / (baseline * workers):.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,24 @@
+"""Gunicorn configuration for multi-worker deployments"""
+import multiprocessing
+import os
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+worker_class = "uvicorn.workers.UvicornWorker"
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "60"))
+graceful_timeout = 30
+keepalive = 5
+
+# Workers read this back through Settings to split shared budgets
+# (e.g. COMETCHAT_RATE_LIMIT_PER_MINUTE) between themselves
+os.environ["WEB_CONCURRENCY"] = str(workers)
+
+
+def on_starting(server):
+    """Migrate the schema once in the master so workers do not race on DDL"""
+    from app.core.database import engine
+    from app.core.init_db import init_db
+
+    init_db()
+    # Never share pooled connections with forked workers
+    engine.dispose()
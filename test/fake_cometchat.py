@@ -0,0 +1,199 @@
+"""Local stand-in for the CometChat REST and management APIs
+
+Serves the endpoints CometChatClient talks to, keeps state in memory per app,
+and injects latency, server errors and 429 throttling on demand.
+
+Run:
+    python test/fake_cometchat.py --port 9000 --latency-ms 40 --error-rate 0.01 --throttle-rate 0.02
+
+Point the service at it:
+    COMETCHAT_API_BASE_URL=http://127.0.0.1:9000/v3
+    COMETCHAT_MGMT_BASE_URL=http://127.0.0.1:9000
+
+Behaviour can also be changed at runtime with POST /__config, e.g.
+    {"latency_ms": 200, "throttle_rate": 0.5}
+"""
+import argparse
+import asyncio
+import random
+import uuid
+from collections import defaultdict
+from typing import Any, Dict, Optional
+
+from fastapi import Body, Depends, FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+
+class FakeConfig(BaseModel):
+    """Injected upstream behaviour"""
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    throttle_rate: float = 0.0
+    retry_after: int = 1
+
+
+config = FakeConfig()
+app = FastAPI(title="Fake CometChat API")
+
+# app_id -> resource id -> resource
+webhooks: Dict[str, Dict[str, Dict[str, Any]]] = defaultdict(dict)
+roles: Dict[str, Dict[str, Dict[str, Any]]] = defaultdict(dict)
+apps: Dict[str, Dict[str, Any]] = {}
+calls: Dict[str, int] = defaultdict(int)
+
+
+class UpstreamFault(Exception):
+    def __init__(self, status_code: int, headers: Optional[Dict[str, str]] = None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+@app.exception_handler(UpstreamFault)
+async def upstream_fault_handler(request: Request, exc: UpstreamFault):
+    code = "ERR_TOO_MANY_REQUESTS" if exc.status_code == 429 else "ERR_INTERNAL"
+    return JSONResponse(
+        status_code=exc.status_code,
+        headers=exc.headers,
+        content={"error": {"code": code, "message": "Injected fault"}}
+    )
+
+
+async def simulate(request: Request) -> str:
+    """Apply latency/fault injection and return the calling app id"""
+    calls[f"{request.method} {request.url.path}"] += 1
+    delay = config.latency_ms + random.uniform(0, config.jitter_ms)
+    if delay:
+        await asyncio.sleep(delay / 1000)
+    if random.random() < config.throttle_rate:
+        raise UpstreamFault(429, {"Retry-After": str(config.retry_after)})
+    if random.random() < config.error_rate:
+        raise UpstreamFault(500)
+    return request.headers.get("onBehalfOf") or request.headers.get("apikey") or "default"
+
+
+def conflict(message: str):
+    raise HTTPException(status_code=409, detail={"code": "ERR_ALREADY_EXISTS", "message": message})
+
+
+def not_found(message: str):
+    raise HTTPException(status_code=404, detail={"code": "ERR_NOT_FOUND", "message": message})
+
+
+@app.post("/v3/webhooks")
+async def create_webhook(payload: Dict[str, Any] = Body(...), app_id: str = Depends(simulate)):
+    if payload["id"] in webhooks[app_id]:
+        conflict(f"Webhook {payload['id']} already exists")
+    webhooks[app_id][payload["id"]] = payload
+    return {"data": payload}
+
+
+@app.get("/v3/webhooks")
+async def list_webhooks(app_id: str = Depends(simulate)):
+    return {"data": list(webhooks[app_id].values())}
+
+
+@app.put("/v3/webhooks/{webhook_id}")
+async def update_webhook(webhook_id: str, payload: Dict[str, Any] = Body(...), app_id: str = Depends(simulate)):
+    if webhook_id not in webhooks[app_id]:
+        not_found(f"Webhook {webhook_id} not found")
+    webhooks[app_id][webhook_id].update(payload)
+    return {"data": webhooks[app_id][webhook_id]}
+
+
+@app.post("/v3/roles")
+async def create_role(payload: Dict[str, Any] = Body(...), app_id: str = Depends(simulate)):
+    if payload["role"] in roles[app_id]:
+        conflict(f"Role {payload['role']} already exists")
+    roles[app_id][payload["role"]] = payload
+    return {"data": payload}
+
+
+@app.get("/v3/roles")
+async def list_roles(app_id: str = Depends(simulate)):
+    return {"data": list(roles[app_id].values())}
+
+
+@app.put("/v3/roles/{role}")
+async def update_role(role: str, payload: Dict[str, Any] = Body(...), app_id: str = Depends(simulate)):
+    if role not in roles[app_id]:
+        not_found(f"Role {role} not found")
+    roles[app_id][role].update(payload)
+    return {"data": roles[app_id][role]}
+
+
+@app.get("/v3/appSettings")
+async def app_settings(app_id: str = Depends(simulate)):
+    return {"data": {"appId": app_id}}
+
+
+@app.post("/apps")
+async def create_app(payload: Dict[str, Any] = Body(...), _: str = Depends(simulate)):
+    app_id = uuid.uuid4().hex[:16]
+    apps[app_id] = {
+        "appId": app_id,
+        "name": payload.get("name"),
+        "region": payload.get("region", "us"),
+        "apiKey": uuid.uuid4().hex,
+        "authKey": uuid.uuid4().hex,
+    }
+    return {"data": apps[app_id]}
+
+
+@app.api_route("/v3/{path:path}", methods=["GET", "POST", "PUT", "DELETE"])
+async def catch_all(path: str, _: str = Depends(simulate)):
+    """Answer anything else (e.g. connection warm-up probes) with an empty body"""
+    return {"data": {}}
+
+
+@app.get("/__config")
+async def get_config():
+    return config
+
+
+@app.post("/__config")
+async def set_config(update: Dict[str, Any] = Body(...)):
+    global config
+    config = config.model_copy(update=update)
+    return config
+
+
+@app.get("/__stats")
+async def stats():
+    return {"calls": calls, "apps": len(apps)}
+
+
+@app.post("/__reset")
+async def reset():
+    webhooks.clear()
+    roles.clear()
+    apps.clear()
+    calls.clear()
+    return {"status": "reset"}
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    global config
+    config = FakeConfig(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+    )
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
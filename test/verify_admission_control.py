@@ -0,0 +1,68 @@
+"""Verify admission control: bounded queueing, 503 shedding and health bypass"""
+import sys
+import os
+import asyncio
+import tempfile
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+# Mock env vars
+os.environ["COMETCHAT_APP_ID"] = "mock_app_id"
+os.environ["COMETCHAT_API_KEY"] = "mock_api_key"
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'verify.db')}"
+os.environ["ADMISSION_UPSTREAM_LIMIT"] = "1"
+os.environ["ADMISSION_UPSTREAM_QUEUE"] = "0"
+
+
+async def check_gate():
+    from app.core.admission import AdmissionGate
+
+    gate = AdmissionGate("test", limit=1, queue_size=1, queue_timeout=0.2)
+    assert await gate.acquire()
+    queued = asyncio.create_task(gate.acquire())
+    await asyncio.sleep(0)
+    assert not await gate.acquire(), "request beyond the queue was admitted"
+    gate.release()
+    assert await queued, "queued request was not handed the slot"
+    assert not await gate.acquire(), "queued request did not time out"
+    gate.release()
+    assert gate.stats() == {"limit": 1, "in_flight": 0, "queued": 0, "shed": 2}, gate.stats()
+
+
+try:
+    asyncio.run(check_gate())
+    print("SUCCESS: gate queues FIFO, sheds past the queue and times out waiters")
+
+    from fastapi.testclient import TestClient
+    from app.core.admission import upstream_gate
+    from app.main import app
+
+    with TestClient(app) as client:
+        # Hold the only upstream slot, as a slow CometChat call would
+        client.portal.call(upstream_gate.acquire)
+
+        response = client.post("/api/v1/roles/admin")
+        if response.status_code != 503 or response.headers.get("retry-after") != "1":
+            print(f"FAILURE: expected 503 with Retry-After, got {response.status_code}")
+            sys.exit(1)
+        print("SUCCESS: CometChat route shed with 503 + Retry-After")
+
+        if client.get("/health").status_code != 200:
+            print("FAILURE: health check was not bypassed")
+            sys.exit(1)
+        if client.get("/api/v1/tenants").status_code != 200:
+            print("FAILURE: tenant routes share the CometChat budget")
+            sys.exit(1)
+        print("SUCCESS: health and DB-only routes unaffected")
+
+        upstream_gate.release()
+        if upstream_gate.stats()["in_flight"] != 0:
+            print(f"FAILURE: slot not returned: {upstream_gate.stats()}")
+            sys.exit(1)
+
+    print("Verification script completed successfully")
+
+except Exception as e:
+    print(f"FAILURE: An error occurred: {e}")
+    sys.exit(1)
@@ -0,0 +1,124 @@
+"""Verify async app provisioning jobs (202 Accepted + status polling)"""
+import sys
+import os
+import tempfile
+import time
+from unittest.mock import patch, AsyncMock
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+# Mock env vars
+os.environ["COMETCHAT_APP_ID"] = "mock_app_id"
+os.environ["COMETCHAT_API_KEY"] = "mock_api_key"
+os.environ["COMETCHAT_AUTH_KEY"] = "mock_auth_key"
+os.environ["COMETCHAT_AUTH_SECRET"] = "mock_auth_secret"
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'verify.db')}"
+# Aggressive recovery, so a job outliving the stale window is exercised quickly
+os.environ["JOB_STALE_AFTER_SECONDS"] = "1"
+os.environ["JOB_HEARTBEAT_INTERVAL_SECONDS"] = "0.2"
+os.environ["JOB_POLL_INTERVAL_SECONDS"] = "0.2"
+
+try:
+    import asyncio
+    from datetime import datetime, timedelta
+    from fastapi.testclient import TestClient
+    from app.core.database import SessionLocal
+    from app.main import app
+    from app.models.job import Job
+    from app.services.jobs import job_runner
+    from app.utils.exceptions import CometChatAPIError
+
+    runs = []
+
+    async def slow_job(payload):
+        runs.append(payload["n"])
+        await asyncio.sleep(3)
+        return {"n": payload["n"]}
+
+    job_runner.register("verify_slow", slow_job)
+
+    def wait_for(client, job_id):
+        for _ in range(100):
+            job = client.get(f"/api/v1/jobs/{job_id}").json()
+            if job["status"] in ("succeeded", "failed"):
+                return job
+            time.sleep(0.05)
+        print(f"FAILURE: job {job_id} never finished")
+        sys.exit(1)
+
+    def wait_for_slow(client, job_id):
+        for _ in range(100):
+            job = client.get(f"/api/v1/jobs/{job_id}").json()
+            if job["status"] in ("succeeded", "failed"):
+                return job
+            time.sleep(0.1)
+        print(f"FAILURE: job {job_id} never finished")
+        sys.exit(1)
+
+    with TestClient(app) as client, \
+            patch("app.api.v1.apps.cometchat_client.create_app", new_callable=AsyncMock) as create_app:
+        create_app.return_value = {"data": {"appId": "abc123", "apiKeys": [{"apiKey": "secret-rest-key"}], "authKey": "secret-auth-key"}}
+
+        response = client.post("/api/v1/apps", params={"async_job": True}, json={"name": "Async App"})
+        if response.status_code != 202:
+            print(f"FAILURE: async create returned {response.status_code}")
+            sys.exit(1)
+        body = response.json()
+        print(f"SUCCESS: 202 Accepted with job {body['job_id']}")
+
+        job = wait_for(client, body["job_id"])
+        if job["status"] != "succeeded" or job["result"] != {"app_id": "abc123", "name": "Async App", "region": "us"}:
+            print(f"FAILURE: unexpected job state {job}")
+            sys.exit(1)
+        if "secret" in str(job):
+            print("FAILURE: app keys exposed in the job result")
+            sys.exit(1)
+        create_app.assert_awaited_once_with(name="Async App", region="us", case_sensitive=True)
+        print("SUCCESS: job executed and result stored")
+
+        create_app.side_effect = CometChatAPIError("quota exceeded", status_code=403)
+        job_id = client.post("/api/v1/apps", params={"async_job": True}, json={"name": "Bad"}).json()["job_id"]
+        job = wait_for(client, job_id)
+        if job["status"] != "failed" or job["result"]["status_code"] != 403:
+            print(f"FAILURE: unexpected failed job state {job}")
+            sys.exit(1)
+        print("SUCCESS: upstream failure recorded on job")
+
+        if client.get("/api/v1/jobs/does-not-exist").status_code != 404:
+            print("FAILURE: unknown job did not 404")
+            sys.exit(1)
+
+        # A healthy job running past the stale window is not handed out again
+        job = wait_for_slow(client, client.portal.call(job_runner.enqueue, "verify_slow", {"n": 1}))
+        if job["status"] != "succeeded" or runs != [1]:
+            print(f"FAILURE: long job ran {len(runs)} times: {job}")
+            sys.exit(1)
+        print("SUCCESS: heartbeat keeps a long job from being recovered")
+
+        # Jobs of a dead worker are retried until they run out of attempts
+        lost = datetime.utcnow() - timedelta(seconds=30)
+        with SessionLocal() as db:
+            retried, abandoned = (
+                Job(kind="verify_slow", payload={"n": n}, status="running", attempts=attempts,
+                    started_at=lost, heartbeat_at=lost)
+                for n, attempts in ((2, 1), (3, 3))
+            )
+            db.add_all([retried, abandoned])
+            db.commit()
+            retried_id, abandoned_id = retried.id, abandoned.id
+        job = wait_for(client, abandoned_id)
+        if job["status"] != "failed" or 3 in runs:
+            print(f"FAILURE: job out of attempts was retried: {job}")
+            sys.exit(1)
+        job = wait_for_slow(client, retried_id)
+        if job["status"] != "succeeded" or runs != [1, 2]:
+            print(f"FAILURE: lost job not recovered once: {job} {runs}")
+            sys.exit(1)
+        print("SUCCESS: lost jobs retried, exhausted ones failed")
+
+    print("Verification script completed successfully")
+
+except Exception as e:
+    print(f"FAILURE: An error occurred: {e}")
+    sys.exit(1)
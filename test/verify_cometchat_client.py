@@ -0,0 +1,80 @@
+"""Verify CometChatClient and the CometChat-backed routes against the local fake API"""
+import sys
+import os
+import tempfile
+import threading
+import time
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+FAKE_PORT = int(os.environ.get("FAKE_COMETCHAT_PORT", "9123"))
+FAKE_URL = f"http://127.0.0.1:{FAKE_PORT}"
+
+# Mock env vars
+os.environ["COMETCHAT_APP_ID"] = "mock_app_id"
+os.environ["COMETCHAT_API_KEY"] = "mock_api_key"
+os.environ["COMETCHAT_AUTH_KEY"] = "mock_auth_key"
+os.environ["COMETCHAT_AUTH_SECRET"] = "mock_auth_secret"
+os.environ["COMETCHAT_API_BASE_URL"] = f"{FAKE_URL}/v3"
+os.environ["COMETCHAT_MGMT_BASE_URL"] = FAKE_URL
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'verify.db')}"
+
+try:
+    import httpx
+    import uvicorn
+    from fastapi.testclient import TestClient
+    from fake_cometchat import app as fake_app
+    from app.core.init_db import init_db
+    from app.main import app
+
+    # The admin role comes from the stored template
+    init_db()
+
+    server = uvicorn.Server(uvicorn.Config(fake_app, host="127.0.0.1", port=FAKE_PORT, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+
+    client = TestClient(app)
+
+    response = client.post("/api/v1/webhooks", json={
+        "webhook_id": "verify_hook",
+        "name": "Verify",
+        "url": "https://example.com/hook",
+    })
+    if response.status_code != 201 or response.json()["data"]["data"]["id"] != "verify_hook":
+        print(f"FAILURE: webhook create returned {response.status_code}: {response.text}")
+        sys.exit(1)
+    print("SUCCESS: webhook created through fake API")
+
+    response = client.post("/api/v1/roles/admin")
+    if response.status_code != 201:
+        print(f"FAILURE: admin role create returned {response.status_code}")
+        sys.exit(1)
+    response = client.post("/api/v1/roles/admin")
+    if response.status_code != 409:
+        print(f"FAILURE: duplicate role returned {response.status_code}, expected 409")
+        sys.exit(1)
+    print("SUCCESS: role create and upstream conflict propagate")
+
+    response = client.post("/api/v1/apps", json={"name": "verify-app"})
+    if response.status_code != 201 or "appId" not in response.json()["data"]["data"]:
+        print(f"FAILURE: app create returned {response.status_code}")
+        sys.exit(1)
+    print("SUCCESS: app created through fake management API")
+
+    httpx.post(f"{FAKE_URL}/__config", json={"throttle_rate": 1.0})
+    response = client.post("/api/v1/roles", json={"role": "throttled", "name": "Throttled"})
+    httpx.post(f"{FAKE_URL}/__config", json={"throttle_rate": 0.0})
+    if response.status_code != 429:
+        print(f"FAILURE: throttled call returned {response.status_code}, expected 429")
+        sys.exit(1)
+    print("SUCCESS: upstream 429 surfaced to caller")
+
+    server.should_exit = True
+    print("Verification script completed successfully")
+
+except Exception as e:
+    print(f"FAILURE: An error occurred: {e}")
+    sys.exit(1)
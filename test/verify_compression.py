@@ -0,0 +1,84 @@
+"""Verify response compression: threshold, negotiation and streaming"""
+import sys
+import os
+import gzip
+import tempfile
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+# Mock env vars
+os.environ["COMETCHAT_APP_ID"] = "mock_app_id"
+os.environ["COMETCHAT_API_KEY"] = "mock_api_key"
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'verify.db')}"
+
+try:
+    from fastapi import FastAPI
+    from fastapi.responses import StreamingResponse
+    from fastapi.testclient import TestClient
+    from app.core.compression import CompressionMiddleware, negotiate
+    from app.main import app
+
+    if negotiate("gzip;q=0, br", ["gzip"]) is not None or negotiate("*", ["br", "gzip"]) != "br":
+        print("FAILURE: Accept-Encoding negotiation")
+        sys.exit(1)
+
+    with TestClient(app) as client:
+        for i in range(40):
+            client.post("/api/v1/tenants", json={"user_email": f"gzip{i}@example.com"})
+
+        response = client.get("/api/v1/tenants", headers={"Accept-Encoding": "gzip"})
+        if response.headers.get("content-encoding") != "gzip" or len(response.json()) != 40:
+            print(f"FAILURE: tenant list not gzipped: {dict(response.headers)}")
+            sys.exit(1)
+        if "Accept-Encoding" not in response.headers.get("vary", ""):
+            print("FAILURE: missing Vary: Accept-Encoding")
+            sys.exit(1)
+        print(f"SUCCESS: tenant list gzipped ({response.headers['content-length']} bytes on the wire)")
+
+        response = client.get("/health", headers={"Accept-Encoding": "gzip"})
+        if "content-encoding" in response.headers:
+            print("FAILURE: response below the threshold was compressed")
+            sys.exit(1)
+        if "Accept-Encoding" not in response.headers.get("vary", ""):
+            print("FAILURE: response below the threshold missing Vary: Accept-Encoding")
+            sys.exit(1)
+        response = client.get("/api/v1/tenants", headers={"Accept-Encoding": "identity"})
+        if "content-encoding" in response.headers:
+            print("FAILURE: compressed without an accepted coding")
+            sys.exit(1)
+        if "Accept-Encoding" not in response.headers.get("vary", ""):
+            print("FAILURE: uncompressed variant missing Vary: Accept-Encoding")
+            sys.exit(1)
+        print("SUCCESS: small and identity responses sent uncompressed")
+
+    # Streaming: chunks compressed incrementally once past the threshold
+    stream_app = FastAPI()
+
+    @stream_app.get("/stream")
+    def stream():
+        return StreamingResponse((f'{{"n":{i}}}\n' * 50 for i in range(20)), media_type="application/x-ndjson")
+
+    @stream_app.get("/short")
+    def short():
+        return StreamingResponse(iter(["tiny\n"]), media_type="text/plain")
+
+    plain = TestClient(CompressionMiddleware(stream_app, min_size=512, content_types=["application/", "text/"]))
+    with plain.stream("GET", "/stream", headers={"Accept-Encoding": "gzip"}) as response:
+        raw = b"".join(response.iter_raw())
+    if response.headers.get("content-encoding") != "gzip" or "content-length" in response.headers:
+        print(f"FAILURE: stream not compressed incrementally: {dict(response.headers)}")
+        sys.exit(1)
+    if gzip.decompress(raw).decode().count("\n") != 1000:
+        print("FAILURE: streamed body corrupted")
+        sys.exit(1)
+    if "content-encoding" in plain.get("/short", headers={"Accept-Encoding": "gzip"}).headers:
+        print("FAILURE: short stream was compressed")
+        sys.exit(1)
+    print("SUCCESS: streaming responses compressed past the threshold")
+
+    print("Verification script completed successfully")
+
+except Exception as e:
+    print(f"FAILURE: An error occurred: {e}")
+    sys.exit(1)
@@ -0,0 +1,96 @@
+"""Verify startup pre-warming, the shared CometChat connection pool and the DNS cache"""
+import sys
+import os
+import asyncio
+import tempfile
+import threading
+import time
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+FAKE_PORT = int(os.environ.get("FAKE_COMETCHAT_PORT", "9127"))
+FAKE_URL = f"http://localhost:{FAKE_PORT}"
+
+# Mock env vars
+os.environ["COMETCHAT_APP_ID"] = "mock_app_id"
+os.environ["COMETCHAT_API_KEY"] = "mock_api_key"
+os.environ["COMETCHAT_API_BASE_URL"] = f"{FAKE_URL}/v3"
+os.environ["COMETCHAT_MGMT_BASE_URL"] = FAKE_URL
+os.environ["COMETCHAT_PREWARM_CONNECTIONS"] = "3"
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'verify.db')}"
+
+
+async def check_dns_cache():
+    from app.core.http_client import DNSCache
+
+    cache = DNSCache(ttl=0.2)
+    first, second = await asyncio.gather(cache.resolve("localhost", 80), cache.resolve("localhost", 80))
+    expires = cache._entries[("localhost", 80)][0]
+    assert first == second and first, first
+    assert await cache.resolve("127.0.0.1", 80) == ["127.0.0.1"]
+    await asyncio.sleep(0.25)
+    await cache.resolve("localhost", 80)
+    assert cache._entries[("localhost", 80)][0] > expires, "expired entry was not refreshed"
+
+
+try:
+    import uvicorn
+    from fastapi.testclient import TestClient
+    from fake_cometchat import app as fake_app
+    from app.core.config import get_settings
+    from app.main import app, _prewarm_targets
+    from app.services.cometchat_client import cometchat_client
+
+    asyncio.run(check_dns_cache())
+    print("SUCCESS: DNS cache shares lookups, skips IP literals and honours its TTL")
+
+    server = uvicorn.Server(uvicorn.Config(fake_app, host="127.0.0.1", port=FAKE_PORT, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+
+    with TestClient(app) as client:
+        client.post("/api/v1/tenants", json={"user_email": "eu@example.com", "cometchat_app_id": "app-eu", "cometchat_region": "eu"})
+        client.post("/api/v1/tenants", json={"user_email": "none@example.com"})
+
+    if sorted(tuple(row) for row in _prewarm_targets()) != [("app-eu", "eu")]:
+        print(f"FAILURE: unexpected pre-warm targets {_prewarm_targets()}")
+        sys.exit(1)
+    settings = get_settings()
+    settings.COMETCHAT_API_BASE_URL = None
+    urls = cometchat_client.prewarm_urls(_prewarm_targets())
+    settings.COMETCHAT_API_BASE_URL = f"{FAKE_URL}/v3"
+    if "https://app-eu.api-eu.cometchat.io/" not in urls:
+        print(f"FAILURE: tenant regional host missing from {urls}")
+        sys.exit(1)
+    print("SUCCESS: pre-warm hosts driven by the tenants table")
+
+    with TestClient(app) as client:
+        pool = cometchat_client._client._transport._pool
+        if len(pool.connections) != 3:
+            print(f"FAILURE: expected 3 pre-warmed connections, found {len(pool.connections)}")
+            sys.exit(1)
+        if ("localhost", FAKE_PORT) not in cometchat_client.dns_cache._entries:
+            print("FAILURE: pre-warm did not populate the DNS cache")
+            sys.exit(1)
+        print("SUCCESS: lifespan pre-resolved and opened 3 pooled connections")
+
+        for i in range(5):
+            response = client.post("/api/v1/webhooks", json={
+                "webhook_id": f"warm_{i}", "name": "Warm", "url": "https://example.com/hook"
+            })
+            if response.status_code != 201:
+                print(f"FAILURE: webhook create returned {response.status_code}")
+                sys.exit(1)
+        if len(pool.connections) != 3:
+            print(f"FAILURE: calls opened new connections ({len(pool.connections)} pooled)")
+            sys.exit(1)
+        print("SUCCESS: API calls reuse the warm connections")
+
+    server.should_exit = True
+    print("Verification script completed successfully")
+
+except Exception as e:
+    print(f"FAILURE: An error occurred: {e}")
+    sys.exit(1)
@@ -1,22 +1,32 @@
 """Verify database connection and version"""
 import sys
 import os
+import tempfile
 from sqlalchemy import text
 
 # Add parent directory to path so we can import app
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+# Settings require CometChat credentials; check a scratch SQLite file unless DATABASE_URL is set
+os.environ.setdefault("COMETCHAT_APP_ID", "mock_app_id")
+os.environ.setdefault("COMETCHAT_API_KEY", "mock_api_key")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'verify.db')}")
+
 from app.core.database import SessionLocal
 
 def verify_db():
     print("Checking database connection...")
     db = SessionLocal()
     try:
-        # Check version (SQLite)
-        result = db.execute(text("SELECT sqlite_version()"))
+        # Check version for the configured backend
+        dialect = db.get_bind().dialect.name
+        if dialect == "sqlite":
+            result = db.execute(text("SELECT sqlite_version()"))
+        else:
+            result = db.execute(text("SELECT version()"))
         version = result.scalar()
         print(f"Database connected successfully!")
-        print(f"SQLite Version: {version}")
+        print(f"{dialect} version: {version}")
         
         # Dummy query
         db.execute(text("SELECT 1"))
@@ -24,6 +34,7 @@ def verify_db():
         
     except Exception as e:
         print(f"Database connection failed: {e}")
+        sys.exit(1)
     finally:
         db.close()
 
@@ -0,0 +1,111 @@
+"""Verify decoding of inbound CometChat deliveries from raw bytes and their verbatim storage"""
+import sys
+import os
+import json
+import tempfile
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+SCRATCH = tempfile.mkdtemp()
+
+# Mock env vars
+os.environ["COMETCHAT_APP_ID"] = "mock_app_id"
+os.environ["COMETCHAT_API_KEY"] = "mock_api_key"
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(SCRATCH, 'verify.db')}"
+os.environ["EVENT_ARCHIVE_DIR"] = os.path.join(SCRATCH, "archive")
+
+try:
+    from sqlalchemy import text
+    from fastapi.testclient import TestClient
+    from app.core.database import engine
+    from app.main import app
+    from app.services.event_decoding import EventDecodeError, decode_event
+    from app.services.event_processing import register_handler
+
+    MESSAGE = {
+        "trigger": "after_message",
+        "appId": "decode-app",
+        "region": "eu",
+        "webhook": "hook-1",
+        "data": {
+            "message": {
+                "id": "101",
+                "conversationId": "group_hikers",
+                "sender": "uid-1",
+                "receiverType": "group",
+                "receiver": "hikers",
+                "data": {"text": "héllo", "entities": {"sender": {"entity": {"uid": "uid-1"}}}},
+                "sentAt": 1700000000,
+                "updatedAt": 1700000005
+            }
+        }
+    }
+
+    event = decode_event(json.dumps(MESSAGE, ensure_ascii=False).encode())
+    expected = {
+        "trigger": "after_message", "app_id": "decode-app", "region": "eu", "webhook_id": "hook-1",
+        "message_id": "101", "conversation_id": "group_hikers", "sent_at": 1700000000, "updated_at": 1700000005
+    }
+    decoded = {field: getattr(event, field) for field in expected}
+    if decoded != expected or event.message["data"]["text"] != "héllo" or event.payload != MESSAGE:
+        print(f"FAILURE: unexpected routing fields {decoded}")
+        sys.exit(1)
+
+    event = decode_event(b'{"trigger": "user_connection_status_changed", "appId": 42, "data": {"user": {}}}')
+    if event.app_id != "42" or event.message is not None or event.message_id is not None or event.sent_at is not None:
+        print(f"FAILURE: non-message trigger decoded as {event!r}")
+        sys.exit(1)
+
+    for body in (b"{not json", b"[1, 2]", b'{"trigger": "after_message"}', b'{"appId": "a", "trigger": ""}', b"\xff\xfe"):
+        try:
+            decode_event(body)
+        except EventDecodeError:
+            continue
+        print(f"FAILURE: {body!r} decoded")
+        sys.exit(1)
+    print("SUCCESS: routing fields decoded, bad bodies rejected")
+
+    seen = []
+
+    async def record(event):
+        seen.append(event)
+
+    register_handler("after_message", record)
+
+    with TestClient(app) as client:
+        body = json.dumps(MESSAGE, ensure_ascii=False, indent=1).encode()
+        response = client.post("/api/v1/events", content=body, headers={"Content-Type": "application/json"})
+        if response.status_code != 202 or not response.json()["processed"]:
+            print(f"FAILURE: ingest returned {response.status_code}: {response.text}")
+            sys.exit(1)
+        if len(seen) != 1 or seen[0]["payload"] != MESSAGE or seen[0]["app_id"] != "decode-app":
+            print(f"FAILURE: handler saw {seen}")
+            sys.exit(1)
+
+        with engine.connect() as connection:
+            stored = connection.execute(
+                text("SELECT app_id, trigger, payload FROM events WHERE id = :id"), {"id": response.json()["event_id"]}
+            ).one()
+        if tuple(stored) != ("decode-app", "after_message", body.decode()):
+            print(f"FAILURE: payload not stored as delivered: {tuple(stored)}")
+            sys.exit(1)
+        print("SUCCESS: delivery stored verbatim and processed")
+
+        for body in (b"{not json", b"[]", b'{"appId": "decode-app"}'):
+            response = client.post("/api/v1/events", content=body, headers={"Content-Type": "application/json"})
+            if response.status_code != 422:
+                print(f"FAILURE: {body!r} returned {response.status_code}")
+                sys.exit(1)
+        if "requestBody" not in client.get("/openapi.json").json()["paths"]["/api/v1/events"]["post"]:
+            print("FAILURE: request body missing from the OpenAPI schema")
+            sys.exit(1)
+        print("SUCCESS: invalid deliveries answered 422")
+
+    print("SUCCESS: Event decoding verified")
+
+except Exception as e:
+    print(f"FAILURE: {e}")
+    import traceback
+    traceback.print_exc()
+    sys.exit(1)
@@ -0,0 +1,77 @@
+"""Verify admin profiling endpoints: CPU sampling, cProfile and tracemalloc diffs"""
+import sys
+import os
+import tempfile
+import threading
+import time
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+# Mock env vars
+os.environ["COMETCHAT_APP_ID"] = "mock_app_id"
+os.environ["COMETCHAT_API_KEY"] = "mock_api_key"
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'verify.db')}"
+os.environ["PROFILING_ENABLED"] = "true"
+os.environ["ADMIN_TOKEN"] = "verify-admin-token"
+
+ADMIN = {"X-Admin-Token": "verify-admin-token"}
+PREFIX = "/api/v1/admin/profiling"
+
+try:
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    def busy_loop(stop):
+        while not stop.is_set():
+            sum(i * i for i in range(1000))
+
+    with TestClient(app) as client:
+        if client.get(f"{PREFIX}/cpu", params={"seconds": 0.1}).status_code != 403:
+            print("FAILURE: profiling reachable without the admin token")
+            sys.exit(1)
+        if client.get(f"{PREFIX}/cpu", params={"seconds": 600}, headers=ADMIN).status_code != 400:
+            print("FAILURE: capture longer than PROFILING_MAX_SECONDS accepted")
+            sys.exit(1)
+        print("SUCCESS: admin token and duration cap enforced")
+
+        stop = threading.Event()
+        worker = threading.Thread(target=busy_loop, args=(stop,), name="busy-worker")
+        worker.start()
+        response = client.get(f"{PREFIX}/cpu", params={"seconds": 0.3}, headers=ADMIN)
+        stop.set()
+        worker.join()
+        stacks = [line for line in response.text.splitlines() if line.startswith("busy-worker;")]
+        if response.status_code != 200 or not any("busy_loop" in line for line in stacks):
+            print(f"FAILURE: sampled stacks missed the busy thread: {response.text[:300]}")
+            sys.exit(1)
+        if not all(line.rsplit(" ", 1)[1].isdigit() for line in response.text.splitlines()):
+            print("FAILURE: output is not in collapsed-stack format")
+            sys.exit(1)
+        print(f"SUCCESS: sampling captured {len(stacks)} distinct busy-worker stacks")
+
+        response = client.get(f"{PREFIX}/cpu", params={"seconds": 0.2, "mode": "cprofile"}, headers=ADMIN)
+        if response.status_code != 200 or "function calls" not in response.text:
+            print(f"FAILURE: cProfile capture returned {response.status_code}")
+            sys.exit(1)
+        print("SUCCESS: cProfile stats returned")
+
+        if client.get(f"{PREFIX}/memory", headers=ADMIN).status_code != 409:
+            print("FAILURE: snapshot without tracemalloc running did not 409")
+            sys.exit(1)
+        client.post(f"{PREFIX}/memory/start", headers=ADMIN)
+        first = client.get(f"{PREFIX}/memory", headers=ADMIN).json()
+        leak = [bytearray(1024) for _ in range(2000)]
+        second = client.get(f"{PREFIX}/memory", headers=ADMIN).json()
+        client.delete(f"{PREFIX}/memory", headers=ADMIN)
+        grew = [d for d in second["diff"] if "verify_profiling.py" in d["site"] and d["size_diff_bytes"] > 2_000_000]
+        if first["diff"] is not None or not grew:
+            print(f"FAILURE: tracemalloc diff did not show the allocation: {second['diff'][:3]}")
+            sys.exit(1)
+        print(f"SUCCESS: tracemalloc diff shows +{grew[0]['size_diff_bytes']} bytes at {grew[0]['site']}")
+
+    print("Verification script completed successfully")
+
+except Exception as e:
+    print(f"FAILURE: An error occurred: {e}")
+    sys.exit(1)
@@ -0,0 +1,198 @@
+"""Verify drift reconciliation of tenant app roles and webhooks against the local fake CometChat API"""
+import sys
+import os
+import tempfile
+import threading
+import time
+
+from cryptography.fernet import Fernet
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+FAKE_PORT = int(os.environ.get("FAKE_COMETCHAT_PORT", "9128"))
+FAKE_URL = f"http://127.0.0.1:{FAKE_PORT}"
+
+SCRATCH = tempfile.mkdtemp()
+
+# Mock env vars
+os.environ["COMETCHAT_APP_ID"] = "mock_app_id"
+os.environ["COMETCHAT_API_KEY"] = "mock_api_key"
+os.environ["COMETCHAT_API_BASE_URL"] = f"{FAKE_URL}/v3"
+os.environ["COMETCHAT_MGMT_BASE_URL"] = FAKE_URL
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(SCRATCH, 'verify.db')}"
+os.environ["EVENT_ARCHIVE_DIR"] = os.path.join(SCRATCH, "archive")
+os.environ["RECONCILE_BATCH_SIZE"] = "2"
+os.environ["CREDENTIAL_ENCRYPTION_KEYS"] = f'["{Fernet.generate_key().decode()}"]'
+
+try:
+    import copy
+    import httpx
+    import uvicorn
+    from fastapi.testclient import TestClient
+    from fake_cometchat import app as fake_app, roles as fake_roles, webhooks as fake_webhooks
+    from sqlalchemy import text
+    from app.core.crypto import cipher
+    from app.core.database import SessionLocal
+    from app.main import app
+    from app.services.cometchat_client import webhook_payload
+    from app.services.role_templates import ADMIN_ROLE
+
+    server = uvicorn.Server(uvicorn.Config(fake_app, host="127.0.0.1", port=FAKE_PORT, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+
+    HOOK = {"webhook_id": "events_hook", "name": "Events", "url": "https://example.com/hook"}
+    STORED_HOOK = webhook_payload(**HOOK)
+    desired = {"roles": ["admin"], "webhooks": [HOOK]}
+
+    def wait_for(client, job_id):
+        for _ in range(200):
+            job = client.get(f"/api/v1/jobs/{job_id}").json()
+            if job["status"] in ("succeeded", "failed"):
+                return job
+            time.sleep(0.05)
+        print(f"FAILURE: job {job_id} never finished")
+        sys.exit(1)
+
+    def reconcile(client, **overrides):
+        response = client.post("/api/v1/reconciliation", json={**desired, **overrides})
+        if response.status_code != 202:
+            print(f"FAILURE: reconcile returned {response.status_code}: {response.text}")
+            sys.exit(1)
+        job = wait_for(client, response.json()["job_id"])
+        if job["status"] != "succeeded":
+            print(f"FAILURE: reconcile job {job}")
+            sys.exit(1)
+        return job["result"]
+
+    def writes():
+        calls = httpx.get(f"{FAKE_URL}/__stats").json()["calls"]
+        return sum(count for call, count in calls.items() if call.startswith(("POST /v3", "PUT /v3")))
+
+    with TestClient(app) as client:
+        apps = {}
+        for name in ("synced", "drifted", "empty", "inactive"):
+            user_id = client.post("/api/v1/tenants", json={
+                "user_email": f"{name}@example.com",
+                "cometchat_app_id": f"app_{name}",
+                "cometchat_api_key": f"key_{name}"
+            }).json()["user_id"]
+            apps[name] = user_id
+        client.delete(f"/api/v1/tenants/{apps['inactive']}")
+        client.post("/api/v1/tenants", json={"user_email": "noapp@example.com"})
+
+        fake_roles["app_synced"]["admin"] = copy.deepcopy(ADMIN_ROLE)
+        fake_webhooks["app_synced"]["events_hook"] = dict(STORED_HOOK)
+        drifted_role = copy.deepcopy(ADMIN_ROLE)
+        drifted_role["settings"]["listUsers"] = "friends"
+        fake_roles["app_drifted"]["admin"] = drifted_role
+        fake_webhooks["app_drifted"]["legacy_hook"] = {"id": "legacy_hook", "name": "Legacy", "url": "https://old"}
+
+        for body, code in (
+            ({"roles": ["superuser"]}, 400),
+            ({"roles": [], "webhooks": []}, 400),
+            ({"concurrency": 0}, 422),
+        ):
+            if client.post("/api/v1/reconciliation", json=body).status_code != code:
+                print(f"FAILURE: invalid request {body} not rejected with {code}")
+                sys.exit(1)
+
+        # Dry run reports the drift and writes nothing
+        before = writes()
+        result = reconcile(client, concurrency=2)
+        if (result["apps"], result["in_sync"], result["drifted"], result["failed"]) != (3, 1, 2, 0):
+            print(f"FAILURE: unexpected dry-run counts {result}")
+            sys.exit(1)
+        if result["actions"] != {"planned": 4, "applied": 0, "failed": 0} or writes() != before:
+            print(f"FAILURE: dry run applied changes: {result['actions']}")
+            sys.exit(1)
+        plan = {
+            (report["user_id"], action["kind"], action["id"], action["action"])
+            for report in result["reports"] for action in report["actions"]
+        }
+        if plan != {
+            (apps["drifted"], "role", "admin", "update"),
+            (apps["drifted"], "webhook", "events_hook", "create"),
+            (apps["empty"], "role", "admin", "create"),
+            (apps["empty"], "webhook", "events_hook", "create"),
+        }:
+            print(f"FAILURE: unexpected plan {plan}")
+            sys.exit(1)
+        update = next(a for r in result["reports"] for a in r["actions"] if a["action"] == "update")
+        if update["changes"] != {"settings": ADMIN_ROLE["settings"]}:
+            print(f"FAILURE: update should carry only the differing fields: {update}")
+            sys.exit(1)
+        print(f"SUCCESS: dry run planned {result['actions']['planned']} actions at {result['apps_per_second']} apps/s")
+
+        # Applying converges every app and leaves unmanaged items alone
+        result = reconcile(client, dry_run=False)
+        if result["actions"] != {"planned": 0, "applied": 4, "failed": 0}:
+            print(f"FAILURE: unexpected apply result {result}")
+            sys.exit(1)
+        for app_id in ("app_synced", "app_drifted", "app_empty"):
+            if fake_roles[app_id]["admin"] != ADMIN_ROLE or fake_webhooks[app_id]["events_hook"] != STORED_HOOK:
+                print(f"FAILURE: {app_id} not converged")
+                sys.exit(1)
+        if "legacy_hook" not in fake_webhooks["app_drifted"] or "app_inactive" in fake_roles:
+            print("FAILURE: reconciliation touched items or apps outside the desired state")
+            sys.exit(1)
+        print("SUCCESS: apply converged all apps")
+
+        before = writes()
+        result = reconcile(client, dry_run=False)
+        if result["in_sync"] != 3 or result["reports"] or writes() != before or result["api_calls"] != 6:
+            print(f"FAILURE: converged apps were not left alone: {result}")
+            sys.exit(1)
+
+        result = reconcile(client, user_ids=[apps["empty"]])
+        if result["apps"] != 1:
+            print(f"FAILURE: user_ids filter ignored: {result}")
+            sys.exit(1)
+
+        # Webhook passwords reach CometChat but never the job row in plain text
+        secure = {**HOOK, "webhook_id": "secure_hook", "basic_auth": True, "username": "hook", "password": "s3cret"}
+        response = client.post("/api/v1/reconciliation", json={
+            "roles": [], "webhooks": [secure], "dry_run": False, "user_ids": [apps["empty"]]
+        })
+        job = wait_for(client, response.json()["job_id"])
+        with SessionLocal() as db:
+            stored = db.execute(text("SELECT payload FROM jobs WHERE id = :id"), {"id": job["id"]}).scalar()
+        if job["status"] != "succeeded" or fake_webhooks["app_empty"]["secure_hook"].get("password") != "s3cret":
+            print(f"FAILURE: webhook password not applied: {job}")
+            sys.exit(1)
+        if "s3cret" in str(stored):
+            print("FAILURE: webhook password stored in the job payload")
+            sys.exit(1)
+        response = client.post("/api/v1/reconciliation", json={"roles": [], "webhooks": [secure]})
+        with SessionLocal() as db:
+            stored = db.execute(text("SELECT payload FROM jobs WHERE id = :id"), {"id": response.json()["job_id"]}).scalar()
+        if "password" in str(stored):
+            print("FAILURE: dry run kept the webhook password")
+            sys.exit(1)
+        fernet, cipher._fernet = cipher._fernet, None
+        response = client.post("/api/v1/reconciliation", json={"roles": [], "webhooks": [secure], "dry_run": False})
+        cipher._fernet = fernet
+        if response.status_code != 400:
+            print(f"FAILURE: password accepted without encryption keys: {response.status_code}")
+            sys.exit(1)
+        print("SUCCESS: webhook passwords kept out of job rows")
+
+        # Upstream failures are reported per app without stopping the run
+        httpx.post(f"{FAKE_URL}/__config", json={"error_rate": 1.0})
+        result = reconcile(client)
+        httpx.post(f"{FAKE_URL}/__config", json={"error_rate": 0.0})
+        if result["failed"] != 3 or not all("error" in report for report in result["reports"]):
+            print(f"FAILURE: upstream errors not reported per app: {result}")
+            sys.exit(1)
+        print("SUCCESS: upstream failures reported per app")
+
+    server.should_exit = True
+    print("SUCCESS: Drift reconciliation verified")
+
+except Exception as e:
+    print(f"FAILURE: {e}")
+    import traceback
+    traceback.print_exc()
+    sys.exit(1)
@@ -0,0 +1,142 @@
+"""Verify request deadlines reach CometChat calls and abandoned requests are cancelled"""
+import sys
+import os
+import asyncio
+import tempfile
+import threading
+import time
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+FAKE_PORT = int(os.environ.get("FAKE_COMETCHAT_PORT", "9125"))
+FAKE_URL = f"http://127.0.0.1:{FAKE_PORT}"
+APP_PORT = FAKE_PORT + 1
+
+# Mock env vars
+os.environ["COMETCHAT_APP_ID"] = "mock_app_id"
+os.environ["COMETCHAT_API_KEY"] = "mock_api_key"
+os.environ["COMETCHAT_API_BASE_URL"] = f"{FAKE_URL}/v3"
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'verify.db')}"
+
+
+def serve(asgi_app, port):
+    import uvicorn
+    server = uvicorn.Server(uvicorn.Config(asgi_app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+
+async def check_timeout_budget():
+    from app.core import deadline
+    from app.services.cometchat_client import cometchat_client
+
+    token = deadline._deadline.set(time.monotonic() + 2.0)
+    try:
+        timeout = await cometchat_client._prepare_call()
+        assert timeout.read <= 2.0 and timeout.connect <= 2.0, timeout
+    finally:
+        deadline._deadline.reset(token)
+    assert (await cometchat_client._prepare_call()).read == 30.0
+
+
+async def check_raw_asgi():
+    from app.core.deadline import DeadlineMiddleware
+
+    async def echo(scope, receive, send):
+        body, more_body = b"", True
+        while more_body:
+            message = await receive()
+            body += message.get("body", b"")
+            more_body = message.get("more_body", False)
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        for chunk in (body, b"|", b"done"):
+            await asyncio.sleep(float(scope["query_string"] or 0))
+            await send({"type": "http.response.body", "body": chunk, "more_body": chunk != b"done"})
+
+    async def call(http_version, headers, messages, query=b""):
+        inbox, sent = list(messages), []
+        scope = {"type": "http", "http_version": http_version, "method": "POST", "path": "/echo",
+                 "headers": headers, "query_string": query}
+
+        async def receive():
+            if inbox:
+                return inbox.pop(0)
+            await asyncio.sleep(3600)
+
+        async def send(message):
+            sent.append(message)
+
+        await asyncio.wait_for(DeadlineMiddleware(echo)(scope, receive, send), 2)
+        return sent[0]["status"], b"".join(m.get("body", b"") for m in sent[1:])
+
+    chunked = [{"type": "http.request", "body": b"hel", "more_body": True}, {"type": "http.request", "body": b"lo"}]
+    assert await call("2", [], chunked) == (200, b"hello|done")
+    assert await call("1.1", [], [{"type": "http.request", "body": b""}]) == (200, b"|done")
+    # Deadline passes mid-stream: the response is finished, not truncated
+    streaming = await call("1.1", [(b"x-request-timeout", b"0.1")], [{"type": "http.request"}], b"0.08")
+    assert streaming == (200, b"|done"), streaming
+
+
+try:
+    import httpx
+    from fastapi.testclient import TestClient
+    from fake_cometchat import app as fake_app
+    from app.core.admission import upstream_gate
+    from app.main import app
+
+    asyncio.run(check_timeout_budget())
+    print("SUCCESS: per-call timeout derived from the remaining budget")
+
+    asyncio.run(check_raw_asgi())
+    print("SUCCESS: bodies without a length reach the app, started responses finish")
+
+    fake = serve(fake_app, FAKE_PORT)
+    httpx.post(f"{FAKE_URL}/__config", json={"latency_ms": 600})
+
+    with TestClient(app) as client:
+        start = time.perf_counter()
+        response = client.post("/api/v1/roles/admin", headers={"X-Request-Timeout": "0.2"})
+        elapsed = time.perf_counter() - start
+        if response.status_code != 504 or elapsed > 0.5:
+            print(f"FAILURE: expected a fast 504, got {response.status_code} after {elapsed:.2f}s")
+            sys.exit(1)
+        print(f"SUCCESS: deadline exceeded -> 504 after {elapsed:.2f}s")
+
+        deadline_at = str(time.time() + 5)
+        response = client.post(
+            "/api/v1/roles",
+            json={"role": "deadline", "name": "Deadline"},
+            headers={"X-Request-Deadline": deadline_at}
+        )
+        if response.status_code != 201:
+            print(f"FAILURE: call within its deadline returned {response.status_code}")
+            sys.exit(1)
+        print("SUCCESS: call within its deadline succeeds")
+
+    # A real server is needed to observe the client hanging up
+    server = serve(app, APP_PORT)
+    try:
+        httpx.post(
+            f"http://127.0.0.1:{APP_PORT}/api/v1/roles",
+            json={"role": "abandoned", "name": "Abandoned"},
+            timeout=0.2
+        )
+    except httpx.TimeoutException:
+        pass
+    time.sleep(0.2)
+    in_flight = upstream_gate.stats()["in_flight"]
+    if in_flight != 0:
+        print(f"FAILURE: abandoned request still holds an upstream slot ({in_flight})")
+        sys.exit(1)
+    print("SUCCESS: disconnected client's work cancelled")
+
+    server.should_exit = True
+    fake.should_exit = True
+    print("Verification script completed successfully")
+
+except Exception as e:
+    print(f"FAILURE: An error occurred: {e}")
+    sys.exit(1)
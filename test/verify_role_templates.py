@@ -0,0 +1,161 @@
+"""Verify stored role templates and their bulk rollout to tenant apps against the local fake CometChat API"""
+import sys
+import os
+import tempfile
+import threading
+import time
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+FAKE_PORT = int(os.environ.get("FAKE_COMETCHAT_PORT", "9129"))
+FAKE_URL = f"http://127.0.0.1:{FAKE_PORT}"
+
+SCRATCH = tempfile.mkdtemp()
+
+# Mock env vars
+os.environ["COMETCHAT_APP_ID"] = "mock_app_id"
+os.environ["COMETCHAT_API_KEY"] = "mock_api_key"
+os.environ["COMETCHAT_API_BASE_URL"] = f"{FAKE_URL}/v3"
+os.environ["COMETCHAT_MGMT_BASE_URL"] = FAKE_URL
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(SCRATCH, 'verify.db')}"
+os.environ["EVENT_ARCHIVE_DIR"] = os.path.join(SCRATCH, "archive")
+os.environ["COMETCHAT_APP_RATE_LIMIT_PER_MINUTE"] = "120"
+
+try:
+    import asyncio
+    import uvicorn
+    from sqlalchemy import event
+    from app.core.database import engine
+    from fastapi.testclient import TestClient
+    from fake_cometchat import app as fake_app, roles as fake_roles
+    from app.main import app
+    from app.services.cometchat_client import cometchat_client
+    from app.services.role_templates import ADMIN_ROLE
+
+    server = uvicorn.Server(uvicorn.Config(fake_app, host="127.0.0.1", port=FAKE_PORT, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+
+    MODERATOR = {
+        "role": "moderator",
+        "name": "Moderator",
+        "description": "Can moderate groups",
+        "metadata": {"accessLevel": 5},
+        "settings": {"listUsers": "all", "sendMessagesTo": "all"}
+    }
+
+    # Statements executed on the event loop thread instead of a worker thread
+    on_loop = []
+
+    def record_on_loop(conn, cursor, statement, parameters, context, executemany):
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        on_loop.append(statement)
+
+    def apply(client, name, **body):
+        response = client.post(f"/api/v1/roles/templates/{name}/apply", json=body)
+        if response.status_code != 202:
+            return response.status_code, None
+        job_id = response.json()["job_id"]
+        for _ in range(200):
+            job = client.get(f"/api/v1/jobs/{job_id}").json()
+            if job["status"] in ("succeeded", "failed"):
+                return 202, job["result"]
+            time.sleep(0.05)
+        print(f"FAILURE: rollout job {job_id} never finished")
+        sys.exit(1)
+
+    with TestClient(app) as client:
+        templates = client.get("/api/v1/roles/templates").json()
+        admin = {k: v for k, v in templates[0].items() if k in ADMIN_ROLE}
+        if [t["template"] for t in templates] != ["admin"] or admin != ADMIN_ROLE:
+            print(f"FAILURE: admin template not seeded: {templates}")
+            sys.exit(1)
+
+        response = client.put("/api/v1/roles/templates/moderator", json={**MODERATOR, "name": "Mod"})
+        if response.status_code != 201:
+            print(f"FAILURE: new template returned {response.status_code}: {response.text}")
+            sys.exit(1)
+        response = client.put("/api/v1/roles/templates/moderator", json=MODERATOR)
+        if response.status_code != 200 or response.json()["name"] != "Moderator":
+            print(f"FAILURE: replacing template returned {response.status_code}: {response.text}")
+            sys.exit(1)
+        if client.get("/api/v1/roles/templates/missing").status_code != 404:
+            print("FAILURE: missing template did not 404")
+            sys.exit(1)
+        print("SUCCESS: templates stored and listed")
+
+        ids = {}
+        for name, app_id in (("a", "app_a"), ("b", "app_b"), ("c", "app_c"), ("off", "app_off"), ("none", None)):
+            body = {"user_email": f"{name}@example.com"}
+            if app_id:
+                body.update(cometchat_app_id=app_id, cometchat_api_key=f"key_{name}")
+            ids[name] = client.post("/api/v1/tenants", json=body).json()["user_id"]
+        client.delete(f"/api/v1/tenants/{ids['off']}")
+        fake_roles["app_b"]["moderator"] = {"role": "moderator", "name": "Old moderator"}
+
+        event.listen(engine, "before_cursor_execute", record_on_loop)
+        user_ids = [ids["a"], ids["b"], ids["c"], ids["off"], ids["none"], "no-such-tenant"]
+        status_code, body = apply(client, "moderator", user_ids=user_ids)
+        if status_code != 202 or body["counts"] != {"created": 2, "updated": 1, "skipped": 3}:
+            print(f"FAILURE: unexpected apply result {status_code}: {body}")
+            sys.exit(1)
+        if [result["user_id"] for result in body["results"]] != user_ids:
+            print("FAILURE: results not in request order")
+            sys.exit(1)
+        for app_id in ("app_a", "app_b", "app_c"):
+            stored = {k: v for k, v in fake_roles[app_id]["moderator"].items() if k in MODERATOR}
+            if stored != MODERATOR:
+                print(f"FAILURE: {app_id} role does not match the template: {stored}")
+                sys.exit(1)
+        if "app_off" in fake_roles:
+            print("FAILURE: inactive tenant's app was changed")
+            sys.exit(1)
+        print(f"SUCCESS: template applied to {body['requested']} tenants in {body['total_ms']}ms")
+
+        # Each app has its own bucket (2/s): a second pass must wait on them
+        started = time.perf_counter()
+        _, body = apply(client, "moderator", user_ids=user_ids[:3], update_existing=False)
+        elapsed = time.perf_counter() - started
+        if body["counts"] != {"exists": 3}:
+            print(f"FAILURE: update_existing=false result {body['counts']}")
+            sys.exit(1)
+        if len(cometchat_client._app_limiters) != 3 or elapsed < 0.3:
+            print(f"FAILURE: per-app rate limit not applied ({len(cometchat_client._app_limiters)} buckets, {elapsed:.2f}s)")
+            sys.exit(1)
+        print("SUCCESS: per-app rate limiting applied")
+
+        if client.post("/api/v1/roles/admin").status_code != 201:
+            print("FAILURE: admin role not created from its template")
+            sys.exit(1)
+        if client.post("/api/v1/reconciliation", json={"roles": ["moderator"]}).status_code != 202:
+            print("FAILURE: reconciliation did not accept a stored template")
+            sys.exit(1)
+        event.remove(engine, "before_cursor_execute", record_on_loop)
+        if on_loop:
+            print(f"FAILURE: database queried on the event loop: {on_loop}")
+            sys.exit(1)
+        print("SUCCESS: template reads kept off the event loop")
+
+        if client.delete("/api/v1/roles/templates/moderator").status_code != 204:
+            print("FAILURE: template delete")
+            sys.exit(1)
+        if apply(client, "moderator", user_ids=[ids["a"]])[0] != 404:
+            print("FAILURE: deleted template still applied")
+            sys.exit(1)
+        if client.post("/api/v1/reconciliation", json={"roles": ["moderator"]}).status_code != 400:
+            print("FAILURE: reconciliation accepted a deleted template")
+            sys.exit(1)
+
+    server.should_exit = True
+    print("SUCCESS: Role templates verified")
+
+except Exception as e:
+    print(f"FAILURE: {e}")
+    import traceback
+    traceback.print_exc()
+    sys.exit(1)
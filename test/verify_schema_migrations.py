@@ -0,0 +1,111 @@
+"""Verify schema versioning: one-query startup, adoption of unversioned databases, lazy job handlers"""
+import sys
+import os
+import tempfile
+import time
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+SCRATCH = tempfile.mkdtemp()
+
+# Mock env vars
+os.environ["COMETCHAT_APP_ID"] = "mock_app_id"
+os.environ["COMETCHAT_API_KEY"] = "mock_api_key"
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(SCRATCH, 'verify.db')}"
+os.environ["EVENT_ARCHIVE_DIR"] = os.path.join(SCRATCH, "archive")
+os.environ["PROFILING_ENABLED"] = "false"
+
+try:
+    from sqlalchemy import event, inspect, text
+    from fastapi.testclient import TestClient
+    from app.core.database import Base, SessionLocal, engine
+    from app.core.init_db import init_db
+    from app.core.migrations import LATEST_VERSION, current_version
+    from app.models.state_version import StateVersion
+    from app.models.tenant import Tenant
+
+    if current_version() != 0:
+        print("FAILURE: empty database should report version 0")
+        sys.exit(1)
+
+    init_db()
+    if current_version() != LATEST_VERSION:
+        print(f"FAILURE: expected version {LATEST_VERSION} after init, got {current_version()}")
+        sys.exit(1)
+    tables = set(inspect(engine).get_table_names())
+    if not set(Base.metadata.tables) <= tables:
+        print(f"FAILURE: missing tables {set(Base.metadata.tables) - tables}")
+        sys.exit(1)
+    with SessionLocal() as db:
+        if db.query(StateVersion).count() == 0:
+            print("FAILURE: state versions were not seeded")
+            sys.exit(1)
+
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    init_db()
+    event.remove(engine, "before_cursor_execute", record)
+    if len(statements) != 1:
+        print(f"FAILURE: up-to-date startup ran {len(statements)} statements: {statements}")
+        sys.exit(1)
+
+    # A database created before versioning keeps its rows and gets adopted
+    with SessionLocal() as db:
+        db.add(Tenant(user_email="legacy@example.com"))
+        db.commit()
+    with engine.begin() as connection:
+        connection.execute(text("DROP TABLE schema_version"))
+    if current_version() != 0:
+        print("FAILURE: unversioned database should report version 0")
+        sys.exit(1)
+    init_db()
+    with SessionLocal() as db:
+        if current_version() != LATEST_VERSION or db.query(Tenant).count() != 1:
+            print("FAILURE: adopting an unversioned database lost state")
+            sys.exit(1)
+
+    from app.main import app
+
+    # Rarely used subsystems stay unloaded until needed
+    for module in (
+        "app.services.event_replay", "app.services.event_retention", "app.services.profiling",
+        "app.services.tenant_directory", "app.services.role_rollout"
+    ):
+        if module in sys.modules:
+            print(f"FAILURE: {module} was imported at startup")
+            sys.exit(1)
+    if any(route.path.startswith("/api/v1/admin/profiling") for route in app.routes):
+        print("FAILURE: profiling routes mounted while disabled")
+        sys.exit(1)
+
+    with TestClient(app) as client:
+        if client.get("/health/database").status_code != 200:
+            print("FAILURE: database health check failed")
+            sys.exit(1)
+
+        response = client.post("/api/v1/events/retention", params={"retention_days": 1})
+        job_id = response.json()["job_id"]
+        for _ in range(200):
+            job = client.get(f"/api/v1/jobs/{job_id}").json()
+            if job["status"] in ("succeeded", "failed"):
+                break
+            time.sleep(0.05)
+        if job["status"] != "succeeded":
+            print(f"FAILURE: lazily loaded retention job did not succeed: {job}")
+            sys.exit(1)
+        if "app.services.event_retention" not in sys.modules:
+            print("FAILURE: retention handler was not loaded on first use")
+            sys.exit(1)
+
+    print("SUCCESS: Schema versioning and lazy loading verified")
+
+except Exception as e:
+    print(f"FAILURE: {e}")
+    import traceback
+    traceback.print_exc()
+    sys.exit(1)
@@ -0,0 +1,136 @@
+"""Verify set-based bulk tenant status updates and the batched purge of soft-deleted tenants"""
+import sys
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+SCRATCH = tempfile.mkdtemp()
+
+# Mock env vars
+os.environ["COMETCHAT_APP_ID"] = "mock_app_id"
+os.environ["COMETCHAT_API_KEY"] = "mock_api_key"
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(SCRATCH, 'verify.db')}"
+os.environ["EVENT_ARCHIVE_DIR"] = os.path.join(SCRATCH, "archive")
+os.environ["TENANT_PURGE_BATCH_SIZE"] = "1"
+os.environ["TENANT_PURGE_BATCH_PAUSE_SECONDS"] = "0"
+
+try:
+    from sqlalchemy import update
+    from fastapi.testclient import TestClient
+    from app.core.database import SessionLocal
+    from app.main import app
+    from app.models.tenant import Tenant
+
+    def wait_for(client, job_id):
+        for _ in range(200):
+            job = client.get(f"/api/v1/jobs/{job_id}").json()
+            if job["status"] in ("succeeded", "failed"):
+                return job
+            time.sleep(0.05)
+        print(f"FAILURE: job {job_id} never finished")
+        sys.exit(1)
+
+    def deleted_at(user_id):
+        with SessionLocal() as db:
+            return db.query(Tenant.deleted_at).filter(Tenant.user_id == user_id).scalar()
+
+    with TestClient(app) as client:
+        ids = {}
+        for i, region in enumerate(["us", "us", "us", "eu", "eu", "eu"]):
+            response = client.post("/api/v1/tenants", json={
+                "user_email": f"bulk{i}@example.com",
+                "cometchat_region": region
+            })
+            ids[i] = response.json()["user_id"]
+
+        etag = client.get("/api/v1/tenants").headers["etag"]
+
+        response = client.patch("/api/v1/tenants/bulk", json={"is_active": False, "filter": {"cometchat_region": "eu"}})
+        if response.status_code != 200 or response.json() != {"updated": 3}:
+            print(f"FAILURE: bulk deactivate by filter returned {response.status_code} {response.text}")
+            sys.exit(1)
+        if deleted_at(ids[3]) is None or deleted_at(ids[0]) is not None:
+            print("FAILURE: deleted_at not set by bulk deactivation")
+            sys.exit(1)
+        if client.get("/api/v1/tenants", headers={"If-None-Match": etag}).status_code != 200:
+            print("FAILURE: bulk update did not invalidate the tenant list ETag")
+            sys.exit(1)
+        active = {t["user_id"] for t in client.get("/api/v1/tenants", params={"active_only": "true"}).json()}
+        if active != {ids[0], ids[1], ids[2]}:
+            print("FAILURE: wrong tenants deactivated")
+            sys.exit(1)
+
+        # Only rows whose status changes are written
+        response = client.patch("/api/v1/tenants/bulk", json={"is_active": False, "filter": {"cometchat_region": "eu"}})
+        if response.json() != {"updated": 0}:
+            print(f"FAILURE: repeated bulk update touched rows: {response.json()}")
+            sys.exit(1)
+
+        response = client.patch("/api/v1/tenants/bulk", json={"is_active": True, "user_ids": [ids[3], ids[0]]})
+        if response.json() != {"updated": 1} or deleted_at(ids[3]) is not None:
+            print(f"FAILURE: bulk reactivation by id: {response.json()}")
+            sys.exit(1)
+
+        # Offset timestamps are compared as UTC: ids[1] was created at 10:00 UTC
+        with SessionLocal() as db:
+            db.execute(update(Tenant).where(Tenant.user_id == ids[1]).values(created_at=datetime(2024, 1, 1, 10)))
+            db.commit()
+        for created_before, expected in (("2024-01-01T12:00:00+05:00", 0), ("2024-01-01T12:00:00+01:00", 1)):
+            response = client.patch("/api/v1/tenants/bulk", json={
+                "is_active": False, "filter": {"cometchat_region": "us", "created_before": created_before}
+            })
+            if response.json() != {"updated": expected}:
+                print(f"FAILURE: created_before={created_before} updated {response.json()}, expected {expected}")
+                sys.exit(1)
+        client.patch("/api/v1/tenants/bulk", json={"is_active": True, "user_ids": [ids[1]]})
+
+        for body in (
+            {"is_active": False},
+            {"is_active": False, "user_ids": [ids[0]], "filter": {"cometchat_region": "us"}},
+            {"is_active": False, "filter": {}},
+            {"is_active": False, "filter": {"cometchat_region": None}},
+            {"is_active": False, "user_ids": []},
+        ):
+            if client.patch("/api/v1/tenants/bulk", json=body).status_code != 422:
+                print(f"FAILURE: invalid selector accepted: {body}")
+                sys.exit(1)
+
+        # Soft delete through the single-tenant endpoint records the time too
+        client.delete(f"/api/v1/tenants/{ids[0]}")
+        if deleted_at(ids[0]) is None:
+            print("FAILURE: soft delete did not set deleted_at")
+            sys.exit(1)
+
+        # ids[4] and ids[5] expired long ago; ids[0] was deleted just now
+        with SessionLocal() as db:
+            db.execute(
+                update(Tenant)
+                .where(Tenant.user_id.in_([ids[4], ids[5]]))
+                .values(deleted_at=datetime.utcnow() - timedelta(days=40))
+            )
+            db.commit()
+
+        if client.post("/api/v1/tenants/purge", params={"retention_days": 0}).status_code != 400:
+            print("FAILURE: purge with retention_days=0 accepted")
+            sys.exit(1)
+
+        job = wait_for(client, client.post("/api/v1/tenants/purge", params={"retention_days": 30}).json()["job_id"])
+        if job["status"] != "succeeded" or job["result"]["purged"] != 2 or job["result"]["batches"] != 2:
+            print(f"FAILURE: unexpected purge result {job}")
+            sys.exit(1)
+        remaining = {t["user_id"] for t in client.get("/api/v1/tenants").json()}
+        if remaining != {ids[0], ids[1], ids[2], ids[3]}:
+            print("FAILURE: purge removed the wrong tenants")
+            sys.exit(1)
+
+    print("SUCCESS: Bulk status updates and tenant purge verified")
+
+except Exception as e:
+    print(f"FAILURE: {e}")
+    import traceback
+    traceback.print_exc()
+    sys.exit(1)
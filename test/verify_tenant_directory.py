@@ -0,0 +1,122 @@
+"""Verify the preloaded tenant directory: lookups, incremental refresh and reloads"""
+import sys
+import os
+import tempfile
+import time
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+SCRATCH = tempfile.mkdtemp()
+
+# Mock env vars
+os.environ["COMETCHAT_APP_ID"] = "mock_app_id"
+os.environ["COMETCHAT_API_KEY"] = "mock_api_key"
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(SCRATCH, 'verify.db')}"
+os.environ["EVENT_ARCHIVE_DIR"] = os.path.join(SCRATCH, "archive")
+os.environ["TENANT_DIRECTORY_ENABLED"] = "true"
+os.environ["STATE_POLL_INTERVAL_SECONDS"] = "0.1"
+
+try:
+    from cryptography.fernet import Fernet
+    os.environ["CREDENTIAL_ENCRYPTION_KEYS"] = f'["{Fernet.generate_key().decode()}"]'
+
+    from sqlalchemy import event, inspect
+    from fastapi.testclient import TestClient
+    from app.core.database import engine
+    from app.core.init_db import init_db
+    from app.services.tenant_directory import tenant_directory
+
+    init_db()
+    from app.main import app
+
+    def wait_until(check, what):
+        for _ in range(50):
+            if check():
+                return
+            time.sleep(0.1)
+        print(f"FAILURE: {what}")
+        sys.exit(1)
+
+    with TestClient(app) as seed_client:
+        ids = {}
+        for name in ("a", "b", "c"):
+            ids[name] = seed_client.post("/api/v1/tenants", json={
+                "user_email": f"{name}@example.com",
+                "cometchat_app_id": f"app_{name}",
+                "cometchat_api_key": f"key_{name}",
+                "cometchat_region": "eu"
+            }).json()["user_id"]
+        ids["none"] = seed_client.post("/api/v1/tenants", json={"user_email": "none@example.com"}).json()["user_id"]
+
+    # A fresh start loads every active tenant
+    with TestClient(app) as client:
+        if not tenant_directory.loaded or len(tenant_directory) != 4:
+            print(f"FAILURE: directory not loaded at startup ({len(tenant_directory)} entries)")
+            sys.exit(1)
+        route = tenant_directory.by_app_id("app_a")
+        if route is None or route.user_id != ids["a"] or tenant_directory.by_user_id(ids["a"]) is not route:
+            print("FAILURE: lookup by app id / user id")
+            sys.exit(1)
+        if not route.api_key_token.startswith("enc:"):
+            print("FAILURE: directory should hold the encrypted token, not the plaintext")
+            sys.exit(1)
+        credentials = route.credentials
+        if (credentials.app_id, credentials.api_key, credentials.region) != ("app_a", "key_a", "eu"):
+            print(f"FAILURE: unexpected credentials {credentials}")
+            sys.exit(1)
+        if tenant_directory.by_user_id(ids["none"]).credentials is not None:
+            print("FAILURE: tenant without an app has credentials")
+            sys.exit(1)
+        if not hasattr(type(route), "__slots__") or hasattr(route, "__dict__"):
+            print("FAILURE: routes should be slotted")
+            sys.exit(1)
+        print("SUCCESS: directory loaded at startup")
+
+        # Writes reach the directory through the state watcher
+        created = client.post("/api/v1/tenants", json={
+            "user_email": "d@example.com", "cometchat_app_id": "app_d", "cometchat_api_key": "key_d"
+        }).json()["user_id"]
+        wait_until(lambda: tenant_directory.by_app_id("app_d") is not None, "new tenant never reached the directory")
+
+        client.put(f"/api/v1/tenants/{ids['b']}", json={"cometchat_app_id": "app_b2"})
+        wait_until(lambda: tenant_directory.by_app_id("app_b2") is not None, "app id change never applied")
+        if tenant_directory.by_app_id("app_b") is not None:
+            print("FAILURE: old app id still indexed")
+            sys.exit(1)
+
+        client.delete(f"/api/v1/tenants/{ids['c']}")
+        wait_until(lambda: tenant_directory.by_user_id(ids["c"]) is None, "deactivated tenant still listed")
+        print("SUCCESS: inserts, updates and deactivations applied incrementally")
+
+        # Refreshes read only rows changed since the watermark
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", record)
+        tenant_directory.refresh()
+        event.remove(engine, "before_cursor_execute", record)
+        if not any("FROM tenants" in s and "tenants.updated_at >=" in s for s in statements):
+            print(f"FAILURE: refresh was not incremental: {statements}")
+            sys.exit(1)
+        if "ix_tenants_updated_at" not in {index["name"] for index in inspect(engine).get_indexes("tenants")}:
+            print("FAILURE: updated_at index missing")
+            sys.exit(1)
+
+        # A hard delete leaves no updated row; the count check forces a reload
+        client.delete(f"/api/v1/tenants/{created}", params={"hard_delete": "true"})
+        wait_until(lambda: tenant_directory.by_app_id("app_d") is None, "hard-deleted tenant still listed")
+        if len(tenant_directory) != 3:
+            print(f"FAILURE: directory has {len(tenant_directory)} entries after reload, expected 3")
+            sys.exit(1)
+        print("SUCCESS: hard delete caught by reload")
+
+    print("SUCCESS: Tenant directory verified")
+
+except Exception as e:
+    print(f"FAILURE: {e}")
+    import traceback
+    traceback.print_exc()
+    sys.exit(1)
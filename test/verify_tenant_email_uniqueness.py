@@ -0,0 +1,102 @@
+"""Verify case-insensitive tenant email uniqueness and the normalized email backfill"""
+import sys
+import os
+import tempfile
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+SCRATCH = tempfile.mkdtemp()
+
+# Mock env vars
+os.environ["COMETCHAT_APP_ID"] = "mock_app_id"
+os.environ["COMETCHAT_API_KEY"] = "mock_api_key"
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(SCRATCH, 'verify.db')}"
+os.environ["EVENT_ARCHIVE_DIR"] = os.path.join(SCRATCH, "archive")
+
+try:
+    from sqlalchemy import event, text
+    from fastapi.testclient import TestClient
+    from app.core.database import engine
+    from app.core.init_db import init_db
+    from app.core.migrations import LATEST_VERSION, current_version
+
+    init_db()
+
+    # Roll back to a database from before the normalized column, with case-variant duplicates
+    with engine.begin() as connection:
+        connection.execute(text("DROP INDEX ix_tenants_user_email_normalized"))
+        connection.execute(text("ALTER TABLE tenants DROP COLUMN user_email_normalized"))
+        connection.execute(text("DELETE FROM schema_version WHERE version >= 3"))
+        for user_id, email in (("legacy-1", "Ada@Example.com"), ("legacy-2", "ada@example.com"), ("legacy-3", "bob@example.com")):
+            connection.execute(text(
+                "INSERT INTO tenants (user_id, user_email, cometchat_region, cometchat_log_level, created_at, is_active) "
+                "VALUES (:user_id, :email, 'us', 'INFO', CURRENT_TIMESTAMP, 1)"
+            ), {"user_id": user_id, "email": email})
+
+    init_db()
+    if current_version() != LATEST_VERSION:
+        print("FAILURE: email migration did not run")
+        sys.exit(1)
+    with engine.connect() as connection:
+        normalized = dict(connection.execute(text("SELECT user_id, user_email_normalized FROM tenants")).all())
+    if normalized != {"legacy-1": "ada@example.com", "legacy-2": None, "legacy-3": "bob@example.com"}:
+        print(f"FAILURE: unexpected backfill {normalized}")
+        sys.exit(1)
+
+    from app.main import app
+
+    with TestClient(app) as client:
+        if client.post("/api/v1/tenants", json={"user_email": "BOB@example.com"}).status_code != 409:
+            print("FAILURE: case variant of a backfilled email was accepted")
+            sys.exit(1)
+
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            statements.append(statement.strip())
+
+        event.listen(engine, "before_cursor_execute", record)
+        response = client.post("/api/v1/tenants", json={"user_email": "Carol@Example.com"})
+        event.remove(engine, "before_cursor_execute", record)
+        if response.status_code != 201:
+            print(f"FAILURE: create returned {response.status_code}")
+            sys.exit(1)
+        tenant_statements = [s for s in statements if "tenants" in s and "state_versions" not in s]
+        if not tenant_statements or not tenant_statements[0].startswith("INSERT INTO tenants"):
+            print(f"FAILURE: create should insert without a duplicate pre-check: {statements}")
+            sys.exit(1)
+
+        for duplicate in ("carol@example.com", "Carol@Example.com", "CAROL@EXAMPLE.COM"):
+            response = client.post("/api/v1/tenants", json={"user_email": duplicate})
+            if response.status_code != 409:
+                print(f"FAILURE: duplicate {duplicate!r} returned {response.status_code}")
+                sys.exit(1)
+
+        # A rejected insert leaves the session usable for the next request
+        if client.post("/api/v1/tenants", json={"user_email": "dave@example.com"}).status_code != 201:
+            print("FAILURE: create after a conflict failed")
+            sys.exit(1)
+
+        # Other constraint failures are not reported as a duplicate email
+        import app.models.tenant as tenant_model
+        taken = client.get("/api/v1/tenants").json()[0]["user_id"]
+        real_uuid4 = tenant_model.uuid.uuid4
+        tenant_model.uuid.uuid4 = lambda: taken
+        try:
+            response = TestClient(app, raise_server_exceptions=False).post(
+                "/api/v1/tenants", json={"user_email": "erin@example.com"}
+            )
+        finally:
+            tenant_model.uuid.uuid4 = real_uuid4
+        if response.status_code != 500:
+            print(f"FAILURE: user_id collision returned {response.status_code}: {response.text}")
+            sys.exit(1)
+
+    print("SUCCESS: Normalized email uniqueness verified")
+
+except Exception as e:
+    print(f"FAILURE: {e}")
+    import traceback
+    traceback.print_exc()
+    sys.exit(1)
@@ -0,0 +1,85 @@
+"""Verify conditional GET (ETag / Last-Modified) on tenant endpoints"""
+import sys
+import os
+import tempfile
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+# Mock env vars
+os.environ["COMETCHAT_APP_ID"] = "mock_app_id"
+os.environ["COMETCHAT_API_KEY"] = "mock_api_key"
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'verify.db')}"
+
+try:
+    from sqlalchemy import event, text
+    from fastapi.testclient import TestClient
+    from app.core.database import engine
+    from app.main import app
+
+    with TestClient(app) as client:
+        user_id = client.post("/api/v1/tenants", json={"user_email": "etag@example.com"}).json()["user_id"]
+
+        response = client.get(f"/api/v1/tenants/{user_id}")
+        etag = response.headers.get("etag")
+        last_modified = response.headers.get("last-modified")
+        if response.status_code != 200 or not etag or not last_modified:
+            print(f"FAILURE: missing validators: {dict(response.headers)}")
+            sys.exit(1)
+        print(f"SUCCESS: tenant served with ETag {etag}")
+
+        response = client.get(f"/api/v1/tenants/{user_id}", headers={"If-None-Match": etag})
+        if response.status_code != 304 or response.content:
+            print(f"FAILURE: matching If-None-Match returned {response.status_code}")
+            sys.exit(1)
+        response = client.get(f"/api/v1/tenants/{user_id}", headers={"If-Modified-Since": last_modified})
+        if response.status_code != 304:
+            print(f"FAILURE: If-Modified-Since returned {response.status_code}")
+            sys.exit(1)
+        print("SUCCESS: unchanged tenant answers 304")
+
+        client.put(f"/api/v1/tenants/{user_id}", json={"user_first_name": "Changed"})
+        response = client.get(f"/api/v1/tenants/{user_id}", headers={"If-None-Match": etag})
+        if response.status_code != 200 or response.headers["etag"] == etag:
+            print(f"FAILURE: update did not change the ETag ({response.status_code})")
+            sys.exit(1)
+        print("SUCCESS: update invalidates the tenant ETag")
+
+        response = client.get("/api/v1/tenants")
+        list_etag = response.headers.get("etag")
+        if client.get("/api/v1/tenants", headers={"If-None-Match": list_etag}).status_code != 304:
+            print("FAILURE: unchanged list did not answer 304")
+            sys.exit(1)
+        client.post("/api/v1/tenants", json={"user_email": "etag2@example.com"})
+        response = client.get("/api/v1/tenants", headers={"If-None-Match": list_etag})
+        if response.status_code != 200 or len(response.json()) != 2:
+            print(f"FAILURE: list not revalidated after create ({response.status_code})")
+            sys.exit(1)
+        print("SUCCESS: list ETag follows the table version")
+
+        # Tenant purged between the validator lookup and the body read
+        doomed = client.post("/api/v1/tenants", json={"user_email": "gone@example.com"}).json()["user_id"]
+
+        purged = []
+
+        def purge_after_stamps(conn, cursor, statement, parameters, context, executemany):
+            if not purged and statement.lstrip().startswith("SELECT tenants.created_at AS"):
+                purged.append(doomed)
+                with engine.begin() as other:
+                    other.execute(text("DELETE FROM tenants WHERE user_id = :user_id"), {"user_id": doomed})
+                # End the request's read snapshot, as READ COMMITTED backends do per statement
+                conn.commit()
+
+        event.listen(engine, "after_cursor_execute", purge_after_stamps)
+        response = client.get(f"/api/v1/tenants/{doomed}", headers={"If-None-Match": 'W/"stale"'})
+        event.remove(engine, "after_cursor_execute", purge_after_stamps)
+        if not purged or response.status_code != 404:
+            print(f"FAILURE: tenant deleted mid-request returned {response.status_code}")
+            sys.exit(1)
+        print("SUCCESS: tenant deleted mid-request answers 404")
+
+    print("Verification script completed successfully")
+
+except Exception as e:
+    print(f"FAILURE: An error occurred: {e}")
+    sys.exit(1)
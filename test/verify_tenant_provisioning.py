@@ -0,0 +1,97 @@
+"""Verify one-shot tenant provisioning against the local fake CometChat API"""
+import sys
+import os
+import tempfile
+import threading
+import time
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+FAKE_PORT = int(os.environ.get("FAKE_COMETCHAT_PORT", "9124"))
+FAKE_URL = f"http://127.0.0.1:{FAKE_PORT}"
+
+# Mock env vars
+os.environ["COMETCHAT_APP_ID"] = "mock_app_id"
+os.environ["COMETCHAT_API_KEY"] = "mock_api_key"
+os.environ["COMETCHAT_AUTH_KEY"] = "mock_auth_key"
+os.environ["COMETCHAT_AUTH_SECRET"] = "mock_auth_secret"
+os.environ["COMETCHAT_API_BASE_URL"] = f"{FAKE_URL}/v3"
+os.environ["COMETCHAT_MGMT_BASE_URL"] = FAKE_URL
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'verify.db')}"
+
+try:
+    import httpx
+    from concurrent.futures import ThreadPoolExecutor
+    import uvicorn
+    from fastapi.testclient import TestClient
+    from fake_cometchat import app as fake_app, apps as fake_apps, roles as fake_roles, webhooks as fake_webhooks
+    from app.main import app
+
+    server = uvicorn.Server(uvicorn.Config(fake_app, host="127.0.0.1", port=FAKE_PORT, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+
+    provision_body = {
+        "roles": ["admin"],
+        "webhooks": [{"webhook_id": "onboard_hook", "name": "Onboarding", "url": "https://example.com/hook"}],
+    }
+
+    with TestClient(app) as client:
+        user_id = client.post("/api/v1/tenants", json={"user_email": "onboard@example.com"}).json()["user_id"]
+
+        # App creation fails: nothing is stored and the call reports 502
+        httpx.post(f"{FAKE_URL}/__config", json={"error_rate": 1.0})
+        response = client.post(f"/api/v1/tenants/{user_id}/provision", json=provision_body)
+        httpx.post(f"{FAKE_URL}/__config", json={"error_rate": 0.0})
+        if response.status_code != 502 or response.json()["steps"][0]["status"] != "failed":
+            print(f"FAILURE: expected failed create_app, got {response.status_code}: {response.text}")
+            sys.exit(1)
+        print("SUCCESS: upstream failure reported per step")
+
+        response = client.post(f"/api/v1/tenants/{user_id}/provision", json=provision_body)
+        body = response.json()
+        if response.status_code != 200 or not body["success"]:
+            print(f"FAILURE: provisioning returned {response.status_code}: {response.text}")
+            sys.exit(1)
+        app_id = body["app_id"]
+        if "admin" not in fake_roles[app_id] or "onboard_hook" not in fake_webhooks[app_id]:
+            print("FAILURE: role/webhook not created on the new app")
+            sys.exit(1)
+        print(f"SUCCESS: provisioned app {app_id} with {len(body['steps'])} steps in {body['total_ms']}ms")
+
+        # Re-running resumes: every step is already done
+        body = client.post(f"/api/v1/tenants/{user_id}/provision", json=provision_body).json()
+        if any(step["status"] != "skipped" for step in body["steps"]):
+            print(f"FAILURE: re-run repeated work: {body['steps']}")
+            sys.exit(1)
+        print("SUCCESS: re-run skips completed steps")
+
+        # Concurrent calls for one tenant: one provisions, the other is refused
+        user_id = client.post("/api/v1/tenants", json={"user_email": "race@example.com"}).json()["user_id"]
+        apps_before = len(fake_apps)
+        httpx.post(f"{FAKE_URL}/__config", json={"latency_ms": 300})
+        with ThreadPoolExecutor(2) as pool:
+            codes = sorted(pool.map(
+                lambda _: client.post(f"/api/v1/tenants/{user_id}/provision", json=provision_body).status_code,
+                range(2)
+            ))
+        httpx.post(f"{FAKE_URL}/__config", json={"latency_ms": 0})
+        if codes != [200, 409] or len(fake_apps) != apps_before + 1:
+            print(f"FAILURE: concurrent provisioning returned {codes}, created {len(fake_apps) - apps_before} apps")
+            sys.exit(1)
+        if client.post(f"/api/v1/tenants/{user_id}/provision", json=provision_body).status_code != 200:
+            print("FAILURE: claim not released after provisioning")
+            sys.exit(1)
+        if client.post("/api/v1/tenants/no-such-tenant/provision", json=provision_body).status_code != 404:
+            print("FAILURE: unknown tenant did not 404")
+            sys.exit(1)
+        print("SUCCESS: concurrent provisioning of one tenant refused with 409")
+
+    server.should_exit = True
+    print("Verification script completed successfully")
+
+except Exception as e:
+    print(f"FAILURE: An error occurred: {e}")
+    sys.exit(1)
@@ -0,0 +1,122 @@
+"""Verify tenant search: FTS5 prefix matching, ranking, trigger sync and the LIKE fallback"""
+import sys
+import os
+import tempfile
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+SCRATCH = tempfile.mkdtemp()
+
+# Mock env vars
+os.environ["COMETCHAT_APP_ID"] = "mock_app_id"
+os.environ["COMETCHAT_API_KEY"] = "mock_api_key"
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(SCRATCH, 'verify.db')}"
+os.environ["EVENT_ARCHIVE_DIR"] = os.path.join(SCRATCH, "archive")
+
+try:
+    from fastapi.testclient import TestClient
+    from app.core.database import SessionLocal
+    from app.main import app
+    from app.services import tenant_search
+
+    def emails(client, q, **params):
+        response = client.get("/api/v1/tenants/search", params={"q": q, **params})
+        if response.status_code != 200:
+            print(f"FAILURE: search {q!r} returned {response.status_code}: {response.text}")
+            sys.exit(1)
+        return [tenant["user_email"] for tenant in response.json()]
+
+    with TestClient(app) as client:
+        people = [
+            ("Margaret", "Hamilton", "margaret@apollo.example", "+1 617-555-0101"),
+            ("Grace", "Hopper", "grace.hopper@navy.example", "+1 202-555-0199"),
+            ("Hedy", "Lamarr", "hedy@films.example", "+1 310-555-0142"),
+            ("Margo", "Jones", "mjones@apollo.example", None),
+        ]
+        ids = {}
+        for first, last, email, phone in people:
+            response = client.post("/api/v1/tenants", json={
+                "user_first_name": first,
+                "user_last_name": last,
+                "user_email": email,
+                "user_phone": phone
+            })
+            ids[email] = response.json()["user_id"]
+
+        with SessionLocal() as db:
+            if not tenant_search.fts_enabled(db):
+                print("FAILURE: FTS index was not created")
+                sys.exit(1)
+
+        # Margaret matches in both name and email, so ranks above Margo
+        if emails(client, "marg") != ["margaret@apollo.example", "mjones@apollo.example"]:
+            print(f"FAILURE: ranked prefix search on first name: {emails(client, 'marg')}")
+            sys.exit(1)
+        if emails(client, "hopp") != ["grace.hopper@navy.example"]:
+            print("FAILURE: prefix search on last name")
+            sys.exit(1)
+        if set(emails(client, "apollo")) != {"margaret@apollo.example", "mjones@apollo.example"}:
+            print("FAILURE: search on email domain")
+            sys.exit(1)
+        if emails(client, "555-0142") != ["hedy@films.example"]:
+            print("FAILURE: search on phone digits")
+            sys.exit(1)
+        if emails(client, "marg apollo ham") != ["margaret@apollo.example"]:
+            print("FAILURE: every word must match")
+            sys.exit(1)
+        # FTS syntax in the query is treated as plain words
+        if emails(client, 'hedy" * (') != ["hedy@films.example"]:
+            print("FAILURE: query operators were not neutralised")
+            sys.exit(1)
+
+        # Triggers keep the index in step with updates and deletes
+        client.put(f"/api/v1/tenants/{ids['hedy@films.example']}", json={"user_last_name": "Kiesler"})
+        if emails(client, "lamarr") or emails(client, "kiesler") != ["hedy@films.example"]:
+            print("FAILURE: update was not reflected in the index")
+            sys.exit(1)
+        client.put(f"/api/v1/tenants/{ids['mjones@apollo.example']}", json={"is_active": False})
+        if emails(client, "apollo", active_only="true") != ["margaret@apollo.example"]:
+            print("FAILURE: active_only filter")
+            sys.exit(1)
+        client.delete(f"/api/v1/tenants/{ids['grace.hopper@navy.example']}", params={"hard_delete": "true"})
+        if emails(client, "grace"):
+            print("FAILURE: deleted tenant still found")
+            sys.exit(1)
+
+        # The candidate cap keeps the best active matches, not the first rows
+        for first, email in ((None, "zed@orion.example"), ("Orion", "orion@orion.example")):
+            ids[email] = client.post("/api/v1/tenants", json={
+                "user_first_name": first, "user_last_name": first, "user_email": email
+            }).json()["user_id"]
+        tenant_search.RANK_CANDIDATES = 1
+        if emails(client, "orion") != ["orion@orion.example"]:
+            print(f"FAILURE: capped candidates not the best ranked: {emails(client, 'orion')}")
+            sys.exit(1)
+        client.put(f"/api/v1/tenants/{ids['orion@orion.example']}", json={"is_active": False})
+        if emails(client, "orion", active_only="true") != ["zed@orion.example"]:
+            print("FAILURE: active_only applied after the candidate cap")
+            sys.exit(1)
+        tenant_search.RANK_CANDIDATES = 2000
+
+        if client.get("/api/v1/tenants/search").status_code != 422:
+            print("FAILURE: missing q was accepted")
+            sys.exit(1)
+
+        # Backends without FTS5 fall back to substring matching
+        tenant_search._fts_enabled = False
+        if set(emails(client, "apollo")) != {"margaret@apollo.example", "mjones@apollo.example"}:
+            print("FAILURE: LIKE fallback search")
+            sys.exit(1)
+        if emails(client, "AMILT") != ["margaret@apollo.example"]:
+            print("FAILURE: LIKE fallback should match substrings case-insensitively")
+            sys.exit(1)
+        tenant_search._fts_enabled = None
+
+    print("SUCCESS: Tenant search verified")
+
+except Exception as e:
+    print(f"FAILURE: {e}")
+    import traceback
+    traceback.print_exc()
+    sys.exit(1)
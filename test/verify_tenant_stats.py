@@ -0,0 +1,119 @@
+"""Verify trigger-maintained tenant statistics, the stats endpoint and the rebuild job"""
+import sys
+import os
+import tempfile
+import time
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+SCRATCH = tempfile.mkdtemp()
+
+# Mock env vars
+os.environ["COMETCHAT_APP_ID"] = "mock_app_id"
+os.environ["COMETCHAT_API_KEY"] = "mock_api_key"
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(SCRATCH, 'verify.db')}"
+os.environ["EVENT_ARCHIVE_DIR"] = os.path.join(SCRATCH, "archive")
+
+try:
+    from sqlalchemy import event, text
+    from fastapi.testclient import TestClient
+    from app.core.database import engine
+    from app.main import app
+    from app.services.tenant_stats import _aggregate, _shape
+
+    def wait_for(client, job_id):
+        for _ in range(200):
+            job = client.get(f"/api/v1/jobs/{job_id}").json()
+            if job["status"] in ("succeeded", "failed"):
+                return job
+            time.sleep(0.05)
+        print(f"FAILURE: job {job_id} never finished")
+        sys.exit(1)
+
+    def check(client, step):
+        stats = client.get("/api/v1/tenants/stats").json()
+        with engine.connect() as connection:
+            expected = _shape(_aggregate(connection))
+        if stats != expected:
+            print(f"FAILURE: stats after {step}: {stats} != {expected}")
+            sys.exit(1)
+        return stats
+
+    with TestClient(app) as client:
+        ids = []
+        for i, (region, level) in enumerate([("us", "INFO")] * 3 + [("eu", "DEBUG")] * 2):
+            ids.append(client.post("/api/v1/tenants", json={
+                "user_email": f"stats{i}@example.com",
+                "cometchat_region": region,
+                "cometchat_log_level": level
+            }).json()["user_id"])
+
+        stats = check(client, "inserts")
+        if stats != {
+            "total": 5,
+            "by_region": {"eu": 2, "us": 3},
+            "by_status": {"active": 5},
+            "by_log_level": {"DEBUG": 2, "INFO": 3}
+        }:
+            print(f"FAILURE: unexpected initial stats {stats}")
+            sys.exit(1)
+
+        response = client.get("/api/v1/tenants/stats")
+        etag = response.headers["etag"]
+        if client.get("/api/v1/tenants/stats", headers={"If-None-Match": etag}).status_code != 304:
+            print("FAILURE: unchanged stats did not revalidate")
+            sys.exit(1)
+
+        client.put(f"/api/v1/tenants/{ids[0]}", json={"is_active": False})
+        check(client, "update")
+        client.patch("/api/v1/tenants/bulk", json={"is_active": False, "filter": {"cometchat_region": "eu"}})
+        check(client, "bulk update")
+        client.delete(f"/api/v1/tenants/{ids[1]}", params={"hard_delete": "true"})
+        stats = check(client, "delete")
+        if stats["total"] != 4 or stats["by_status"] != {"active": 1, "inactive": 3}:
+            print(f"FAILURE: unexpected stats after writes {stats}")
+            sys.exit(1)
+        if client.get("/api/v1/tenants/stats", headers={"If-None-Match": etag}).status_code != 200:
+            print("FAILURE: stats ETag survived tenant writes")
+            sys.exit(1)
+
+        # Reading stats never touches the tenants table
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", record)
+        client.get("/api/v1/tenants/stats")
+        event.remove(engine, "before_cursor_execute", record)
+        if any("FROM tenants" in statement for statement in statements):
+            print(f"FAILURE: stats read scanned tenants: {statements}")
+            sys.exit(1)
+
+        if client.get("/health/database").json()["tenant_count"] != 4:
+            print("FAILURE: database health check count")
+            sys.exit(1)
+
+        # Simulate drift and let the rebuild job repair it
+        with engine.begin() as connection:
+            connection.execute(text("UPDATE tenant_stats SET count = 99 WHERE dimension = 'total'"))
+            connection.execute(text("DELETE FROM tenant_stats WHERE dimension = 'region' AND value = 'eu'"))
+        job = wait_for(client, client.post("/api/v1/tenants/stats/rebuild").json()["job_id"])
+        drift = {(row["dimension"], row["value"]): (row["stored"], row["actual"]) for row in job["result"]["drift"]}
+        if job["status"] != "succeeded" or drift != {("total", "all"): (99, 4), ("region", "eu"): (0, 2)}:
+            print(f"FAILURE: unexpected rebuild result {job}")
+            sys.exit(1)
+        check(client, "rebuild")
+        job = wait_for(client, client.post("/api/v1/tenants/stats/rebuild").json()["job_id"])
+        if not job["result"]["consistent"]:
+            print(f"FAILURE: second rebuild found drift {job['result']}")
+            sys.exit(1)
+
+    print("SUCCESS: Tenant statistics verified")
+
+except Exception as e:
+    print(f"FAILURE: {e}")
+    import traceback
+    traceback.print_exc()
+    sys.exit(1)